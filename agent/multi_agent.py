@@ -1,3 +1,4 @@
+import functools
 import re
 from typing import Iterable, Union
 
@@ -5,12 +6,24 @@ from langfuse import observe
 
 from ai_models.model_name import ModelName
 from ai_models.openrouter_client import OpenRouterClient
+from utils.langfuse_config import observe_if_enabled
+
+# Leading list numbering such as "1. ", "2) " or "3: "
+_LEADING_NUMBERING_RE = re.compile(r"^\d+[\.\)\:]\s*")
 
 
 def _join_text_chunks(chunks: list) -> str:
     return "".join(c for c in chunks if isinstance(c, str))
 
 
+def _clean_line(line: str, strip_numbering: bool, strip_markdown: bool) -> str:
+    if strip_numbering:
+        line = _LEADING_NUMBERING_RE.sub("", line)
+    if strip_markdown:
+        line = line.replace("*", "")
+    return line.strip()
+
+
 class MultiAgent:
     """Wrapper class for OpenRouter client to provide consistent interface across codebase"""
 
@@ -36,6 +49,11 @@ class MultiAgent:
         self,
         prompt: str,
         use_google_search: bool = False,
+        system_prompt: str | None = None,
+        response_format: dict | None = None,
+        max_output_tokens: int | None = None,
+        stop_sequences: list[str] | None = None,
+        timeout: float | None = None,
     ) -> Iterable[Union[str, dict]]:
         """
         Generate content using OpenRouter
@@ -44,11 +62,59 @@ class MultiAgent:
             prompt: The user prompt
             model_name: Model name to use (defaults to client's default model)
             use_google_search: If True, enables web search by appending ':online' to model name
+            system_prompt: Optional static instructions sent as a system message (prefix-cache friendly)
+            response_format: Optional OpenAI-style response_format to force structured (JSON) output
+            max_output_tokens: Optional cap on generated tokens (client default when None)
+            stop_sequences: Optional sequences that end generation early
+            timeout: Optional cap in seconds on each read of the stream, retried once (client default when None)
 
         Returns:
             Iterable of string chunks (str) and citation annotations (dict) when streaming
         """
-        return self.client.stream_chat(prompt=prompt, use_google_search=use_google_search)
+        return self.client.stream_chat(
+            prompt=prompt,
+            use_google_search=use_google_search,
+            system_prompt=system_prompt,
+            response_format=response_format,
+            stop=stop_sequences,
+            **({"max_tokens": max_output_tokens} if max_output_tokens else {}),
+            **({"timeout": timeout} if timeout else {}),
+        )
+
+    # The static classifier system prompts dominate the input and are versioned in code, so don't
+    # serialize them into every trace
+    @observe_if_enabled(name="agenerate_content", as_type="generation", capture_input=False)
+    async def agenerate_content(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        response_format: dict | None = None,
+        max_output_tokens: int | None = None,
+        stop_sequences: list[str] | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """
+        Generate a complete (non-streaming) response without blocking the event loop
+
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional static instructions sent as a system message (prefix-cache friendly)
+            response_format: Optional OpenAI-style response_format to force structured (JSON) output
+            max_output_tokens: Optional cap on generated tokens (client default when None)
+            stop_sequences: Optional sequences that end generation early
+            timeout: Optional per-attempt cap in seconds, retried once (client default when None)
+
+        Returns:
+            The full response text
+        """
+        return await self.client.achat(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            response_format=response_format,
+            stop=stop_sequences,
+            **({"max_tokens": max_output_tokens} if max_output_tokens else {}),
+            **({"timeout": timeout} if timeout else {}),
+        )
 
     def generate_content_with_pdf_context(
         self, prompt: str, pdf_content: bytes, filename: str = "document.pdf", pdf_engine: str = "pdf-text"
@@ -148,12 +214,7 @@ class MultiAgent:
                 line, buffer = buffer.split("\n", 1)
 
                 # Clean the line
-                clean_line = line
-                if strip_numbering:
-                    clean_line = re.sub(r"^\d+[\.\)\:]\s*", "", clean_line)
-                if strip_markdown:
-                    clean_line = clean_line.replace("*", "")
-                clean_line = clean_line.strip()
+                clean_line = _clean_line(line, strip_numbering, strip_markdown)
 
                 # Yield if line meets minimum length requirement
                 if clean_line and len(clean_line) >= min_line_length:
@@ -166,12 +227,51 @@ class MultiAgent:
             if max_lines is not None and lines_yielded >= max_lines:
                 return
 
-            clean_line = buffer
-            if strip_numbering:
-                clean_line = re.sub(r"^\d+[\.\)\:]\s*", "", clean_line)
-            if strip_markdown:
-                clean_line = clean_line.replace("*", "")
-            clean_line = clean_line.strip()
+            clean_line = _clean_line(buffer, strip_numbering, strip_markdown)
 
             if clean_line and len(clean_line) >= min_line_length:
                 yield clean_line
+
+    async def agenerate_content_by_lines(
+        self,
+        prompt: str,
+        max_lines: int | None = None,
+        min_line_length: int = 10,
+        strip_numbering: bool = True,
+        strip_markdown: bool = True,
+    ) -> list[str]:
+        """
+        Generate a complete response without blocking the event loop and split it into cleaned lines.
+
+        Same line handling as generate_content_by_lines, for callers that need the whole list anyway.
+        Cancelling the awaiting task aborts the request.
+
+        Args:
+            prompt: The user prompt
+            max_lines: Maximum number of lines to return (None for unlimited)
+            min_line_length: Minimum character length for a line to be kept (filters empty/short lines)
+            strip_numbering: If True, removes leading numbers like "1.", "2)", etc.
+            strip_markdown: If True, removes markdown asterisks (*)
+
+        Returns:
+            Complete, cleaned lines of text
+        """
+        text = await self.agenerate_content(prompt=prompt)
+        lines: list[str] = []
+        for line in text.split("\n"):
+            if max_lines is not None and len(lines) >= max_lines:
+                break
+            clean_line = _clean_line(line, strip_numbering, strip_markdown)
+            if clean_line and len(clean_line) >= min_line_length:
+                lines.append(clean_line)
+        return lines
+
+
+@functools.lru_cache(maxsize=8)
+def get_multi_agent(model_name: ModelName | None = None) -> MultiAgent:
+    """
+    Shared MultiAgent per model, so long-lived services reuse one client and its connection pool.
+
+    Only use this where the agent's own state isn't customized per request.
+    """
+    return MultiAgent(model_name=model_name)
@@ -1,9 +1,12 @@
+import asyncio
 import base64
+import functools
 import logging
 import os
+import weakref
 from typing import Dict, Iterable, Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from ai_models.model_name import ModelName
 
@@ -40,6 +43,15 @@ def get_openrouter_model_name(model_name: ModelName) -> str:
     return OPENROUTER_MODEL_MAP.get(model_name, model_name)
 
 
+@functools.lru_cache(maxsize=None)
+def _shared_openai_client(api_key: str, base_url: str) -> OpenAI:
+    """One sync client (and so one connection pool) per credentials/endpoint, shared by every OpenRouterClient.
+
+    Agents are created per request; sharing the pool keeps TLS connections to OpenRouter warm across them.
+    """
+    return OpenAI(api_key=api_key, base_url=base_url, timeout=120.0, max_retries=2)
+
+
 class OpenRouterClient:
     def __init__(self, api_key: str | None = None, base_url: str | None = None, model_name: ModelName | None = None):
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
@@ -51,9 +63,44 @@ class OpenRouterClient:
         DEFAULT_MODEL_NAME = ModelName.Gemini35Flash
         generic_name = model_name or DEFAULT_MODEL_NAME
         self.model_name = get_openrouter_model_name(generic_name)
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url, timeout=120.0, max_retries=2)
+        self.client = _shared_openai_client(self.api_key, self.base_url)
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI] = (
+            weakref.WeakKeyDictionary()
+        )
 
-    def stream_chat(self, prompt: str, use_google_search: bool = False) -> Iterable[Union[str, dict]]:
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """
+        Lazily created async client for the running event loop.
+
+        Instances are shared across requests (see get_multi_agent), and an async connection pool is bound to
+        the loop that opened it, so each loop gets its own client; it is dropped when the loop is collected.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, timeout=120.0, max_retries=2)
+            self._async_clients[loop] = client
+        return client
+
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: str | None) -> list[dict]:
+        """User message, preceded by the static system message when given."""
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        return messages
+
+    def stream_chat(
+        self,
+        prompt: str,
+        use_google_search: bool = False,
+        system_prompt: str | None = None,
+        response_format: dict | None = None,
+        max_tokens: int = 8192,
+        stop: list[str] | None = None,
+        timeout: float | None = None,
+    ) -> Iterable[Union[str, dict]]:
         """
         Stream chat completions as plain text chunks and citation dicts.
 
@@ -61,6 +108,13 @@ class OpenRouterClient:
             prompt: The user prompt
             model: Model name (defaults to self.default_model)
             use_google_search: If True, appends ':online' to model name to enable web search
+            system_prompt: Optional static instructions sent as a system message ahead of the prompt.
+                Keeping it byte-identical across calls lets providers reuse their prompt-prefix cache.
+            response_format: Optional OpenAI-style response_format (e.g. a json_schema) to force structured output
+            max_tokens: Upper bound on generated tokens; keep it small for label-only answers
+            stop: Optional stop sequences that end generation early
+            timeout: Optional cap in seconds on each read (connecting, the first byte and the gap between
+                chunks), retried once; the client default of 120s with two retries applies when None
 
         Yields:
             str for text chunks, dict for url_citation annotations
@@ -80,12 +134,17 @@ class OpenRouterClient:
 
         logger.info(f"OpenRouter stream_chat: model={chosen_model}, google_search={use_google_search}")
 
+        messages = self._build_messages(prompt, system_prompt)
+
+        client = self.client if timeout is None else self.client.with_options(timeout=timeout, max_retries=1)
         try:
-            response = self.client.chat.completions.create(
+            response = client.chat.completions.create(
                 model=chosen_model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=8192,
+                messages=messages,  # type: ignore
+                max_tokens=max_tokens,
                 stream=True,
+                **({"stop": stop} if stop else {}),
+                **({"response_format": response_format} if response_format else {}),
                 **({"extra_body": extra_body} if extra_body else {}),
             )
         except Exception as e:
@@ -93,6 +152,16 @@ class OpenRouterClient:
             raise
 
         for event in response:
+            if not event.choices:
+                # Final usage-only chunk
+                if event.usage:
+                    details = getattr(event.usage, "prompt_tokens_details", None)
+                    cached_tokens = getattr(details, "cached_tokens", None) if details else None
+                    logger.debug(
+                        f"OpenRouter usage: model={chosen_model}, prompt_tokens={event.usage.prompt_tokens}, "
+                        f"cached_tokens={cached_tokens}"
+                    )
+                continue
             delta = event.choices[0].delta
             if delta.content:
                 yield delta.content
@@ -108,6 +177,50 @@ class OpenRouterClient:
                         "content": citation.get("content"),
                     }
 
+    async def achat(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        response_format: dict | None = None,
+        max_tokens: int = 8192,
+        stop: list[str] | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """
+        Non-streaming chat completion that awaits on the event loop instead of blocking it.
+
+        Meant for short answers (labels, small JSON) where streaming buys nothing.
+
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional static instructions sent as a system message ahead of the prompt
+            response_format: Optional OpenAI-style response_format (e.g. a json_schema) to force structured output
+            max_tokens: Upper bound on generated tokens
+            stop: Optional stop sequences that end generation early
+            timeout: Optional per-attempt cap in seconds, retried once; the client default applies when None
+
+        Returns:
+            The full response text
+        """
+        client = self.async_client
+        if timeout is not None:
+            client = client.with_options(timeout=timeout, max_retries=1)
+        try:
+            response = await client.chat.completions.create(
+                model=self.model_name,
+                messages=self._build_messages(prompt, system_prompt),  # type: ignore
+                max_tokens=max_tokens,
+                **({"stop": stop} if stop else {}),
+                **({"response_format": response_format} if response_format else {}),
+            )
+        except Exception as e:
+            logger.error(f"OpenRouter API error (model={self.model_name}): {e}")
+            raise
+
+        if not response.choices:
+            return ""
+        return response.choices[0].message.content or ""
+
     # Add this new method to the OpenRouterClient class
     def stream_chat_with_pdf(
         self, prompt: str, pdf_content: bytes, filename: str = "document.pdf", pdf_engine: str = "pdf-text"
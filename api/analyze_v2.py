@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import uuid
 
@@ -14,6 +13,7 @@ from ai_models.model_mapper import map_frontend_model_to_enum
 from services.analyze_v2_stream import AnalyzeV2StreamService
 from services.financial_analyzer_v2 import FinancialAnalyzerV2
 from services.search_decision_engine import SearchDecisionEngine
+from services.shared.json_utils import encode_stream_event
 
 router = APIRouter()
 
@@ -55,7 +55,7 @@ async def analyze_financial_data_v2(ticker: str, request: Request) -> StreamingR
                     disable_cache=disable_cache,
                     debug_prompt_context=debug_prompt_context,
                 ):
-                    yield json.dumps(event) + "\n\n"
+                    yield encode_stream_event(event)
             except asyncio.CancelledError:
                 return
 
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
 import uuid
@@ -14,6 +13,7 @@ from fastapi.responses import StreamingResponse
 from ai_models.model_mapper import map_frontend_model_to_enum
 from services.analyze_retrieval.schemas import BraveRetrievalError
 from services.recap_analyze import RecapAnalyzeStreamService
+from services.shared.json_utils import encode_stream_event
 
 router = APIRouter()
 recap_analyze_stream_service = RecapAnalyzeStreamService()
@@ -50,10 +50,10 @@ async def analyze_recap(recap_id: int, request: Request) -> StreamingResponse:
                     is_disconnected=request.is_disconnected,
                     debug_prompt_context=debug_prompt_context,
                 ):
-                    yield json.dumps(event) + "\n\n"
+                    yield encode_stream_event(event)
             except BraveRetrievalError:
                 logger.exception("recap analyze retrieval failed", extra={"recap_id": recap_id})
-                yield json.dumps({"type": "error", "code": "retrieval_failed", "body": "Retrieval failed"}) + "\n\n"
+                yield encode_stream_event({"type": "error", "code": "retrieval_failed", "body": "Retrieval failed"})
             except asyncio.CancelledError:
                 return
 
@@ -24,6 +24,22 @@ class CompanyFinancialConnector:
             result[c.key] = value
         return result
 
+    @classmethod
+    def to_dicts(cls, model_instances: list) -> list[dict[str, Any]]:
+        """Convert a batch of SQLAlchemy models of the same type, inspecting the mapper only once"""
+        if not model_instances:
+            return []
+        keys = [c.key for c in inspect(model_instances[0]).mapper.column_attrs]
+        results = []
+        for model_instance in model_instances:
+            result = {key: getattr(model_instance, key) for key in keys}
+            for key, value in result.items():
+                # Convert datetime objects to ISO format strings
+                if isinstance(value, datetime):
+                    result[key] = value.isoformat()
+            results.append(result)
+        return results
+
     def _to_dict(self, model_instance) -> dict[str, Any]:
         """Convert SQLAlchemy model to dictionary, handling datetime fields"""
         result = {}
@@ -7,7 +7,7 @@ import logging
 import uuid
 from typing import List
 
-from connectors.cache import redis_client
+from connectors.cache import _fast_json, redis_client
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +50,7 @@ def get_messages(user_id: str, ticker: str, conversation_id: str) -> List[dict]:
 
     if messages_json:
         try:
-            messages = json.loads(messages_json)
+            messages = _fast_json.loads(messages_json) if _fast_json else json.loads(messages_json)
             messages_list = messages if isinstance(messages, list) else []
             logger.debug(
                 f"📖 Retrieved {len(messages_list)} message(s) from Redis "
@@ -115,7 +115,8 @@ def append_message(
         messages = _trim_messages(messages, MAX_HISTORY_PAIRS)
 
     # Store back to Redis with TTL refresh
-    redis_client.setex(key, CONVERSATION_TTL, json.dumps(messages))
+    payload = _fast_json.dumps(messages) if _fast_json else json.dumps(messages)
+    redis_client.setex(key, CONVERSATION_TTL, payload)
     logger.debug(f"Stored message for conversation {conversation_id} (user: {user_id}, ticker: {ticker})")
 
 
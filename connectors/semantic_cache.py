@@ -1,5 +1,7 @@
 import logging
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from enum import StrEnum
 
@@ -50,8 +52,17 @@ MARKET_PATTERNS = re.compile(
 )
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# The answer cache embeds a question on lookup and again when storing the answer on a miss, and repeats of
+# the same question are common; remember recent embeddings by exact text so each is fetched once
+EMBEDDING_MEMO_MAX_SIZE = 1024
+_embedding_memo: OrderedDict[str, list[float]] = OrderedDict()
+_embedding_memo_lock = threading.Lock()
+
+
 def normalize_question(text: str) -> str:
-    return re.sub(r"\s+", " ", text.lower().strip())
+    return _WHITESPACE_RE.sub(" ", text.lower().strip())
 
 
 def detect_ttl_tier(question: str) -> TTLTier:
@@ -68,7 +79,18 @@ class SemanticCache:
         self.openai_model = OpenAIModel()
 
     def embed(self, text: str) -> list[float]:
-        return self.openai_model.generate_embedding(text)
+        with _embedding_memo_lock:
+            embedding = _embedding_memo.get(text)
+            if embedding is not None:
+                _embedding_memo.move_to_end(text)
+                return embedding
+
+        embedding = self.openai_model.generate_embedding(text)
+        with _embedding_memo_lock:
+            _embedding_memo[text] = embedding
+            if len(_embedding_memo) > EMBEDDING_MEMO_MAX_SIZE:
+                _embedding_memo.popitem(last=False)
+        return embedding
 
     def store(
         self,
@@ -22,14 +22,12 @@ def search_similar_content_and_format_to_texts(
 ):
     results = search_similar_content(query_embeddings, index_name, filter, top_k)
 
-    context_from_official_document = ""
-    if results and results["matches"]:
-        for match in results["matches"]:
-            if match.get("score") >= 0.5:
-                text = match["metadata"]["text"].strip()
-                context_from_official_document += f"{text}\n\n"
-
-    return context_from_official_document
+    if not results or not results["matches"]:
+        return ""
+
+    return "".join(
+        f"{match['metadata']['text'].strip()}\n\n" for match in results["matches"] if match.get("score") >= 0.5
+    )
 
 
 def init_vector_record(id: str, embeddings: list[float], metadata: dict):
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from collections import OrderedDict
 
 import requests
 from dotenv import load_dotenv
@@ -10,8 +13,15 @@ logger = logging.getLogger(__name__)
 
 ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
 
-# Cache to store company fundamentals
-_company_fundamental_cache = {}
+# Fundamentals move at most daily, so an hour keeps hot tickers off the upstream APIs without serving stale data for long
+FUNDAMENTAL_CACHE_TTL_SECONDS = 3600
+FUNDAMENTAL_CACHE_MAX_SIZE = 1024
+
+# ticker -> (fetched_at, data), least recently used first
+_company_fundamental_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_cache_lock = threading.Lock()
+# One lock per ticker being fetched, so concurrent misses for a ticker share a single upstream fetch
+_fetch_locks: dict[str, threading.Lock] = {}
 
 
 def _get_from_alpha_vantage(ticker: str) -> dict | None:
@@ -73,25 +83,65 @@ def _get_from_yfinance(ticker: str) -> dict | None:
         return None
 
 
-def get_company_fundamental(ticker: str) -> dict | None:
-    logger.info("Get fundamental data for ticker", extra={"ticker": ticker})
+def _get_cached(ticker: str) -> dict | None:
+    with _cache_lock:
+        entry = _company_fundamental_cache.get(ticker)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > FUNDAMENTAL_CACHE_TTL_SECONDS:
+            del _company_fundamental_cache[ticker]
+            return None
+        _company_fundamental_cache.move_to_end(ticker)
+        return entry[1]
 
-    if ticker in _company_fundamental_cache:
-        logger.info("Found cached data", extra={"ticker": ticker, "cached": True})
-        return _company_fundamental_cache[ticker]
 
+def _set_cached(ticker: str, data: dict) -> None:
+    with _cache_lock:
+        _company_fundamental_cache[ticker] = (time.monotonic(), data)
+        _company_fundamental_cache.move_to_end(ticker)
+        if len(_company_fundamental_cache) > FUNDAMENTAL_CACHE_MAX_SIZE:
+            _company_fundamental_cache.popitem(last=False)
+
+
+def _fetch_company_fundamental(ticker: str) -> dict | None:
     data = _get_from_alpha_vantage(ticker)
     if data:
         logger.info("Fetched fundamental data from Alpha Vantage", extra={"ticker": ticker})
-        _company_fundamental_cache[ticker] = data
         return data
 
     logger.info("Falling back to yfinance", extra={"ticker": ticker})
     data = _get_from_yfinance(ticker)
     if data:
         logger.info("Fetched fundamental data from yfinance", extra={"ticker": ticker})
-        _company_fundamental_cache[ticker] = data
         return data
 
     logger.error("All sources failed for ticker", extra={"ticker": ticker})
     return None
+
+
+def get_company_fundamental(ticker: str) -> dict | None:
+    logger.info("Get fundamental data for ticker", extra={"ticker": ticker})
+
+    data = _get_cached(ticker)
+    if data is not None:
+        logger.info("Found cached data", extra={"ticker": ticker, "cached": True})
+        return data
+
+    with _cache_lock:
+        fetch_lock = _fetch_locks.setdefault(ticker, threading.Lock())
+    try:
+        with fetch_lock:
+            # A concurrent request may have fetched it while this one waited
+            data = _get_cached(ticker)
+            if data is not None:
+                logger.info("Found cached data", extra={"ticker": ticker, "cached": True})
+                return data
+
+            data = _fetch_company_fundamental(ticker)
+            if data:
+                _set_cached(ticker, data)
+            return data
+    finally:
+        with _cache_lock:
+            if _fetch_locks.get(ticker) is fetch_lock:
+                del _fetch_locks[ticker]
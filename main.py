@@ -43,6 +43,8 @@ from services.revenue_data import get_revenue_breakdown_for_company
 from services.revenue_insight import get_revenue_insights_for_company_product, get_revenue_insights_for_company_region
 from services.search_decision_engine import SearchDecisionEngine
 from services.semantic_analysis_cache import SemanticAnalysisCache
+from services.shared.json_utils import encode_stream_event
+from utils.langfuse_config import aclose_observed_stream
 from utils.logging import setup_local_logging, setup_production_logging
 
 load_dotenv()
@@ -69,6 +71,16 @@ search_decision_engine = SearchDecisionEngine()
 financial_analyzer = FinancialAnalyzer(search_decision_engine=search_decision_engine)
 etf_analyzer = ETFAnalyzer(search_decision_engine=search_decision_engine)
 
+
+async def _watch_client_disconnect(request: Request, cancel_event: asyncio.Event, poll_interval: float = 0.5) -> None:
+    """Set cancel_event once the client goes away so in-flight analysis can stop between chunks."""
+    while not cancel_event.is_set():
+        if await request.is_disconnected():
+            cancel_event.set()
+            return
+        await asyncio.sleep(poll_interval)
+
+
 # FastAPI application instance
 app = FastAPI()
 app.include_router(analyze_v2_router)
@@ -272,7 +284,7 @@ async def analyze_financial_data(ticker: str, request: Request):
             try:
                 append_user_message(anon_user_id, storage_ticker, conv_id, question)
                 logger.debug(f"💾 Stored user message in conversation {conv_id[:8]}...")
-                yield json.dumps({"type": "conversation", "body": {"conversationId": conv_id}}) + "\n\n"
+                yield encode_stream_event({"type": "conversation", "body": {"conversationId": conv_id}})
 
                 assistant_output_buffer: list[str] = []
                 last_sources_payload: dict | list | None = None
@@ -332,9 +344,10 @@ async def analyze_financial_data(ticker: str, request: Request):
                     async for event in SemanticAnalysisCache.stream_hit_replay(request, cached_entry):
                         if await request.is_disconnected():
                             return
-                        yield json.dumps(event) + "\n\n"
+                        yield encode_stream_event(event)
                     return
 
+                cancel_event = asyncio.Event()
                 analyzer = etf_analyzer if is_etf else financial_analyzer
                 analyzer_generator = analyzer.analyze_question(
                     normalized_ticker or ticker,
@@ -345,15 +358,21 @@ async def analyze_financial_data(ticker: str, request: Request):
                     conversation_messages=conversation_messages,
                     conversation_id=conv_id,
                     anon_user_id=anon_user_id,
+                    cancel_event=cancel_event,
                 )
 
-                async for chunk in analyzer_generator:
-                    if await request.is_disconnected():
-                        return
+                disconnect_watcher = asyncio.create_task(_watch_client_disconnect(request, cancel_event))
+                try:
+                    async for chunk in analyzer_generator:
+                        if cancel_event.is_set():
+                            await aclose_observed_stream(analyzer_generator)
+                            return
 
-                    append_assistant_output(chunk)
-                    track_stream_meta(chunk)
-                    yield json.dumps(chunk) + "\n\n"
+                        append_assistant_output(chunk)
+                        track_stream_meta(chunk)
+                        yield encode_stream_event(chunk)
+                finally:
+                    disconnect_watcher.cancel()
 
                 if assistant_output_buffer:
                     assistant_full_text = "".join(assistant_output_buffer)
@@ -446,7 +465,7 @@ async def analyze_financial_data_with_file(
                 file_content=file_content,
                 filename=str(file.filename),
             ):
-                yield json.dumps(chunk) + "\n\n"
+                yield encode_stream_event(chunk)
 
         return StreamingResponse(generate_analysis(), media_type="text/event-stream")
 
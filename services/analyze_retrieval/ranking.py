@@ -9,6 +9,7 @@ from services.market_recap.schemas import Candidate
 
 _RECENCY_WINDOW_DAYS = 90
 _TOKEN_RE = re.compile(r"[a-z0-9]+")
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n+")
 _STOP_WORDS = {
     "a",
     "an",
@@ -67,7 +68,7 @@ def split_source_into_passages(source: AnalyzeSource) -> list[AnalyzePassage]:
     if not raw_content:
         return passages
 
-    chunks = [chunk.strip() for chunk in re.split(r"\n\s*\n+", raw_content) if chunk.strip()]
+    chunks = [chunk.strip() for chunk in _PARAGRAPH_BREAK_RE.split(raw_content) if chunk.strip()]
     for index, chunk in enumerate(chunks):
         passages.append(
             AnalyzePassage(
@@ -27,6 +27,8 @@ from services.market_recap.url_utils import source_id_for
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 class BraveSearchClient(Protocol):
     def search(
@@ -50,7 +52,7 @@ def _country_and_lang_for(market: Market) -> tuple[str, str]:
 
 
 def _clean_whitespace(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    return _WHITESPACE_RE.sub(" ", text).strip()
 
 
 def _rewrite_company_question(question: str, *, company_name: str) -> str:
@@ -87,12 +87,13 @@ async def analyze_financial_report(
 
         # Use MultiAgent with Gemini 3.5 and :online suffix for URL context
         analysis_agent = MultiAgent(model_name=ModelName.Gemini35Flash)
-        answers = ""
+        answer_parts: List[str] = []
 
         for chunk in analysis_agent.generate_content(prompt=prompt, use_google_search=True):
             if chunk:
-                answers += chunk
+                answer_parts.append(chunk)
                 yield {"type": "answer", "body": chunk}
+        answers = "".join(answer_parts)
 
         related_question_prompt = f"""
             Based on the analysis: {answers} for {ticker.upper()}, suggest exactly 3 short and insightful follow-up questions an investor might have about the company's financial health or future outlook.
@@ -185,7 +186,7 @@ async def analyze_uploaded_file(
 
         # Use MultiAgent with native PDF support - no manual text extraction needed
         analysis_agent = MultiAgent(model_name=ModelName.Gemini35Flash)
-        full_answer = ""
+        answer_parts: List[str] = []
 
         for text_chunk in analysis_agent.generate_content_with_pdf_context(
             prompt=prompt,
@@ -193,8 +194,12 @@ async def analyze_uploaded_file(
             filename=filename,
             pdf_engine="pdf-text",  # Fast text extraction
         ):
-            full_answer += text_chunk if text_chunk else ""
-            yield {"type": "answer", "body": text_chunk if text_chunk else "❌ No analysis generated from the model"}
+            if text_chunk:
+                answer_parts.append(text_chunk)
+                yield {"type": "answer", "body": text_chunk}
+            else:
+                yield {"type": "answer", "body": "❌ No analysis generated from the model"}
+        full_answer = "".join(answer_parts)
 
         # Generate related questions
         yield thinking_status("Preparing follow-up questions...", phase=AnalysisPhase.ENRICH, step=3, total_steps=4)
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import time
+from contextlib import aclosing
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from langfuse import observe
@@ -48,7 +49,14 @@ class ETFAnalyzer:
         conversation_messages: Optional[List[Dict[str, str]]] = None,
         conversation_id: Optional[str] = None,
         anon_user_id: Optional[str] = None,
+        cancel_event: Optional[asyncio.Event] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Analyze an ETF question and stream analysis events.
+
+        ``cancel_event`` is set by the caller when the client disconnects; streaming stops at the
+        next chunk and the handler stream is closed so the upstream LLM request is abandoned.
+        """
         t_start = time.perf_counter()
 
         yield thinking_status("Understanding your question...", phase=AnalysisPhase.CLASSIFY, step=1)
@@ -83,6 +91,10 @@ class ETFAnalyzer:
 
         use_google_search = decision.use_google_search
 
+        if cancel_event and cancel_event.is_set():
+            logger.info("Client disconnected before routing; skipping ETF handler")
+            return
+
         if use_google_search:
             _search_msg = (
                 f"Searching for the latest {normalized_ticker} data..."
@@ -103,19 +115,24 @@ class ETFAnalyzer:
             short_analysis = not deep_analysis
             logger.info(f"Routing to comparison handler for tickers: {comparison_tickers}")
             comparison_splitter = VisualAnswerStreamSplitter()
-            async for chunk in self.comparison_handler.handle(
+            comparison_gen = self.comparison_handler.handle(
                 tickers=comparison_tickers,
                 question=question,
                 use_google_search=use_google_search,
                 short_analysis=short_analysis,
                 preferred_model=preferred_model,
                 conversation_messages=conversation_messages,
-            ):
-                if chunk.get("type") == "answer" and isinstance(chunk.get("body"), str):
-                    for visual_event in comparison_splitter.process_text(chunk["body"]):
-                        yield visual_event
-                else:
-                    yield chunk
+            )
+            async with aclosing(comparison_gen):
+                async for chunk in comparison_gen:
+                    if cancel_event and cancel_event.is_set():
+                        logger.info("Client disconnected; stopping ETF comparison stream")
+                        return
+                    if chunk.get("type") == "answer" and isinstance(chunk.get("body"), str):
+                        for visual_event in comparison_splitter.process_text(chunk["body"]):
+                            yield visual_event
+                    else:
+                        yield chunk
             for visual_event in comparison_splitter.finalize():
                 yield visual_event
             return
@@ -155,21 +172,25 @@ class ETFAnalyzer:
             yield {"type": "answer", "body": "Unable to process question type"}
             return
 
-        async for chunk in handler_gen:
-            chunk_type = chunk.get("type")
-            if chunk_type == "google_search_ground" and chunk.get("url"):
-                has_sources = True
-            elif chunk_type == "sources" and chunk.get("body"):
-                has_sources = True
-            elif chunk_type == "sources_grouped":
-                grouped = (chunk.get("body") or {}).get("sources") if isinstance(chunk.get("body"), dict) else []
-                if grouped:
+        async with aclosing(handler_gen):
+            async for chunk in handler_gen:
+                if cancel_event and cancel_event.is_set():
+                    logger.info("Client disconnected; stopping ETF handler stream")
+                    return
+                chunk_type = chunk.get("type")
+                if chunk_type == "google_search_ground" and chunk.get("url"):
+                    has_sources = True
+                elif chunk_type == "sources" and chunk.get("body"):
                     has_sources = True
-            if chunk_type == "answer" and isinstance(chunk.get("body"), str):
-                for visual_event in visual_splitter.process_text(chunk.get("body")):
-                    yield visual_event
-            else:
-                yield chunk
+                elif chunk_type == "sources_grouped":
+                    grouped = (chunk.get("body") or {}).get("sources") if isinstance(chunk.get("body"), dict) else []
+                    if grouped:
+                        has_sources = True
+                if chunk_type == "answer" and isinstance(chunk.get("body"), str):
+                    for visual_event in visual_splitter.process_text(chunk.get("body")):
+                        yield visual_event
+                else:
+                    yield chunk
 
         for visual_event in visual_splitter.finalize():
             yield visual_event
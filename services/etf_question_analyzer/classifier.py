@@ -6,7 +6,7 @@ from typing import Optional
 
 from langfuse import observe
 
-from agent.multi_agent import MultiAgent
+from agent.multi_agent import MultiAgent, _join_text_chunks
 from ai_models.model_name import ModelName
 
 from .context_builders.components import ETFPromptComponents
@@ -90,9 +90,7 @@ Return ONLY in this JSON format:
 }}"""
 
         try:
-            response_text = ""
-            for chunk in self.agent.generate_content(prompt=prompt):
-                response_text += chunk
+            response_text = _join_text_chunks(self.agent.generate_content(prompt=prompt))
 
             # Parse JSON response
             import json
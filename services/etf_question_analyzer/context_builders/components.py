@@ -1,34 +1,40 @@
 """Shared prompt components for ETF context builders."""
 
+import functools
 from datetime import date
 
 from services.shared.prompt_utils import visual_output_instructions
 
 
+@functools.lru_cache(maxsize=1)
+def _current_date_context(today: date) -> str:
+    """ETF date grounding text for today; every ETF prompt of the day embeds it, so it is rendered once per day."""
+    formatted = today.strftime("%B %d, %Y")
+    current_year = today.year
+    prior_year = current_year - 1
+    current_quarter_num = (today.month - 1) // 3 + 1
+    current_quarter = f"{current_year}-Q{current_quarter_num}"
+    if current_quarter_num == 1:
+        last_completed_quarter = f"{prior_year}-Q4"
+    else:
+        last_completed_quarter = f"{current_year}-Q{current_quarter_num - 1}"
+    return (
+        f"Today's date is {formatted}. Current year is {current_year}. "
+        f"Current (in-progress) quarter is {current_quarter}; most recently completed reporting quarter is approximately {last_completed_quarter}. "
+        f'When the user uses temporal words like "recently", "lately", "latest", "most recent", "current", "this quarter", "last quarter" WITHOUT specifying a year or quarter, they mean the most recently completed quarter ({last_completed_quarter} or newer if available), NOT the prior full fiscal year. Prefer quarterly data at the latest available period. '
+        f'When the user says "this year" or "year to date", they mean {current_year}, not {prior_year}. '
+        f"Unless the user explicitly asks for historical periods, only use data from {current_year} or {prior_year}. "
+        "If fresh numeric ETF data cannot be verified, provide a qualitative best-effort answer and state the limitation."
+    )
+
+
 class ETFPromptComponents:
     """Reusable prompt fragments for ETF analysis."""
 
     @staticmethod
     def current_date() -> str:
         """Return current date context for prompt grounding."""
-        today = date.today()
-        formatted = today.strftime("%B %d, %Y")
-        current_year = today.year
-        prior_year = current_year - 1
-        current_quarter_num = (today.month - 1) // 3 + 1
-        current_quarter = f"{current_year}-Q{current_quarter_num}"
-        if current_quarter_num == 1:
-            last_completed_quarter = f"{prior_year}-Q4"
-        else:
-            last_completed_quarter = f"{current_year}-Q{current_quarter_num - 1}"
-        return (
-            f"Today's date is {formatted}. Current year is {current_year}. "
-            f"Current (in-progress) quarter is {current_quarter}; most recently completed reporting quarter is approximately {last_completed_quarter}. "
-            f'When the user uses temporal words like "recently", "lately", "latest", "most recent", "current", "this quarter", "last quarter" WITHOUT specifying a year or quarter, they mean the most recently completed quarter ({last_completed_quarter} or newer if available), NOT the prior full fiscal year. Prefer quarterly data at the latest available period. '
-            f'When the user says "this year" or "year to date", they mean {current_year}, not {prior_year}. '
-            f"Unless the user explicitly asks for historical periods, only use data from {current_year} or {prior_year}. "
-            "If fresh numeric ETF data cannot be verified, provide a qualitative best-effort answer and state the limitation."
-        )
+        return _current_date_context(date.today())
 
     @staticmethod
     def base_context(ticker: str, question: str) -> str:
@@ -10,6 +10,62 @@ from .components import ETFPromptComponents
 
 logger = logging.getLogger(__name__)
 
+# Everything after the ETF data is static, so each mode's instructions are assembled once at import
+_SHORT_ANALYSIS_INSTRUCTIONS = f"""**Instructions for your analysis:**
+
+            Analyze the ETF data and organize your findings into focused sections.
+            Limit to 1-2 sections maximum. Each section must be 2-3 sentences MAX (under 60 words).
+            Start each section heading on its own line in markdown bold: **Section Title**
+            Tell the story behind the numbers — don't list every detail.
+
+            {ETFPromptComponents.section_structure_template()}
+
+            {ETFPromptComponents.example_structure()}
+
+            {ETFPromptComponents.etf_data_formatting()}
+
+            {ETFPromptComponents.source_instructions()}
+
+            {ETFPromptComponents.visual_output_instructions()}
+
+            Answer in a professional, informative tone. Prioritize clarity and scannability over narrative flow.
+        """
+
+_DEEP_ANALYSIS_INSTRUCTIONS = f"""**Instructions for your analysis:**
+
+            Structure your response with EXACTLY 3 sections in this order:
+
+            1. (~80 words) A concise overview that previews the key findings from the two sections below. Highlight the most important takeaway.
+
+            2. (~160 words) Choose a section title (max 6 words) for the most relevant aspect of the question. Identify 2-3 key focus points and analyze them in depth.
+
+            3. (~160 words) Choose a section title (max 6 words) for a second important aspect. Identify 2-3 key focus points and analyze them in depth.
+
+            The two section titles should be specific to the question asked (e.g., "Holdings Concentration Analysis" not generic "ETF Overview").
+
+            **Formatting Guidelines:**
+            - Start each section with its title in markdown bold: **Section Title**
+            - Add a blank line after the title before starting the paragraph
+            - Each section should be a cohesive paragraph (or 2-3 short paragraphs)
+            - Use numbers strategically - select 2-4 key figures per section that best support your analysis
+            - Use the largest appropriate unit for numbers (e.g., "$1.5B" not "$1,500M", "0.07%" not "7 basis points")
+            - Keep total response under 400 words
+
+            **Analysis Rules:**
+            - PRIORITIZE REASONING: Explain WHY certain allocations exist, WHAT drives the ETF's strategy, and WHAT it means for investors
+            - STRATEGIC USE OF NUMBERS: Include specific figures only when they strengthen your argument or illustrate a key point
+            - IDENTIFY DRIVERS: Explain the underlying investment strategy, market conditions, or structural decisions
+            - CONNECT THE DOTS: Link ETF characteristics to investor goals, market positioning, and risk-return profile
+            - NO DUPLICATION: Each sentence should add new information
+            - USE SEARCH WISELY: Get up-to-date context for market trends and competitive landscape
+
+            {ETFPromptComponents.etf_data_formatting()}
+
+            {ETFPromptComponents.source_instructions()}
+
+            {ETFPromptComponents.visual_output_instructions()}
+        """
+
 
 class DetailedETFBuilder(ETFContextBuilder):
     """Builds context for detailed ETF analysis using full data."""
@@ -23,11 +79,6 @@ class DetailedETFBuilder(ETFContextBuilder):
     def _build_short_analysis(self, input: ETFContextBuilderInput) -> str:
         """Build context for short, dynamic analysis (default)."""
         base_context = ETFPromptComponents.base_context(input.ticker, input.question)
-        section_structure = ETFPromptComponents.section_structure_template()
-        example_structure = ETFPromptComponents.example_structure()
-        etf_formatting = ETFPromptComponents.etf_data_formatting()
-        source_instructions = ETFPromptComponents.source_instructions()
-        visual_instructions = ETFPromptComponents.visual_output_instructions()
 
         # Serialize ETF data
         etf_context = self._serialize_etf_data(input.etf_data)
@@ -43,32 +94,11 @@ class DetailedETFBuilder(ETFContextBuilder):
 
             {"Data Availability Notes:\n" + warnings_text if warnings_text else ""}
 
-            **Instructions for your analysis:**
-
-            Analyze the ETF data and organize your findings into focused sections.
-            Limit to 1-2 sections maximum. Each section must be 2-3 sentences MAX (under 60 words).
-            Start each section heading on its own line in markdown bold: **Section Title**
-            Tell the story behind the numbers — don't list every detail.
-
-            {section_structure}
-
-            {example_structure}
-
-            {etf_formatting}
-
-            {source_instructions}
-
-            {visual_instructions}
-
-            Answer in a professional, informative tone. Prioritize clarity and scannability over narrative flow.
-        """
+            {_SHORT_ANALYSIS_INSTRUCTIONS}"""
 
     def _build_deep_analysis(self, input: ETFContextBuilderInput) -> str:
         """Build context for comprehensive, detailed analysis with structured sections."""
         base_context = ETFPromptComponents.base_context(input.ticker, input.question)
-        etf_formatting = ETFPromptComponents.etf_data_formatting()
-        source_instructions = ETFPromptComponents.source_instructions()
-        visual_instructions = ETFPromptComponents.visual_output_instructions()
 
         # Serialize ETF data
         etf_context = self._serialize_etf_data(input.etf_data)
@@ -84,40 +114,7 @@ class DetailedETFBuilder(ETFContextBuilder):
 
             {"Data Availability Notes:\n" + warnings_text if warnings_text else ""}
 
-            **Instructions for your analysis:**
-
-            Structure your response with EXACTLY 3 sections in this order:
-
-            1. (~80 words) A concise overview that previews the key findings from the two sections below. Highlight the most important takeaway.
-
-            2. (~160 words) Choose a section title (max 6 words) for the most relevant aspect of the question. Identify 2-3 key focus points and analyze them in depth.
-
-            3. (~160 words) Choose a section title (max 6 words) for a second important aspect. Identify 2-3 key focus points and analyze them in depth.
-
-            The two section titles should be specific to the question asked (e.g., "Holdings Concentration Analysis" not generic "ETF Overview").
-
-            **Formatting Guidelines:**
-            - Start each section with its title in markdown bold: **Section Title**
-            - Add a blank line after the title before starting the paragraph
-            - Each section should be a cohesive paragraph (or 2-3 short paragraphs)
-            - Use numbers strategically - select 2-4 key figures per section that best support your analysis
-            - Use the largest appropriate unit for numbers (e.g., "$1.5B" not "$1,500M", "0.07%" not "7 basis points")
-            - Keep total response under 400 words
-
-            **Analysis Rules:**
-            - PRIORITIZE REASONING: Explain WHY certain allocations exist, WHAT drives the ETF's strategy, and WHAT it means for investors
-            - STRATEGIC USE OF NUMBERS: Include specific figures only when they strengthen your argument or illustrate a key point
-            - IDENTIFY DRIVERS: Explain the underlying investment strategy, market conditions, or structural decisions
-            - CONNECT THE DOTS: Link ETF characteristics to investor goals, market positioning, and risk-return profile
-            - NO DUPLICATION: Each sentence should add new information
-            - USE SEARCH WISELY: Get up-to-date context for market trends and competitive landscape
-
-            {etf_formatting}
-
-            {source_instructions}
-
-            {visual_instructions}
-        """
+            {_DEEP_ANALYSIS_INSTRUCTIONS}"""
 
     def _serialize_etf_data(self, etf_data) -> Dict:
         """Convert ETFFundamentalDto to dictionary for JSON serialization."""
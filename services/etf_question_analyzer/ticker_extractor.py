@@ -3,7 +3,7 @@ import re
 import time
 from typing import Optional
 
-from agent.multi_agent import MultiAgent
+from agent.multi_agent import MultiAgent, _join_text_chunks
 from ai_models.model_name import ModelName
 from connectors.etf_fundamental import ETFFundamentalConnector
 
@@ -22,13 +22,14 @@ _COMPARISON_PATTERN = re.compile(
     """,
     re.IGNORECASE | re.VERBOSE,
 )
+_TICKER_LIKE_RE = re.compile(r"\b[A-Z][A-Z0-9]{1,5}\b")
 
 
 def _has_comparison_signals(question: str) -> bool:
     """Fast check: does the question contain comparison language or multiple ticker-like tokens?"""
     if _COMPARISON_PATTERN.search(question):
         return True
-    ticker_like = re.findall(r"\b[A-Z][A-Z0-9]{1,5}\b", question)
+    ticker_like = _TICKER_LIKE_RE.findall(question)
     return len(ticker_like) >= 2
 
 
@@ -82,11 +83,7 @@ Output: "Difference between {current_ticker} and CSPX"
 Return ONLY the rewritten question, no explanation."""
 
         try:
-            response = ""
-            for chunk in self.agent.generate_content(prompt):
-                response += chunk
-
-            rewritten = response.strip()
+            rewritten = _join_text_chunks(self.agent.generate_content(prompt)).strip()
             return rewritten if rewritten else question
 
         except Exception as e:
@@ -193,9 +190,7 @@ Examples:
 Return only the JSON object, no other text."""
 
         try:
-            response = ""
-            for chunk in self.agent.generate_content(prompt):
-                response += chunk
+            response = _join_text_chunks(self.agent.generate_content(prompt))
 
             # Parse JSON response
             import json
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import time
+from contextlib import aclosing
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from langfuse import observe
@@ -21,7 +22,8 @@ from services.question_analyzer.handlers import (
     CompanyGeneralHandler,
     GeneralFinanceHandler,
 )
-from services.question_analyzer.types import QuestionType
+from services.question_analyzer.semantic_classification_cache import SemanticClassificationCache
+from services.question_analyzer.types import QuestionClassification, QuestionType
 from services.search_decision_engine import SearchDecisionEngine
 from utils.url_helper import extract_first_url, is_sec_filing_url, strip_url_from_text, validate_pdf_url
 from utils.visual_stream import VisualAnswerStreamSplitter
@@ -45,7 +47,7 @@ class FinancialAnalyzer:
         self.search_decision_engine = search_decision_engine or SearchDecisionEngine()
 
         # Initialize components
-        self.classifier = QuestionClassifier()
+        self.classifier = QuestionClassifier(semantic_cache=SemanticClassificationCache())
         self.data_optimizer = FinancialDataOptimizer(self.company_financial_connector)
 
         # Initialize comparison handler
@@ -78,7 +80,14 @@ class FinancialAnalyzer:
         conversation_messages: Optional[List[Dict[str, str]]] = None,
         conversation_id: Optional[str] = None,
         anon_user_id: Optional[str] = None,
+        cancel_event: Optional[asyncio.Event] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Analyze a question and stream analysis events.
+
+        ``cancel_event`` is set by the caller when the client disconnects; streaming stops at the
+        next chunk so the upstream LLM request is abandoned instead of running to completion.
+        """
         t_start = time.perf_counter()
 
         yield thinking_status("Understanding your question...", phase=AnalysisPhase.CLASSIFY, step=1)
@@ -99,7 +108,9 @@ class FinancialAnalyzer:
                     return
                 yield {"type": "attachment_url", "body": extracted_url}
                 yield thinking_status("Reading the attached document...", phase=AnalysisPhase.ANALYZE, step=2)
-                async for chunk in self._handle_pdf_url_question(ticker, question, extracted_url, preferred_model):
+                async for chunk in self._handle_pdf_url_question(
+                    ticker, question, extracted_url, preferred_model, cancel_event=cancel_event
+                ):
                     yield chunk
                 return
 
@@ -135,50 +146,72 @@ class FinancialAnalyzer:
             available_metrics=available_metrics,
         )
 
-        # Run search decision + question classification in parallel
-        classify_coro = self.classifier.classify_question_type(
-            question, ticker, conversation_messages=conversation_messages
-        )
+        # Run search decision + question classification in parallel. With a ticker, the
+        # data/period classification is fired alongside so company-specific questions
+        # don't pay for a second sequential LLM round-trip inside the handler.
+        data_classification: Optional[QuestionClassification] = None
         t_parallel_block = time.perf_counter()
-        decision, classify_result = await asyncio.gather(search_coro, classify_coro)
+        if normalized_ticker != "none":
+            classify_coro = self.classifier.classify_all(
+                question, ticker, conversation_messages=conversation_messages, available_metrics=available_metrics
+            )
+            decision, data_classification = await asyncio.gather(search_coro, classify_coro)
+            classification = data_classification.question_type
+            comparison_tickers = data_classification.comparison_tickers
+        else:
+            classify_coro = self.classifier.classify_question_type(
+                question, ticker, conversation_messages=conversation_messages
+            )
+            decision, (classification, comparison_tickers) = await asyncio.gather(search_coro, classify_coro)
         logger.info(
-            "Profiling parallel classify_question_type + search_decision_engine.decide: %.4fs",
+            "Profiling parallel question classification + search_decision_engine.decide: %.4fs",
             time.perf_counter() - t_parallel_block,
         )
-        classification, comparison_tickers = classify_result
         logger.info(f"Question classified as: {classification}")
 
         use_google_search = decision.use_google_search
 
-        _t = normalized_ticker if normalized_ticker != "none" else None
-        if use_google_search:
-            _search_msg = f"Searching for the latest {_t} data..." if _t else "Searching for the latest data..."
-            yield thinking_status(_search_msg, phase=AnalysisPhase.SEARCH, step=2)
-        else:
-            _db_msg = f"Found {_t} data in our database" if _t else "Using data from our database"
-            yield thinking_status(_db_msg, phase=AnalysisPhase.SEARCH, step=2)
-
         if not classification:
             yield {"type": "answer", "body": "❌ Unable to classify question type"}
             return
 
+        if cancel_event and cancel_event.is_set():
+            logger.info("Client disconnected before routing; skipping handler")
+            return
+
+        # General finance questions have no company data to report on; the handler emits
+        # its own search status right before the LLM call when search actually fires.
+        if classification != QuestionType.GENERAL_FINANCE.value:
+            _t = normalized_ticker if normalized_ticker != "none" else None
+            if use_google_search:
+                _search_msg = f"Searching for the latest {_t} data..." if _t else "Searching for the latest data..."
+                yield thinking_status(_search_msg, phase=AnalysisPhase.SEARCH, step=2)
+            else:
+                _db_msg = f"Found {_t} data in our database" if _t else "Using data from our database"
+                yield thinking_status(_db_msg, phase=AnalysisPhase.SEARCH, step=2)
+
         # Handle comparison questions
         if classification == QuestionType.COMPANY_COMPARISON.value and comparison_tickers:
             short_analysis = not deep_analysis
             comparison_splitter = VisualAnswerStreamSplitter()
-            async for chunk in self.comparison_handler.handle(
+            comparison_gen = self.comparison_handler.handle(
                 tickers=comparison_tickers,
                 question=question,
                 use_google_search=use_google_search,
                 short_analysis=short_analysis,
                 preferred_model=preferred_model,
                 conversation_messages=conversation_messages,
-            ):
-                if chunk.get("type") == "answer" and isinstance(chunk.get("body"), str):
-                    for visual_event in comparison_splitter.process_text(chunk["body"]):
-                        yield visual_event
-                else:
-                    yield chunk
+            )
+            async with aclosing(comparison_gen):
+                async for chunk in comparison_gen:
+                    if cancel_event and cancel_event.is_set():
+                        logger.info("Client disconnected; stopping comparison stream")
+                        return
+                    if chunk.get("type") == "answer" and isinstance(chunk.get("body"), str):
+                        for visual_event in comparison_splitter.process_text(chunk["body"]):
+                            yield visual_event
+                    else:
+                        yield chunk
             for visual_event in comparison_splitter.finalize():
                 yield visual_event
             return
@@ -220,25 +253,30 @@ class FinancialAnalyzer:
                 preferred_model,
                 conversation_messages=conversation_messages,
                 available_metrics=available_metrics,
+                data_classification=data_classification,
             )
         else:
             return
 
-        async for chunk in handler_gen:
-            chunk_type = chunk.get("type")
-            if chunk_type == "google_search_ground" and chunk.get("url"):
-                has_sources = True
-            elif chunk_type == "sources" and chunk.get("body"):
-                has_sources = True
-            elif chunk_type == "sources_grouped":
-                grouped = (chunk.get("body") or {}).get("sources") if isinstance(chunk.get("body"), dict) else []
-                if grouped:
+        async with aclosing(handler_gen):
+            async for chunk in handler_gen:
+                if cancel_event and cancel_event.is_set():
+                    logger.info("Client disconnected; stopping handler stream")
+                    return
+                chunk_type = chunk.get("type")
+                if chunk_type == "google_search_ground" and chunk.get("url"):
                     has_sources = True
-            if chunk_type == "answer" and isinstance(chunk.get("body"), str):
-                for visual_event in visual_splitter.process_text(chunk.get("body")):
-                    yield visual_event
-            else:
-                yield chunk
+                elif chunk_type == "sources" and chunk.get("body"):
+                    has_sources = True
+                elif chunk_type == "sources_grouped":
+                    grouped = (chunk.get("body") or {}).get("sources") if isinstance(chunk.get("body"), dict) else []
+                    if grouped:
+                        has_sources = True
+                if chunk_type == "answer" and isinstance(chunk.get("body"), str):
+                    for visual_event in visual_splitter.process_text(chunk.get("body")):
+                        yield visual_event
+                else:
+                    yield chunk
 
         for visual_event in visual_splitter.finalize():
             yield visual_event
@@ -258,7 +296,12 @@ class FinancialAnalyzer:
         logger.info(f"Profiling analyze_question total: {t_end - t_start:.4f}s")
 
     async def _handle_pdf_url_question(
-        self, ticker: str, question: str, pdf_url: str, preferred_model: ModelName = ModelName.Auto
+        self,
+        ticker: str,
+        question: str,
+        pdf_url: str,
+        preferred_model: ModelName = ModelName.Auto,
+        cancel_event: Optional[asyncio.Event] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Handle questions that include a PDF URL.
@@ -268,6 +311,7 @@ class FinancialAnalyzer:
             question: The original question containing the URL
             pdf_url: The extracted PDF URL
             preferred_model: Preferred model to use for PDF processing
+            cancel_event: Optional event set on client disconnect to abandon the PDF stream
 
         Yields:
             Dictionary chunks with analysis results
@@ -339,6 +383,10 @@ class FinancialAnalyzer:
                     filename=f"{ticker.lower()}_document.pdf",
                     pdf_engine="pdf-text",
                 ):
+                    # Returning drops the last reference to the stream generator, which closes the HTTP response
+                    if cancel_event and cancel_event.is_set():
+                        logger.info("Client disconnected; abandoning PDF stream")
+                        return
                     yield {"type": "answer", "body": chunk}
             except Exception as e:
                 logger.error(f"Error generating content with PDF URL: {e}")
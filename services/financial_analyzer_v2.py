@@ -54,7 +54,9 @@ class FinancialAnalyzerV2:
         self.company_financial_connector = company_financial_connector or CompanyFinancialConnector()
         self.company_general_handler = company_general_handler or CompanyGeneralHandlerV2()
         self.general_finance_handler = general_finance_handler or GeneralFinanceHandlerV2()
-        self.company_specific_finance_handler = company_specific_finance_handler or CompanySpecificFinanceHandlerV2()
+        self.company_specific_finance_handler = company_specific_finance_handler or CompanySpecificFinanceHandlerV2(
+            classifier=self.classifier
+        )
         self.comparison_handler = comparison_handler or CompanyComparisonHandlerV2()
 
     async def _handle_pdf_url_question(
@@ -9,6 +9,9 @@ import httpx
 from services.market_recap.schemas import Candidate
 from services.market_recap.source_policy import ALLOWLIST_BY_MARKET
 
+_ISO_DATE_RE = re.compile(r"20\d{2}-\d{2}-\d{2}")
+_DATE_HINT_RE = re.compile(r"(20\d{2})-(\d{2})-(\d{2})")
+
 
 def _build_goggle(*, market: str, include_domains: list[str] | None = None) -> str:
     market_key = market.upper()
@@ -54,7 +57,7 @@ def _parse_age_entry(value: object) -> datetime | None:
     raw = value.strip()
     if not raw:
         return None
-    if re.fullmatch(r"20\d{2}-\d{2}-\d{2}", raw):
+    if _ISO_DATE_RE.fullmatch(raw):
         parsed = date.fromisoformat(raw)
         return datetime(parsed.year, parsed.month, parsed.day, 12, 0, tzinfo=UTC)
     try:
@@ -85,7 +88,7 @@ def _parse_age_entry(value: object) -> datetime | None:
 def _parse_date_hint(value: object) -> datetime | None:
     if not isinstance(value, str):
         return None
-    match = re.search(r"(20\d{2})-(\d{2})-(\d{2})", value)
+    match = _DATE_HINT_RE.search(value)
     if match is None:
         return None
     try:
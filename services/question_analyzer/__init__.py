@@ -4,12 +4,19 @@ from .classifier import QuestionClassifier
 from .company_specific_finance_handler import CompanySpecificFinanceHandler
 from .data_optimizer import FinancialDataOptimizer
 from .handlers import CompanyGeneralHandler, GeneralFinanceHandler
-from .types import AnalysisChunk, FinancialDataRequirement, FinancialPeriodRequirement, QuestionType
+from .types import (
+    AnalysisChunk,
+    FinancialDataRequirement,
+    FinancialPeriodRequirement,
+    QuestionClassification,
+    QuestionType,
+)
 
 __all__ = [
     "QuestionType",
     "FinancialDataRequirement",
     "FinancialPeriodRequirement",
+    "QuestionClassification",
     "AnalysisChunk",
     "QuestionClassifier",
     "FinancialDataOptimizer",
@@ -1,23 +1,47 @@
 """Question classification logic using AI models."""
 
+import asyncio
+import functools
 import json
 import logging
 import re
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
 
-from langfuse import observe
-
-from agent.multi_agent import MultiAgent
+from agent.multi_agent import MultiAgent, get_multi_agent
 from ai_models.model_name import ModelName
 from core.financial_statement_type import FinancialStatementType
+from utils.langfuse_config import observe_if_enabled
+from utils.profiling import profiled
 
 from .context_builders.components import PromptComponents
+from .schemas import (
+    CombinedClassificationSchema,
+    DataAndPeriodSchema,
+    PeriodRequirementSchema,
+    json_schema_response_format,
+)
+from .semantic_classification_cache import SemanticClassificationCache
 from .ticker_extractor import StockTickerExtractor
-from .types import FinancialDataRequirement, FinancialPeriodRequirement, QuestionType
+from .types import FinancialDataRequirement, FinancialPeriodRequirement, QuestionClassification, QuestionType
 
 logger = logging.getLogger(__name__)
 
+# RE2 (google-re2 in requirements.txt) matches in linear time, so hostile or truncated model output can't
+# trigger backtracking blowups. stdlib re only covers dev setups without the wheel; the pattern works in both
+# (inline (?s) instead of re.DOTALL for RE2).
+try:
+    import re2 as _response_re
+except ImportError:
+    _response_re = re
+
+_MARKDOWN_JSON_RE = _response_re.compile(r"(?s)```(?:json)?\s*(\{.*?\})\s*```")
+_JSON_DECODER = json.JSONDecoder()
+_PLACEHOLDER_TICKERS = frozenset({"UNDEFINED", "NULL", "NONE"})
+
+T = TypeVar("T")
+
 
 class QuestionClassifier:
     """Classifies questions to determine handling strategy."""
@@ -42,15 +66,287 @@ class QuestionClassifier:
         "annual earnings",
     ]
 
-    def __init__(self, agent: Optional[MultiAgent] = None):
+    # Single-pass, case-insensitive alternations built from the keyword lists above
+    _QUARTERLY_REPORT_RE = re.compile("|".join(map(re.escape, QUARTERLY_REPORT_KEYWORDS)), re.IGNORECASE)
+    _ANNUAL_REPORT_RE = re.compile("|".join(map(re.escape, ANNUAL_REPORT_KEYWORDS)), re.IGNORECASE)
+
+    # Financial metrics that make a question company-specific-finance whenever a ticker is known
+    _FINANCE_METRIC_RE = re.compile(
+        r"\b(?:revenues?|net income|operating income|ebitda|eps|earnings per share|gross margin|operating margin"
+        r"|profit margin|free cash flow|cash flow|debt-to-equity)\b",
+        re.IGNORECASE,
+    )
+    # Non-financial company facts (leadership, founding, location, mission)
+    _COMPANY_GENERAL_RE = re.compile(
+        r"\b(?:ceo|cfo|founders?|founded|headquarter(?:s|ed)?|mission statement)\b",
+        re.IGNORECASE,
+    )
+
+    # Fundamentals-only metrics (the 'basic' data requirement). Only a hint for prefetching fundamentals,
+    # never used to classify
+    _BASIC_METRIC_RE = re.compile(
+        r"\b(?:market cap(?:italization)?|p/e|pe ratio|price[- ]to[- ]earnings|valuation|profitable|dividend yield"
+        r"|beta|52[- ]week|shares outstanding)\b",
+        re.IGNORECASE,
+    )
+
+    # Each category keeps its own pattern: keywords from different categories overlap ("annual earnings
+    # report", "earnings per share"), and one alternation would let the first match hide the other
+    _FAST_PATH_PATTERNS = {
+        "quarterly_report": _QUARTERLY_REPORT_RE,
+        "annual_report": _ANNUAL_REPORT_RE,
+        "finance_metric": _FINANCE_METRIC_RE,
+        "company_general": _COMPANY_GENERAL_RE,
+    }
+
+    # Static instructions are sent as the system message; keeping them free of per-request values
+    # makes the prefix byte-identical across calls so the provider's prompt cache can reuse it.
+    _QUESTION_TYPE_INSTRUCTIONS = f"""
+        Classify the following question into one of these three categories.
+        NOTE: The question may be in any language. Classify based on the meaning regardless of language.
+
+        1. '{QuestionType.GENERAL_FINANCE.value}' - for general financial concepts, market trends, strategy questions, or questions about individuals that don't require specific company financial statements
+        2. '{QuestionType.COMPANY_SPECIFIC_FINANCE.value}' - for questions that specifically require analyzing a company's financial statements, metrics, or performance (ONLY if a valid ticker is provided)
+        3. '{QuestionType.COMPANY_GENERAL.value}' - for general questions about a company that don't require financial analysis
+
+        Examples:
+        - 'How does inflation affect stock markets?' -> {QuestionType.GENERAL_FINANCE.value}
+        - 'Which are potential areas to reinvest?' (follow-up to cash flow discussion) -> {QuestionType.GENERAL_FINANCE.value}
+        - 'What was Microsoft's profit margin in 2023?' -> {QuestionType.COMPANY_SPECIFIC_FINANCE.value}
+        - 'What are the company financial performance trends?' -> {QuestionType.COMPANY_SPECIFIC_FINANCE.value}
+        - 'Who is the CEO of Amazon?' -> {QuestionType.COMPANY_GENERAL.value}
+
+        Rules:
+        - Financial metrics, performance, trends or results (revenue, profit, margins, earnings, cash flow, debt, assets, growth, quarterly/annual, EBITDA, ROE, expenses) with a valid ticker -> {QuestionType.COMPANY_SPECIFIC_FINANCE.value}
+        - No valid ticker (empty/undefined) -> never {QuestionType.COMPANY_SPECIFIC_FINANCE.value}, even with financial terms
+        - Vague question with conversation context -> classify by the previous topic
+        - Market trends, concepts, strategy or individuals -> {QuestionType.GENERAL_FINANCE.value}
+        - {QuestionType.COMPANY_GENERAL.value} only for non-financial company info (mission, CEO, products, history, location)
+"""
+    QUESTION_TYPE_SYSTEM_PROMPT = (
+        _QUESTION_TYPE_INSTRUCTIONS
+        + """
+        Reply with the category label only.
+        """
+    )
+
+    _DATA_AND_PERIOD_INSTRUCTIONS = """
+            Analyze the question about the given company and decide (a) what level of financial data is needed, (b) which financial periods are needed, and (c) which statement types are relevant.
+            NOTE: The question may be in any language. Classify based on the meaning regardless of language.
+
+            ===== Part A: data_requirement =====
+            Pick exactly one of:
+
+            1. 'none' - Question can be answered without any financial data, OR the question asks for granular data not available in our database (e.g., segment breakdowns, revenue by source, geographic splits)
+            2. 'basic' - Question needs only basic company metrics like market cap, P/E ratio, basic ratios (e.g., "What is the company's market cap?", "What's the P/E ratio?", "Is the company profitable?")
+            3. 'detailed' - Question requires specific financial statement data like revenue, expenses, cash flow details that ARE available in our metrics (e.g., "What was the company's revenue last quarter?", "How much debt does the company have?", "What's the operating margin trend?")
+            4. 'quarterly_summary' - Question requires a summary of recent quarterly financial results (e.g., "Summarize the latest quarterly earnings report", "What were the key financial highlights last quarter?")
+            5. 'annual_summary' - Question requires a summary of recent annual financial results (e.g., "Summarize the latest annual report", "What were the key highlights from the 10-K filing?")
+
+            data_requirement examples:
+            - "What does Apple do?" -> none
+            - "Is Amazon profitable?" -> basic
+            - "What's Google's debt-to-equity ratio?" -> detailed
+
+            ===== Part B: period_requirement =====
+            If data_requirement is 'none' or 'basic', set period_requirement to null.
+            Otherwise, fill period_requirement with:
+            1. period_type: "annual", "quarterly", or "both"
+            2. Specific periods: which years or quarters, or just recent periods
+
+            period_requirement examples (omitted fields are null):
+            - "What was Apple's revenue in 2023?" -> {"period_type": "annual", "specific_years": [2023]}
+            - "How did Tesla perform in Q3 2024?" -> {"period_type": "quarterly", "specific_quarters": ["2024-Q3"]}
+            - "Show me Microsoft's revenue trend over the last 3 years" -> {"period_type": "annual", "num_periods": 3}
+            - "Show both annual and quarterly trends" -> {"period_type": "both", "num_periods": 3}
+
+            Rules for period_requirement:
+            - No specific year/quarter -> num_periods 3-5
+            - Quarters use "YYYY-Q#" (e.g., "2024-Q1")
+            - Fill only one of specific_years / specific_quarters / num_periods, except ["latest"] which also needs num_periods: 1
+            - Default to annual unless quarterly is explicit or implied by temporal words (see the date context given with the question)
+            - "recently", "lately", "latest", "most recent", "current", "this quarter", "last quarter" WITHOUT a specific year/quarter → {"period_type": "quarterly", "specific_quarters": ["latest"], "num_periods": 1}
+
+            ===== Part C: relevant_statements =====
+            If data_requirement is 'detailed', return a non-null JSON array from "income_statement", "balance_sheet", "cash_flow".
+            Broad questions or a full financial picture -> all three.
+
+            Examples:
+            - "What was revenue last quarter?" -> ["income_statement"]
+            - "How much debt does the company have?" -> ["balance_sheet"]
+            - "What is the free cash flow?" -> ["cash_flow"]
+            - "What is the company's financial health?" -> ["income_statement", "balance_sheet", "cash_flow"]
+"""
+    DATA_AND_PERIOD_SYSTEM_PROMPT = (
+        _DATA_AND_PERIOD_INSTRUCTIONS
+        + """
+            ===== Output =====
+            Return your answer in this EXACT JSON format (no other text, no markdown fences):
+            {
+                "data_requirement": "none" | "basic" | "detailed" | "quarterly_summary" | "annual_summary",
+                "period_requirement": null | {
+                    "period_type": "annual" | "quarterly" | "both",
+                    "specific_years": [2023, 2024] | null,
+                    "specific_quarters": ["2024-Q1", "2024-Q2"] | ["latest"] | null,
+                    "num_periods": 1 | null
+                },
+                "relevant_statements": ["income_statement"] | ["balance_sheet", "cash_flow"] | ["income_statement", "balance_sheet", "cash_flow"] | null
+            }
+            Note: When data_requirement is not 'detailed', set relevant_statements to null.
+        """
+    )
+
+    # classify_all answers both halves with one round-trip: both instruction blocks, one JSON answer
+    COMBINED_SYSTEM_PROMPT = (
+        """
+        Classify the question in two steps and answer both in a single JSON object.
+
+        ===== Step 1: question_type =====
+"""
+        + _QUESTION_TYPE_INSTRUCTIONS
+        + """
+        ===== Step 2: data and period requirements =====
+"""
+        + _DATA_AND_PERIOD_INSTRUCTIONS
+        + f"""
+            ===== Output =====
+            Return your answer in this EXACT JSON format (no other text, no markdown fences):
+            {{
+                "question_type": "{QuestionType.GENERAL_FINANCE.value}" | "{QuestionType.COMPANY_SPECIFIC_FINANCE.value}" | "{QuestionType.COMPANY_GENERAL.value}",
+                "data_requirement": "none" | "basic" | "detailed" | "quarterly_summary" | "annual_summary",
+                "period_requirement": null | {{
+                    "period_type": "annual" | "quarterly" | "both",
+                    "specific_years": [2023, 2024] | null,
+                    "specific_quarters": ["2024-Q1", "2024-Q2"] | ["latest"] | null,
+                    "num_periods": 1 | null
+                }},
+                "relevant_statements": ["income_statement"] | ["balance_sheet", "cash_flow"] | ["income_statement", "balance_sheet", "cash_flow"] | null
+            }}
+            Note: When data_requirement is not 'detailed', set relevant_statements to null.
+        """
+    )
+
+    # Per-request user messages. Everything that doesn't depend on the request is frozen here so each
+    # call only does one str.format instead of rebuilding f-strings.
+    _QUESTION_TYPE_USER_TEMPLATE = """{current_date}
+
+        Question to classify: {question}
+        {context}"""
+
+    _DATA_AND_PERIOD_USER_TEMPLATE = """{current_date}
+
+            Company: {company}
+            Question: "{question}"
+{metrics_context}"""
+
+    _COMBINED_USER_TEMPLATE = """{current_date}
+
+            Company: {company}
+            Question: "{question}"
+            {context}
+{metrics_context}"""
+
+    _CONVERSATION_CONTEXT_TEMPLATE = (
+        "\n\nPrevious conversation context:\n{conversation}"
+        "\n\nIMPORTANT: If the current question is vague or ambiguous (e.g., 'Which are potential areas to reinvest?', 'What about that?', 'Tell me more'), treat it as a FOLLOW-UP to the previous conversation topic. Classify it based on the context of what was discussed before."
+    )
+
+    _NO_TICKER_CONTEXT = (
+        "Ticker context: none (empty/undefined)"
+        "\n\nNOTE: No valid ticker provided (ticker is empty/undefined). Do NOT force company-specific-finance classification. If the question is about general financial concepts or strategy, classify as general-finance even if it mentions 'reinvest' or similar terms."
+    )
+
+    _METRICS_CONTEXT_TEMPLATE = """
+            ===== Available DB Metrics =====
+            Our database contains ONLY these aggregate financial metrics for {company}:
+            {metrics}
+
+            IMPORTANT: The database does NOT contain segment breakdowns, geographic splits, product-line revenue, revenue by source/category, or any granular sub-categories. If the question asks for data that cannot be derived from the metrics listed above (e.g., "breakdown revenue sources", "revenue by segment", "how does the company make money in detail"), return data_requirement='none'.
+"""
+
+    # The question-type answer is a single label (~5 tokens); cap generation so a chatty model can't
+    # spend time on an explanation nobody reads
+    QUESTION_TYPE_MAX_OUTPUT_TOKENS = 16
+    QUESTION_TYPE_STOP_SEQUENCES = ["\n"]
+
+    # Labels come back in a second or two; a hung call is cut off (and retried once) well before the
+    # client's 120s default, and the callers' error paths fall back to sensible defaults
+    LLM_TIMEOUT_SECONDS = 8.0
+
+    # Structured output returns the bare label, so a dict lookup replaces substring scans
+    _DATA_REQUIREMENT_LABELS = {
+        "none": FinancialDataRequirement.NONE,
+        "basic": FinancialDataRequirement.BASIC,
+        "detailed": FinancialDataRequirement.DETAILED,
+        "quarterly_summary": FinancialDataRequirement.QUARTERLY_SUMMARY,
+        "annual_summary": FinancialDataRequirement.ANNUAL_SUMMARY,
+    }
+
+    # Provider-enforced JSON output; the parser still tolerates fences for providers that ignore it
+    DATA_AND_PERIOD_RESPONSE_FORMAT = json_schema_response_format(DataAndPeriodSchema)
+    COMBINED_RESPONSE_FORMAT = json_schema_response_format(CombinedClassificationSchema)
+
+    # Exact-match result cache (UI retries, suggested-question chips, re-renders)
+    CACHE_MAX_SIZE = 4096
+    CACHE_TTL_SECONDS = 3600
+
+    def __init__(
+        self,
+        agent: Optional[MultiAgent] = None,
+        semantic_cache: Optional[SemanticClassificationCache] = None,
+    ):
         """
         Initialize the classifier.
 
         Args:
             agent: AI agent for classification. Creates default if not provided.
+            semantic_cache: Optional embedding-similarity cache for question-type labels. Disabled if not provided.
         """
-        self.agent = agent or MultiAgent(model_name=ModelName.Gemini31FlashLite)
+        self.agent = agent or get_multi_agent(ModelName.Gemini31FlashLite)
+        self.semantic_cache = semantic_cache
         self.ticker_extractor = StockTickerExtractor()
+        self._cache: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Semantic lookups that outlive their LLM call, kept referenced until they store the label
+        self._pending_lookups: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _cache_key(method: str, ticker: str, question: str, *extra: Hashable) -> tuple:
+        """Build an exact-match cache key; question whitespace and case are normalized."""
+        return (method, (ticker or "").strip().lower(), " ".join(question.lower().split()), *extra)
+
+    def _cache_get(self, key: Optional[tuple]) -> Optional[Any]:
+        """Return a cached, unexpired result and mark it most recently used."""
+        if key is None:
+            return None
+        entry = self._cache.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.CACHE_TTL_SECONDS:
+            if entry is not None:
+                del self._cache[key]
+            self._cache_misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self._cache_hits += 1
+        return entry[1]
+
+    def _cache_set(self, key: Optional[tuple], value: Any) -> None:
+        """Store a successful result, evicting the least recently used entry when full."""
+        if key is None:
+            return
+        self._cache[key] = (time.monotonic(), value)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.CACHE_MAX_SIZE:
+            self._cache.popitem(last=False)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hit/miss counters and current size of the classification cache."""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._cache),
+            "max_size": self.CACHE_MAX_SIZE,
+        }
 
     def _detect_quarterly_report_keywords(self, question: str) -> bool:
         """
@@ -62,8 +358,7 @@ class QuestionClassifier:
         Returns:
             True if quarterly report keywords are detected
         """
-        question_lower = question.lower()
-        return any(keyword in question_lower for keyword in self.QUARTERLY_REPORT_KEYWORDS)
+        return "quarterly_report" in _fast_path_categories(question)
 
     def _detect_annual_report_keywords(self, question: str) -> bool:
         """
@@ -75,10 +370,108 @@ class QuestionClassifier:
         Returns:
             True if annual report keywords are detected
         """
-        question_lower = question.lower()
-        return any(keyword in question_lower for keyword in self.ANNUAL_REPORT_KEYWORDS)
+        return "annual_report" in _fast_path_categories(question)
+
+    def _detect_question_type_keywords(self, question: str) -> Optional[str]:
+        """
+        Fast keyword classification for unambiguous company questions.
+
+        Financial metrics win over general company facts, matching the LLM prompt rules.
+
+        Args:
+            question: The question to check
+
+        Returns:
+            QuestionType value, or None when the LLM should decide
+        """
+        categories = _fast_path_categories(question)
+        if "finance_metric" in categories:
+            return QuestionType.COMPANY_SPECIFIC_FINANCE.value
+        if "company_general" in categories:
+            return QuestionType.COMPANY_GENERAL.value
+        return None
+
+    @observe_if_enabled(name="classify_all")
+    @profiled("classify_all")
+    async def classify_all(
+        self,
+        question: str,
+        ticker: str,
+        conversation_messages: Optional[List[Dict[str, str]]] = None,
+        available_metrics: Optional[list[str]] = None,
+    ) -> QuestionClassification:
+        """
+        Classify question type and data/period requirements with at most one LLM round-trip.
 
-    @observe(name="classify_question_type")
+        Fast paths and caches are consulted first for each half. Only company-specific finance reads
+        the data/period half, so once the type resolves to anything else it is skipped. When both
+        still need the LLM they are answered by a single composite prompt, and the result seeds the
+        per-method caches so the public methods return it without another call. If the composite
+        answer can't be parsed, the halves fall back to their own prompts concurrently.
+        """
+        question_type_key = None if conversation_messages else self._cache_key("question_type", ticker, question)
+        data_key = self._cache_key("data_and_period", ticker, question, tuple(available_metrics or ()))
+
+        question_type_result = await self._question_type_without_llm(
+            question, ticker, conversation_messages, question_type_key
+        )
+        if question_type_result is not None and not _needs_financial_data(question_type_result[0]):
+            data_result = _NO_FINANCIAL_DATA
+        else:
+            data_result = self._data_and_period_without_llm(question, data_key)
+
+        if question_type_result is None and data_result is None:
+            # data_key ignores the conversation, but the combined prompt includes it, so a follow-up's answer
+            # must not be replayed for the same words asked without context
+            # A semantic hit only replaces the combined call when it also settles the data half
+            semantic_label, combined = await self._with_semantic_lookup(
+                self._classify_combined_llm(
+                    question,
+                    ticker,
+                    conversation_messages,
+                    available_metrics,
+                    question_type_key,
+                    None if conversation_messages else data_key,
+                ),
+                ticker,
+                question,
+                question_type_key,
+                label_of=lambda answer: answer[0][0] if answer else None,
+                use_hit=lambda label: not _needs_financial_data(label),
+            )
+            if semantic_label is not None:
+                question_type_result = (semantic_label, None)
+                self._cache_set(question_type_key, question_type_result)
+                data_result = _NO_FINANCIAL_DATA
+            elif combined is not None:
+                question_type_result, data_result = combined
+
+        if question_type_result is None and data_result is None:
+            # The type is still unknown, so the data half runs alongside it rather than after it
+            question_type_result, data_result = await asyncio.gather(
+                self._classify_question_type_llm(question, ticker, conversation_messages, question_type_key),
+                self._classify_data_and_period_llm(ticker, question, available_metrics, data_key),
+            )
+        elif question_type_result is None:
+            question_type_result = await self._classify_question_type_with_lookup(
+                question, ticker, conversation_messages, question_type_key
+            )
+        elif data_result is None:
+            # Reached only for company-specific finance; other types skipped the data half above
+            data_result = await self._classify_data_and_period_llm(ticker, question, available_metrics, data_key)
+
+        question_type, comparison_tickers = question_type_result
+        data_requirement, period_requirement, relevant_statements = data_result
+        return QuestionClassification(
+            question_type=question_type,
+            comparison_tickers=comparison_tickers,
+            data_requirement=data_requirement,
+            period_requirement=period_requirement,
+            relevant_statements=relevant_statements,
+        )
+
+    @observe_if_enabled(name="classify_question_type")
+    @profiled("classify_question_type")
     async def classify_question_type(
         self, question: str, ticker: str, conversation_messages: Optional[List[Dict[str, str]]] = None
     ) -> tuple[Optional[str], Optional[list[str]]]:
@@ -88,21 +481,169 @@ class QuestionClassifier:
         Returns:
             Tuple of (QuestionType value or None, comparison tickers list or None)
         """
-        t_start = time.perf_counter()
+        # Follow-ups depend on the conversation, so only context-free questions are cached
+        cache_key = None if conversation_messages else self._cache_key("question_type", ticker, question)
+        result = await self._question_type_without_llm(question, ticker, conversation_messages, cache_key)
+        if result is not None:
+            return result
+
+        return await self._classify_question_type_with_lookup(question, ticker, conversation_messages, cache_key)
+
+    async def _question_type_without_llm(
+        self,
+        question: str,
+        ticker: str,
+        conversation_messages: Optional[List[Dict[str, str]]],
+        cache_key: Optional[tuple],
+    ) -> Optional[tuple[Optional[str], Optional[list[str]]]]:
+        """
+        Resolve the question type from the cache, comparison detection or keywords.
+
+        Returns:
+            The (question type, comparison tickers) result, or None when the LLM is needed
+        """
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
 
         # Check for comparison intent FIRST (before LLM classification)
         try:
             comparison_tickers = await self.ticker_extractor.extract_tickers(question, current_ticker=ticker)
             if len(comparison_tickers) >= 2:
                 logger.info(f"Detected comparison with {len(comparison_tickers)} tickers: {comparison_tickers}")
-                t_end = time.perf_counter()
-                logger.info(f"Profiling classify_question_type (comparison fast path): {t_end - t_start:.4f}s")
-                return QuestionType.COMPANY_COMPARISON.value, comparison_tickers
+                result = (QuestionType.COMPANY_COMPARISON.value, comparison_tickers)
+                self._cache_set(cache_key, result)
+                return result
         except Exception as e:
             logger.error(f"Error in ticker extraction, continuing with normal classification: {e}")
 
-        # Normalize ticker: treat empty/undefined as no ticker
-        has_ticker = ticker and ticker.strip() and ticker.upper() not in ["UNDEFINED", "NULL", "NONE"]
+        # Fast path: unambiguous phrasings about a known company don't need the LLM. Follow-ups are
+        # excluded because their meaning depends on the conversation.
+        if self._has_ticker(ticker) and not conversation_messages:
+            keyword_label = self._detect_question_type_keywords(question)
+            if keyword_label is not None:
+                logger.info(f"Keyword pre-filter classified question as {keyword_label}: {question[:50]}...")
+                result = (keyword_label, None)
+                self._cache_set(cache_key, result)
+                return result
+
+        return None
+
+    async def _classify_question_type_with_lookup(
+        self,
+        question: str,
+        ticker: str,
+        conversation_messages: Optional[List[Dict[str, str]]],
+        cache_key: Optional[tuple],
+    ) -> tuple[Optional[str], Optional[list[str]]]:
+        """Ask the LLM for the question type, taking a semantic-cache hit instead if it arrives first."""
+        semantic_label, result = await self._with_semantic_lookup(
+            self._classify_question_type_llm(question, ticker, conversation_messages, cache_key),
+            ticker,
+            question,
+            cache_key,
+            label_of=lambda result: result[0],
+        )
+        if semantic_label is not None:
+            result = (semantic_label, None)
+            self._cache_set(cache_key, result)
+        return result
+
+    async def _with_semantic_lookup(
+        self,
+        llm_call: Awaitable[T],
+        ticker: str,
+        question: str,
+        cache_key: Optional[tuple],
+        label_of: Callable[[T], Optional[str]],
+        use_hit: Callable[[str], bool] = lambda label: True,
+    ) -> tuple[Optional[str], Optional[T]]:
+        """
+        Await an LLM classification with the semantic-cache lookup running alongside it.
+
+        The lookup embeds the question remotely, so it must not sit in series ahead of the LLM. Paraphrases
+        of a recently classified question almost always share its label: a hit that lands before the LLM
+        answers (and that use_hit accepts) cancels the call. Whatever label the LLM produces is stored
+        against the question's embedding once the lookup finishes.
+
+        Returns:
+            Tuple of (semantic label, None) on an early hit, otherwise (None, LLM result)
+        """
+        llm_task = asyncio.ensure_future(llm_call)
+        if self.semantic_cache is None or cache_key is None:
+            return None, await llm_task
+
+        lookup_task = asyncio.create_task(self.semantic_cache.lookup("question_type", ticker, question))
+        try:
+            await asyncio.wait((llm_task, lookup_task), return_when=asyncio.FIRST_COMPLETED)
+            if not llm_task.done():
+                semantic_label, _ = lookup_task.result()
+                if semantic_label is not None and use_hit(semantic_label):
+                    llm_task.cancel()
+                    return semantic_label, None
+            result = await llm_task
+        except BaseException:
+            llm_task.cancel()
+            lookup_task.cancel()
+            raise
+
+        label = label_of(result)
+        if label is None:
+            lookup_task.cancel()
+        elif lookup_task.done():
+            self._store_semantic_label(ticker, label, lookup_task)
+        else:
+            self._pending_lookups.add(lookup_task)
+            lookup_task.add_done_callback(self._pending_lookups.discard)
+            lookup_task.add_done_callback(functools.partial(self._store_semantic_label, ticker, label))
+        return None, result
+
+    def _store_semantic_label(self, ticker: str, label: str, lookup_task: asyncio.Task) -> None:
+        """Remember label for the question embedded by a finished semantic-cache lookup."""
+        if lookup_task.cancelled() or lookup_task.exception() is not None:
+            return
+        _, embedding = lookup_task.result()
+        self.semantic_cache.store("question_type", ticker, embedding, label)
+
+    async def _classify_question_type_llm(
+        self,
+        question: str,
+        ticker: str,
+        conversation_messages: Optional[List[Dict[str, str]]],
+        cache_key: Optional[tuple],
+    ) -> tuple[Optional[str], Optional[list[str]]]:
+        """Ask the LLM for the question type and cache the answer. Returns (None, None) on failure."""
+        prompt = self._QUESTION_TYPE_USER_TEMPLATE.format(
+            current_date=PromptComponents.current_date(),
+            question=question,
+            context=self._question_type_context(ticker, conversation_messages),
+        )
+
+        try:
+            response_text = await self.agent.agenerate_content(
+                prompt=prompt,
+                system_prompt=self.QUESTION_TYPE_SYSTEM_PROMPT,
+                max_output_tokens=self.QUESTION_TYPE_MAX_OUTPUT_TOKENS,
+                stop_sequences=self.QUESTION_TYPE_STOP_SEQUENCES,
+                timeout=self.LLM_TIMEOUT_SECONDS,
+            )
+            result = (self._parse_question_type(response_text), None)
+
+            self._cache_set(cache_key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error classifying question type: {e}")
+            return None, None
+
+    @staticmethod
+    def _has_ticker(ticker: str) -> bool:
+        """Treat empty/undefined tickers as no ticker."""
+        return bool(ticker and ticker.strip() and ticker.upper() not in _PLACEHOLDER_TICKERS)
+
+    def _question_type_context(self, ticker: str, conversation_messages: Optional[List[Dict[str, str]]]) -> str:
+        """Ticker line, no-ticker note and recent conversation for the question-type prompt."""
+        has_ticker = self._has_ticker(ticker)
 
         # Build conversation context if available
         conversation_context = ""
@@ -119,68 +660,27 @@ class QuestionClassifier:
                     conversation_lines.append(f"{role}: {truncated}")
 
             if conversation_lines:
-                conversation_context = "\n\nPrevious conversation context:\n" + "\n".join(conversation_lines)
-                conversation_context += "\n\nIMPORTANT: If the current question is vague or ambiguous (e.g., 'Which are potential areas to reinvest?', 'What about that?', 'Tell me more'), treat it as a FOLLOW-UP to the previous conversation topic. Classify it based on the context of what was discussed before."
+                conversation_context = self._CONVERSATION_CONTEXT_TEMPLATE.format(
+                    conversation="\n".join(conversation_lines)
+                )
 
-        ticker_context_note = ""
         if not has_ticker:
-            ticker_context_note = "\n\nNOTE: No valid ticker provided (ticker is empty/undefined). Do NOT force company-specific-finance classification. If the question is about general financial concepts or strategy, classify as general-finance even if it mentions 'reinvest' or similar terms."
-
-        prompt = f"""{PromptComponents.current_date()}
+            return self._NO_TICKER_CONTEXT + conversation_context
+        return f"Ticker context: {ticker}{conversation_context}"
 
-        Classify the following question into one of these three categories.
-        NOTE: The question may be in any language. Classify based on the meaning regardless of language.
-
-        1. '{QuestionType.GENERAL_FINANCE.value}' - for general financial concepts, market trends, strategy questions, or questions about individuals that don't require specific company financial statements
-        2. '{QuestionType.COMPANY_SPECIFIC_FINANCE.value}' - for questions that specifically require analyzing a company's financial statements, metrics, or performance (ONLY if a valid ticker is provided)
-        3. '{QuestionType.COMPANY_GENERAL.value}' - for general questions about a company that don't require financial analysis
-
-        Examples:
-        - 'What is the average P/E ratio for the tech industry?' -> {QuestionType.GENERAL_FINANCE.value}
-        - 'How does inflation affect stock markets?' -> {QuestionType.GENERAL_FINANCE.value}
-        - 'How does Bill Gates' charitable giving affect his net worth?' -> {QuestionType.GENERAL_FINANCE.value}
-        - 'Which are potential areas to reinvest?' (follow-up to cash flow discussion) -> {QuestionType.GENERAL_FINANCE.value}
-        - 'What is Apple's revenue for the last quarter?' -> {QuestionType.COMPANY_SPECIFIC_FINANCE.value}
-        - 'What was Microsoft's profit margin in 2023?' -> {QuestionType.COMPANY_SPECIFIC_FINANCE.value}
-        - 'How is the company profit margin trending in recent quarters?' -> {QuestionType.COMPANY_SPECIFIC_FINANCE.value}
-        - 'What are the company financial performance trends?' -> {QuestionType.COMPANY_SPECIFIC_FINANCE.value}
-        - 'How is revenue growing?' -> {QuestionType.COMPANY_SPECIFIC_FINANCE.value}
-        - 'What is Tesla's mission statement?' -> {QuestionType.COMPANY_GENERAL.value}
-        - 'Who is the CEO of Amazon?' -> {QuestionType.COMPANY_GENERAL.value}
-
-        Rules:
-        - If the question asks about ANY financial metrics, performance, trends, or requires analyzing financial data (revenue, profit, margins, earnings, cash flow, debt, assets, growth, quarterly/annual results, etc.), AND a valid ticker is provided, classify as {QuestionType.COMPANY_SPECIFIC_FINANCE.value}
-        - Financial keywords include: revenue, profit, margin, earnings, cash flow, debt, assets, liabilities, growth, performance, quarterly, annual, financial, ROE, ROI, EBITDA, operating income, net income, expenses
-        - If NO valid ticker is provided (empty/undefined), do NOT classify as {QuestionType.COMPANY_SPECIFIC_FINANCE.value} even if the question mentions financial terms
-        - If the question is vague/ambiguous and there's conversation context, classify based on the previous conversation topic
-        - If the question is about general market trends, concepts, strategy, or individuals, classify as {QuestionType.GENERAL_FINANCE.value}
-        - Only use {QuestionType.COMPANY_GENERAL.value} for non-financial company information like mission, CEO, products, history, location
-
-        Question to classify: {question}
-        Ticker context: {ticker if has_ticker else "none (empty/undefined)"}{ticker_context_note}{conversation_context}"""
-
-        try:
-            response_text = ""
-            for chunk in self.agent.generate_content(prompt=prompt):
-                response_text += chunk
-
-            if QuestionType.COMPANY_SPECIFIC_FINANCE.value in response_text:
-                return QuestionType.COMPANY_SPECIFIC_FINANCE.value, None
-            elif QuestionType.COMPANY_GENERAL.value in response_text:
-                return QuestionType.COMPANY_GENERAL.value, None
-            elif QuestionType.GENERAL_FINANCE.value in response_text:
-                return QuestionType.GENERAL_FINANCE.value, None
-            else:
-                raise ValueError(f"Unknown question type: {response_text}")
-
-        except Exception as e:
-            logger.error(f"Error classifying question type: {e}")
-            return None, None
-        finally:
-            t_end = time.perf_counter()
-            logger.info(f"Profiling classify_question_type: {t_end - t_start:.4f}s")
-
-    @observe(name="classify_data_and_period_requirement")
+    @staticmethod
+    def _parse_question_type(response_text: str) -> str:
+        """Map an LLM answer to a QuestionType value, raising ValueError when none matches."""
+        if QuestionType.COMPANY_SPECIFIC_FINANCE.value in response_text:
+            return QuestionType.COMPANY_SPECIFIC_FINANCE.value
+        if QuestionType.COMPANY_GENERAL.value in response_text:
+            return QuestionType.COMPANY_GENERAL.value
+        if QuestionType.GENERAL_FINANCE.value in response_text:
+            return QuestionType.GENERAL_FINANCE.value
+        raise ValueError(f"Unknown question type: {response_text}")
+
+    @observe_if_enabled(name="classify_data_and_period_requirement")
+    @profiled("classify_data_and_period_requirement")
     async def classify_data_and_period_requirement(
         self, ticker: str, question: str, available_metrics: Optional[list[str]] = None
     ) -> tuple[FinancialDataRequirement, Optional[FinancialPeriodRequirement], Optional[list[FinancialStatementType]]]:
@@ -192,194 +692,171 @@ class QuestionClassifier:
         when all are needed it matches FinancialStatementType.all_ordered(). For other requirements,
         relevant_statements is None.
         """
-        t_start = time.perf_counter()
-
+        cache_key = self._cache_key("data_and_period", ticker, question, tuple(available_metrics or ()))
+        result = self._data_and_period_without_llm(question, cache_key)
+        if result is not None:
+            return result
+
+        return await self._classify_data_and_period_llm(ticker, question, available_metrics, cache_key)
+
+    def _data_and_period_without_llm(
+        self, question: str, cache_key: tuple
+    ) -> Optional[
+        tuple[FinancialDataRequirement, Optional[FinancialPeriodRequirement], Optional[list[FinancialStatementType]]]
+    ]:
+        """Resolve data/period requirements from report keywords or the cache; None when the LLM is needed."""
         # Fast path: check for quarterly report keywords before calling LLM
         if self._detect_quarterly_report_keywords(question):
             logger.info(f"Keyword pre-filter detected quarterly report question: {question[:50]}...")
-            logger.info(
-                f"Profiling classify_data_and_period_requirement: {time.perf_counter() - t_start:.4f}s (fast path)"
-            )
             return FinancialDataRequirement.QUARTERLY_SUMMARY, None, None
 
         # Fast path: check for annual report keywords before calling LLM
         if self._detect_annual_report_keywords(question):
             logger.info(f"Keyword pre-filter detected annual report question: {question[:50]}...")
-            logger.info(
-                f"Profiling classify_data_and_period_requirement: {time.perf_counter() - t_start:.4f}s (fast path)"
-            )
             return FinancialDataRequirement.ANNUAL_SUMMARY, None, None
 
-        metrics_context = ""
-        if available_metrics:
-            metrics_context = f"""
-            ===== Available DB Metrics =====
-            Our database contains ONLY these aggregate financial metrics for {ticker.upper()}:
-            {', '.join(available_metrics)}
-
-            IMPORTANT: The database does NOT contain segment breakdowns, geographic splits, product-line revenue, revenue by source/category, or any granular sub-categories. If the question asks for data that cannot be derived from the metrics listed above (e.g., "breakdown revenue sources", "revenue by segment", "how does the company make money in detail"), return data_requirement='none'.
-"""
-
-        prompt = f"""{PromptComponents.current_date()}
-
-            Analyze this question about {ticker.upper()} and decide (a) what level of financial data is needed, (b) which financial periods are needed, and (c) which statement types are relevant.
-            NOTE: The question may be in any language. Classify based on the meaning regardless of language.
-
-            Question: "{question}"
-{metrics_context}
-            ===== Part A: data_requirement =====
-            Pick exactly one of:
-
-            1. 'none' - Question can be answered without any financial data, OR the question asks for granular data not available in our database (e.g., segment breakdowns, revenue by source, geographic splits)
-            2. 'basic' - Question needs only basic company metrics like market cap, P/E ratio, basic ratios (e.g., "What is {ticker.upper()}'s market cap?", "What's the P/E ratio?", "Is {ticker.upper()} profitable?")
-            3. 'detailed' - Question requires specific financial statement data like revenue, expenses, cash flow details that ARE available in our metrics (e.g., "What was {ticker.upper()}'s revenue last quarter?", "How much debt does {ticker.upper()} have?", "What's the operating margin trend?")
-            4. 'quarterly_summary' - Question requires a summary of recent quarterly financial results (e.g., "Summarize the latest quarterly earnings report", "What were the key financial highlights last quarter?")
-            5. 'annual_summary' - Question requires a summary of recent annual financial results (e.g., "Summarize the latest annual report", "What were the key highlights from the 10-K filing?")
-
-            data_requirement examples:
-            - "What does Apple do?" -> none
-            - "Who is Tesla's CEO?" -> none
-            - "What is Microsoft's market cap?" -> basic
-            - "Is Amazon profitable?" -> basic
-            - "What was Apple's revenue in Q3 2024?" -> detailed
-            - "What's Google's debt-to-equity ratio?" -> detailed
-            - "Summarize Apple's latest quarterly earnings report" -> quarterly_summary
-            - "What are the key highlights from Apple's 10-K filing?" -> annual_summary
+        return self._cache_get(cache_key)
 
-            ===== Part B: period_requirement =====
-            If data_requirement is 'none' or 'basic', set period_requirement to null.
-            Otherwise, fill period_requirement with:
-            1. period_type: "annual", "quarterly", or "both"
-            2. Specific periods: which years or quarters, or just recent periods
-
-            period_requirement examples:
-            - "What was Apple's revenue in 2023?" -> {{"period_type": "annual", "specific_years": [2023], "specific_quarters": null, "num_periods": null}}
-            - "What was Apple revenue in the most recent year?" -> {{"period_type": "annual", "specific_years": null, "specific_quarters": null, "num_periods": 1}}
-            - "How did Tesla perform in Q3 2024?" -> {{"period_type": "quarterly", "specific_years": null, "specific_quarters": ["2024-Q3"], "num_periods": null}}
-            - "Show me Microsoft's revenue trend over the last 3 years" -> {{"period_type": "annual", "specific_years": null, "specific_quarters": null, "num_periods": 3}}
-            - "Compare Amazon's Q1 and Q2 2024 results" -> {{"period_type": "quarterly", "specific_years": null, "specific_quarters": ["2024-Q1", "2024-Q2"], "num_periods": null}}
-            - "What's Google's 5-year revenue growth?" -> {{"period_type": "annual", "specific_years": null, "specific_quarters": null, "num_periods": 5}}
-            - "Analyze Meta's quarterly performance in 2024" -> {{"period_type": "quarterly", "specific_years": null, "specific_quarters": ["2024-Q1", "2024-Q2", "2024-Q3", "2024-Q4"], "num_periods": null}}
-            - "What were the latest quarterly results?" -> {{"period_type": "quarterly", "specific_years": null, "specific_quarters": ["latest"], "num_periods": 1}}
-            - "Show both annual and quarterly trends" -> {{"period_type": "both", "specific_years": null, "specific_quarters": null, "num_periods": 3}}
+    async def _classify_data_and_period_llm(
+        self, ticker: str, question: str, available_metrics: Optional[list[str]], cache_key: tuple
+    ) -> tuple[FinancialDataRequirement, Optional[FinancialPeriodRequirement], Optional[list[FinancialStatementType]]]:
+        """Ask the LLM for data/period requirements and cache the answer. Falls back to BASIC on failure."""
+        company = ticker.upper()
+        prompt = self._DATA_AND_PERIOD_USER_TEMPLATE.format(
+            current_date=PromptComponents.current_date(),
+            company=company,
+            question=question,
+            metrics_context=self._metrics_context(company, available_metrics),
+        )
 
-            Rules for period_requirement:
-            - If no specific year/quarter mentioned, use num_periods with a reasonable number (3-5)
-            - Quarters should be in format "YYYY-Q#" (e.g., "2024-Q1")
-            - Only fill specific_years OR specific_quarters OR num_periods, not multiple — EXCEPT when specific_quarters is ["latest"], where you must also set num_periods: 1
-            - Default to annual unless quarterly is explicitly mentioned OR the question uses temporal words (see date context at top) that mean the most recently completed quarter
-            - Temporal adjectives like "recently", "lately", "latest", "most recent", "current", "this quarter", "last quarter" WITHOUT a specific year/quarter → use {{"period_type": "quarterly", "specific_quarters": ["latest"], "num_periods": 1}}
+        try:
+            response_text = await self.agent.agenerate_content(
+                prompt=prompt,
+                system_prompt=self.DATA_AND_PERIOD_SYSTEM_PROMPT,
+                response_format=self.DATA_AND_PERIOD_RESPONSE_FORMAT,
+                timeout=self.LLM_TIMEOUT_SECONDS,
+            )
+            result = self._parse_data_and_period(self._parse_json_from_response(response_text))
+            self._cache_set(cache_key, result)
+            return result
 
-            ===== Part C: relevant_statements =====
-            If data_requirement is 'detailed', you MUST return a JSON array of which statement types are needed.
-            Pick from: "income_statement", "balance_sheet", "cash_flow".
-            Do NOT use null for this field when data_requirement is 'detailed'.
-            If the question is broad or needs a full financial picture, return ALL three types explicitly:
-            ["income_statement", "balance_sheet", "cash_flow"]
+        except Exception as e:
+            logger.error(f"Error classifying data + period requirement: {e}")
+            return FinancialDataRequirement.BASIC, None, None
 
-            Examples:
-            - "What was revenue last quarter?" -> ["income_statement"]
-            - "How much debt does the company have?" -> ["balance_sheet"]
-            - "What is the free cash flow?" -> ["cash_flow"]
-            - "What is the company's financial health?" -> ["income_statement", "balance_sheet", "cash_flow"]
+    @observe_if_enabled(name="classify_all (combined call)")
+    @profiled("classify_all (combined call)")
+    async def _classify_combined_llm(
+        self,
+        question: str,
+        ticker: str,
+        conversation_messages: Optional[List[Dict[str, str]]],
+        available_metrics: Optional[list[str]],
+        question_type_key: Optional[tuple],
+        data_key: Optional[tuple],
+    ) -> Optional[tuple]:
+        """
+        Answer both classifications with one composite prompt and seed the caches whose keys are given.
 
-            ===== Output =====
-            Return your answer in this EXACT JSON format (no other text, no markdown fences):
-            {{
-                "data_requirement": "none" | "basic" | "detailed" | "quarterly_summary" | "annual_summary",
-                "period_requirement": null | {{
-                    "period_type": "annual" | "quarterly" | "both",
-                    "specific_years": [2023, 2024] | null,
-                    "specific_quarters": ["2024-Q1", "2024-Q2"] | ["latest"] | null,
-                    "num_periods": 1 | null
-                }},
-                "relevant_statements": ["income_statement"] | ["balance_sheet", "cash_flow"] | ["income_statement", "balance_sheet", "cash_flow"] | null
-            }}
-            Note: When data_requirement is not 'detailed', set relevant_statements to null.
+        Returns:
+            Tuple of (question type result, data/period result), or None if the answer was unusable
         """
+        company = ticker.upper()
+        prompt = self._COMBINED_USER_TEMPLATE.format(
+            current_date=PromptComponents.current_date(),
+            company=company,
+            question=question,
+            context=self._question_type_context(ticker, conversation_messages),
+            metrics_context=self._metrics_context(company, available_metrics),
+        )
 
         try:
-            response_text = ""
-            for chunk in self.agent.generate_content(prompt=prompt):
-                response_text += chunk
-
+            response_text = await self.agent.agenerate_content(
+                prompt=prompt,
+                system_prompt=self.COMBINED_SYSTEM_PROMPT,
+                response_format=self.COMBINED_RESPONSE_FORMAT,
+                timeout=self.LLM_TIMEOUT_SECONDS,
+            )
             parsed = self._parse_json_from_response(response_text)
+            question_type_result = (self._parse_question_type(str(parsed.get("question_type", ""))), None)
+            data_result = self._parse_data_and_period(parsed)
+        except Exception as e:
+            logger.warning(f"Combined classification failed, falling back to separate calls: {e}")
+            return None
 
-            data_req_str = str(parsed.get("data_requirement", "")).lower().strip()
-            if "detailed" in data_req_str:
-                data_requirement = FinancialDataRequirement.DETAILED
-            elif "quarterly_summary" in data_req_str:
-                data_requirement = FinancialDataRequirement.QUARTERLY_SUMMARY
-            elif "annual_summary" in data_req_str:
-                data_requirement = FinancialDataRequirement.ANNUAL_SUMMARY
-            elif "basic" in data_req_str:
-                data_requirement = FinancialDataRequirement.BASIC
-            elif "none" in data_req_str:
-                data_requirement = FinancialDataRequirement.NONE
-            else:
-                logger.warning(f"Unknown data_requirement value '{data_req_str}', defaulting to BASIC")
-                data_requirement = FinancialDataRequirement.BASIC
-
-            period_requirement: Optional[FinancialPeriodRequirement] = None
-            if data_requirement in (
-                FinancialDataRequirement.DETAILED,
-                FinancialDataRequirement.QUARTERLY_SUMMARY,
-                FinancialDataRequirement.ANNUAL_SUMMARY,
-            ):
-                period_block = parsed.get("period_requirement")
-                if isinstance(period_block, dict):
-                    try:
-                        period_requirement = FinancialPeriodRequirement(
-                            period_type=period_block.get("period_type", "annual"),
-                            specific_years=period_block.get("specific_years"),
-                            specific_quarters=period_block.get("specific_quarters"),
-                            num_periods=period_block.get("num_periods"),
-                        )
-                    except Exception as inner:
-                        logger.warning(
-                            f"Failed to build FinancialPeriodRequirement from {period_block}: {inner}; using fallback"
-                        )
-                        period_requirement = self._fallback_period(data_requirement)
-                else:
+        self._cache_set(question_type_key, question_type_result)
+        self._cache_set(data_key, data_result)
+        return question_type_result, data_result
+
+    @staticmethod
+    def _metrics_context(company: str, available_metrics: Optional[list[str]]) -> str:
+        """Describe which DB metrics exist so granular asks map to data_requirement='none'."""
+        if not available_metrics:
+            return ""
+        return QuestionClassifier._METRICS_CONTEXT_TEMPLATE.format(
+            company=company, metrics=", ".join(available_metrics)
+        )
+
+    def _parse_data_and_period(
+        self, parsed: dict
+    ) -> tuple[FinancialDataRequirement, Optional[FinancialPeriodRequirement], Optional[list[FinancialStatementType]]]:
+        """Build (data_requirement, period_requirement, relevant_statements) from the parsed JSON answer."""
+        data_req_str = str(parsed.get("data_requirement", "")).lower().strip()
+        data_requirement = self._DATA_REQUIREMENT_LABELS.get(data_req_str)
+        if data_requirement is None:
+            logger.warning(f"Unknown data_requirement value '{data_req_str}', defaulting to BASIC")
+            data_requirement = FinancialDataRequirement.BASIC
+
+        period_requirement: Optional[FinancialPeriodRequirement] = None
+        if data_requirement in (
+            FinancialDataRequirement.DETAILED,
+            FinancialDataRequirement.QUARTERLY_SUMMARY,
+            FinancialDataRequirement.ANNUAL_SUMMARY,
+        ):
+            period_block = parsed.get("period_requirement")
+            if isinstance(period_block, dict):
+                try:
+                    period_requirement = FinancialPeriodRequirement(
+                        **PeriodRequirementSchema.model_validate(period_block).model_dump()
+                    )
+                except Exception as inner:
                     logger.warning(
-                        f"Missing/invalid period_requirement for data_requirement={data_requirement}; using fallback"
+                        f"Failed to build FinancialPeriodRequirement from {period_block}: {inner}; using fallback"
                     )
                     period_requirement = self._fallback_period(data_requirement)
-
-            # Parse relevant_statements (DETAILED only — always explicit list, never null)
-            relevant_statements: Optional[list[FinancialStatementType]] = None
-            if data_requirement == FinancialDataRequirement.DETAILED:
-                raw_stmts = parsed.get("relevant_statements")
-                all_members = set(FinancialStatementType)
-                if isinstance(raw_stmts, list) and raw_stmts:
-                    deduped: list[FinancialStatementType] = []
-                    for raw in raw_stmts:
-                        if not isinstance(raw, str):
-                            continue
-                        try:
-                            st = FinancialStatementType(raw)
-                        except ValueError:
-                            continue
-                        if st not in deduped:
-                            deduped.append(st)
-                    if not deduped:
-                        relevant_statements = list(FinancialStatementType.all_ordered())
-                    elif set(deduped) == all_members:
-                        relevant_statements = list(FinancialStatementType.all_ordered())
-                    else:
-                        relevant_statements = deduped
-                else:
+            else:
+                logger.warning(
+                    f"Missing/invalid period_requirement for data_requirement={data_requirement}; using fallback"
+                )
+                period_requirement = self._fallback_period(data_requirement)
+
+        # Parse relevant_statements (DETAILED only — always explicit list, never null)
+        relevant_statements: Optional[list[FinancialStatementType]] = None
+        if data_requirement == FinancialDataRequirement.DETAILED:
+            raw_stmts = parsed.get("relevant_statements")
+            all_members = set(FinancialStatementType)
+            if isinstance(raw_stmts, list) and raw_stmts:
+                deduped: list[FinancialStatementType] = []
+                for raw in raw_stmts:
+                    if not isinstance(raw, str):
+                        continue
+                    try:
+                        st = FinancialStatementType(raw)
+                    except ValueError:
+                        continue
+                    if st not in deduped:
+                        deduped.append(st)
+                if not deduped:
                     relevant_statements = list(FinancialStatementType.all_ordered())
-                logger.info(f"Relevant statements: {[s.value for s in relevant_statements]}")
-
-            return data_requirement, period_requirement, relevant_statements
+                elif set(deduped) == all_members:
+                    relevant_statements = list(FinancialStatementType.all_ordered())
+                else:
+                    relevant_statements = deduped
+            else:
+                relevant_statements = list(FinancialStatementType.all_ordered())
+            logger.info(f"Relevant statements: {[s.value for s in relevant_statements]}")
 
-        except Exception as e:
-            logger.error(f"Error classifying data + period requirement: {e}")
-            return FinancialDataRequirement.BASIC, None, None
-        finally:
-            t_end = time.perf_counter()
-            logger.info(f"Profiling classify_data_and_period_requirement: {t_end - t_start:.4f}s")
+        return data_requirement, period_requirement, relevant_statements
 
     @staticmethod
     def _fallback_period(data_requirement: FinancialDataRequirement) -> FinancialPeriodRequirement:
@@ -392,16 +869,45 @@ class QuestionClassifier:
 
     def _parse_json_from_response(self, response_text: str) -> dict:
         """Parse JSON from response, handling markdown code blocks."""
-        # Try markdown code block first
-        json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # Try raw JSON
-            json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
+        # Structured output returns the bare object, which the raw decode below reads directly. Only text
+        # that does not open with a brace (fenced or prose-wrapped) pays for the markdown scan, and no
+        # JSONDecodeError is raised and discarded on the way there.
+        if not response_text.lstrip().startswith("{"):
+            json_match = _MARKDOWN_JSON_RE.search(response_text)
             if json_match:
-                json_str = json_match.group(0)
-            else:
-                raise ValueError(f"No JSON found in response: {response_text}")
+                return json.loads(json_match.group(1))
+
+        # Try raw JSON: decode the first object from the first brace. Unlike a greedy DOTALL
+        # \{.*\} scan this is a single linear pass and tolerates trailing prose.
+        start = response_text.find("{")
+        if start == -1:
+            raise ValueError(f"No JSON found in response: {response_text}")
+        parsed, _ = _JSON_DECODER.raw_decode(response_text, start)
+        return parsed
+
+
+# Data/period result for question types whose handlers never read financial data
+_NO_FINANCIAL_DATA = (FinancialDataRequirement.NONE, None, None)
+
+
+def _needs_financial_data(question_type: Optional[str]) -> bool:
+    """Whether the handler for question_type uses the data/period classification."""
+    return question_type == QuestionType.COMPANY_SPECIFIC_FINANCE.value
+
+
+@functools.lru_cache(maxsize=1024)
+def _fast_path_categories(question: str) -> frozenset[str]:
+    """Names of the fast-path keyword categories present in question (memoized, so both classifiers share it)."""
+    return frozenset(
+        category for category, pattern in QuestionClassifier._FAST_PATH_PATTERNS.items() if pattern.search(question)
+    )
+
+
+def _is_report_summary_question(question: str) -> bool:
+    """Whether keywords alone resolve question to a filing summary (no LLM call, no fundamentals needed)."""
+    return bool(_fast_path_categories(question) & {"quarterly_report", "annual_report"})
+
 
-        return json.loads(json_str)
+def _is_likely_basic_question(question: str) -> bool:
+    """Whether keywords suggest a fundamentals-only question, so fetching fundamentals before classification pays off."""
+    return not _is_report_summary_question(question) and bool(QuestionClassifier._BASIC_METRIC_RE.search(question))
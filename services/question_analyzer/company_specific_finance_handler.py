@@ -1,6 +1,9 @@
 """Company-specific financial analysis handler."""
 
+import asyncio
+import hashlib
 import logging
+import random
 import time
 from datetime import datetime, timezone
 from typing import Any, AsyncGenerator, Dict, List, Optional
@@ -8,22 +11,76 @@ from typing import Any, AsyncGenerator, Dict, List, Optional
 from langfuse import get_client
 
 from agent.agent import Agent
-from agent.multi_agent import MultiAgent
+from agent.multi_agent import get_multi_agent
 from ai_models.model_name import ModelName
+from connectors import cache
 from connectors.company import CompanyConnector
 from core.financial_statement_type import FinancialStatementType
 from utils.conversation_format import format_conversation_context
 
-from .classifier import QuestionClassifier
+from .classifier import QuestionClassifier, _is_likely_basic_question
 from .context_builders import ContextBuilderInput, get_context_builder
 from .context_builders.components import PromptComponents
 from .data_optimizer import FinancialDataOptimizer
-from .handlers import BaseQuestionHandler, _collect_paragraph_sources, _process_source_tags
-from .types import AnalysisPhase, FinancialDataRequirement, thinking_status
+from .handlers import BaseQuestionHandler, _buffer_events, _collect_paragraph_sources, _process_source_tags
+from .types import AnalysisPhase, FinancialDataRequirement, QuestionClassification, thinking_status
 
 logger = logging.getLogger(__name__)
 langfuse = get_client()
 
+# The analysis focus, citation rules and visual instructions are constant, so they are joined once at import
+# and sent as the system prompt; the byte-identical prefix lets the provider reuse its prompt cache
+_ANALYSIS_PROMPT = PromptComponents.analysis_focus()
+_ANSWER_SYSTEM_PROMPT = "\n\n".join(
+    [_ANALYSIS_PROMPT, PromptComponents.source_instructions(), PromptComponents.visual_output_instructions()]
+)
+
+# Static instructions for answering from conversation history alone; sent as the system prompt so the
+# provider can reuse its cached prefix across requests
+_CONVERSATION_FALLBACK_SYSTEM_PROMPT = """IMPORTANT: Always respond in the same language as the CURRENT question, regardless of the language used in previous conversation history.
+Provide a helpful, general answer that builds on what we discussed before. If this is about financial strategy or concepts, explain it in general terms without requiring specific company financial data."""
+
+_CONVERSATION_FALLBACK_USER_TEMPLATE = """{current_date}
+
+Based on our previous conversation, answer this follow-up question:
+
+{conversation_context}
+
+Current question: {question}"""
+
+# Answers are fully determined by the combined prompt (which embeds the current date) and the model,
+# except when web search is on
+ANSWER_CACHE_TTL_SECONDS = 24 * 3600
+
+# OpenRouter keeps the stream alive with comments while the model works, so a read that stalls this long
+# means a hung upstream; the call is retried once instead of waiting out the client's 120s default
+ANSWER_STREAM_TIMEOUT_SECONDS = 30.0
+
+
+# Seeded with the system prompt so cached answers are dropped whenever the static instructions change
+_ANSWER_CACHE_HASH = hashlib.blake2b(_ANSWER_SYSTEM_PROMPT.encode(), digest_size=16)
+
+
+def _answer_cache_key(model_used: str, prompt: str) -> str:
+    digest = _ANSWER_CACHE_HASH.copy()
+    digest.update(f"{model_used}\n{prompt}".encode())
+    return f"csf_answer:{digest.hexdigest()}"
+
+
+# The financial context can run to tens of KB; traces carry a fingerprint and its size, and only a
+# small sample keeps the full text for debugging
+TRACE_FULL_CONTEXT_SAMPLE_RATE = 0.01
+
+
+def _financial_context_trace_fields(financial_context: str) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {
+        "financial_context_sha256": hashlib.sha256(financial_context.encode()).hexdigest()[:16],
+        "financial_context_chars": len(financial_context),
+    }
+    if random.random() < TRACE_FULL_CONTEXT_SAMPLE_RATE:
+        fields["financial_context"] = financial_context
+    return fields
+
 
 class CompanySpecificFinanceHandler(BaseQuestionHandler):
     """Handles company-specific financial analysis questions."""
@@ -58,6 +115,7 @@ class CompanySpecificFinanceHandler(BaseQuestionHandler):
         preferred_model: ModelName = ModelName.Auto,
         conversation_messages: Optional[List[Dict[str, str]]] = None,
         available_metrics: Optional[list[str]] = None,
+        data_classification: Optional[QuestionClassification] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Handle company-specific financial questions.
@@ -70,6 +128,8 @@ class CompanySpecificFinanceHandler(BaseQuestionHandler):
             deep_analysis: Whether to use detailed analysis prompt (default: False for shorter responses)
             preferred_model: Preferred model to use for answer generation
             conversation_messages: Optional list of previous conversation messages for context
+            available_metrics: Metrics available in the DB for this ticker (guides the data classifier)
+            data_classification: Pre-computed data/period classification (skips the classifier LLM call)
 
         Yields:
             Dictionary chunks with analysis results
@@ -90,288 +150,367 @@ class CompanySpecificFinanceHandler(BaseQuestionHandler):
                 total_steps=4,
             )
 
-            # Use conversation context to answer generally
-            company_name = ""
-            conversation_context = format_conversation_context(
-                conversation_messages, ticker or "the company", company_name
-            )
-            prompt = f"""{PromptComponents.current_date()}
-
-Based on our previous conversation, answer this follow-up question:
-
-{conversation_context}
-
-Current question: {question}
-
-IMPORTANT: Always respond in the same language as the CURRENT question above, regardless of the language used in previous conversation history.
-Provide a helpful, general answer that builds on what we discussed before. If this is about financial strategy or concepts, explain it in general terms without requiring specific company financial data."""
-
-            agent = MultiAgent(model_name=preferred_model)
-            model_used = agent.model_name
-
-            raw_chunks = agent.generate_content(prompt=prompt, use_google_search=use_google_search)
-            for event in _process_source_tags(raw_chunks):
-                yield event
-
-            yield {"type": "model_used", "body": model_used}
-
-            # Generate related questions
-            async for related_q in self._generate_related_questions(question, preferred_model):
-                yield related_q
-
-            logger.info(
-                f"Profiling CompanySpecificFinanceHandler total (fallback): {time.perf_counter() - t_start:.4f}s"
-            )
+            related_questions_task = self._prefetch_related_questions(question, preferred_model)
+            try:
+                async for event in self._stream_conversation_fallback(
+                    ticker,
+                    question,
+                    "",
+                    conversation_messages,
+                    preferred_model,
+                    use_google_search,
+                    related_questions_task,
+                    t_start,
+                ):
+                    yield event
+            finally:
+                related_questions_task.cancel()
             return
 
-        # Determine what financial data we need (and which periods) in a single LLM call
-        yield thinking_status(
-            f"Figuring out what {ticker.upper()} data you need...",
-            phase=AnalysisPhase.CLASSIFY,
-            step=3,
-            total_steps=6,
-        )
-
-        # Merged classifier: data_requirement + period_requirement in one LLM call
-        (
-            data_requirement,
-            period_requirement,
-            relevant_statements,
-        ) = await self.classifier.classify_data_and_period_requirement(
-            ticker, question, available_metrics=available_metrics
-        )
-        logger.info(f"Financial data requirement: {data_requirement}, period: {period_requirement}")
-
-        if period_requirement is not None:
+        # Display form of the ticker for status messages and logs
+        ticker_label = ticker.upper()
+        # Related questions only depend on the question, so generate them while the answer is being built
+        related_questions_task = self._prefetch_related_questions(question, preferred_model)
+        fundamentals_task = None
+        try:
+            # Determine what financial data we need (and which periods) in a single LLM call
             yield thinking_status(
-                f"Loading {ticker.upper()} {period_requirement.period_type} financial reports...",
-                phase=AnalysisPhase.DATA_FETCH,
-                step=4,
+                f"Figuring out what {ticker_label} data you need...",
+                phase=AnalysisPhase.CLASSIFY,
+                step=3,
                 total_steps=6,
             )
 
-        # Fetch financial data
-        (
-            company_fundamental,
-            annual_statements,
-            quarterly_statements,
-        ) = await self.data_optimizer.fetch_optimized_data(
-            ticker=ticker, data_requirement=data_requirement, period_requirement=period_requirement
-        )
-
-        # Filter statements to only relevant types
-        if relevant_statements and data_requirement == FinancialDataRequirement.DETAILED:
-            valid_types = set(FinancialStatementType)
-            drop_types = valid_types - set(relevant_statements)
-            if drop_types:
-                logger.info(
-                    f"Filtering statements: keeping {[s.value for s in relevant_statements]}, "
-                    f"dropping {[d.value for d in drop_types]}"
+            # Merged classifier: data_requirement + period_requirement in one LLM call
+            if data_classification is not None:
+                data_requirement = data_classification.data_requirement
+                period_requirement = data_classification.period_requirement
+                relevant_statements = data_classification.relevant_statements
+            else:
+                # Fundamentals don't depend on the period, so fetch them while the classifier runs. Only BASIC
+                # uses them, and cancelling the task doesn't stop the quota-limited upstream call, so speculate
+                # only when keywords make BASIC likely.
+                if _is_likely_basic_question(question):
+                    fundamentals_task = asyncio.create_task(self.data_optimizer.fetch_fundamentals(ticker))
+                (
+                    data_requirement,
+                    period_requirement,
+                    relevant_statements,
+                ) = await self.classifier.classify_data_and_period_requirement(
+                    ticker, question, available_metrics=available_metrics
+                )
+            logger.info("Financial data requirement: %s, period: %s", data_requirement, period_requirement)
+
+            if period_requirement is not None:
+                yield thinking_status(
+                    f"Loading {ticker_label} {period_requirement.period_type} financial reports...",
+                    phase=AnalysisPhase.DATA_FETCH,
+                    step=4,
+                    total_steps=6,
                 )
-                for stmt in annual_statements:
-                    for t in drop_types:
-                        stmt.pop(t, None)
-                for stmt in quarterly_statements:
-                    for t in drop_types:
-                        stmt.pop(t, None)
-
-        if data_requirement == FinancialDataRequirement.QUARTERLY_SUMMARY and len(quarterly_statements) == 1:
-            filing_url = quarterly_statements[0].get("filing_10q_url")
-            yield {
-                "type": "attachment_url",
-                "title": f"Quarterly 10Q report for the quarter ending on {quarterly_statements[0].get('period_end_quarter')}",
-                "body": filing_url,
-            }
-
-        if data_requirement == FinancialDataRequirement.ANNUAL_SUMMARY and len(annual_statements) == 1:
-            filing_url = annual_statements[0].get("filing_10k_url")
-            yield {
-                "type": "attachment_url",
-                "title": f"Annual 10K report for the year ending {annual_statements[0].get('period_end_year')}",
-                "body": filing_url,
-            }
-
-        # Fallback: If no data available and we have conversation context, answer generally
-        has_no_data = (
-            (not company_fundamental or not company_fundamental.get("Name"))
-            and len(annual_statements) == 0
-            and len(quarterly_statements) == 0
-        )
-        if has_no_data and conversation_messages and data_requirement != FinancialDataRequirement.NONE:
-            logger.info(
-                "⚠️  Fallback: No financial data available but conversation context exists. "
-                "Answering question generally based on conversation context."
-            )
-            yield thinking_status(
-                f"No {ticker.upper()} financials available — answering from conversation context",
-                phase=AnalysisPhase.ANALYZE,
-                step=5,
-                total_steps=6,
-            )
-
-            # Use conversation context to answer generally
-            company_name = company_fundamental.get("Name", "") if company_fundamental else ""
-            conversation_context = format_conversation_context(
-                conversation_messages, ticker or "the company", company_name
-            )
-            prompt = f"""{PromptComponents.current_date()}
-
-Based on our previous conversation, answer this follow-up question:
-
-{conversation_context}
-
-Current question: {question}
-
-IMPORTANT: Always respond in the same language as the CURRENT question above, regardless of the language used in previous conversation history.
-Provide a helpful, general answer that builds on what we discussed before. If this is about financial strategy or concepts, explain it in general terms without requiring specific company financial data."""
-
-            agent = MultiAgent(model_name=preferred_model)
-            model_used = agent.model_name
-
-            raw_chunks = agent.generate_content(prompt=prompt, use_google_search=use_google_search)
-            for event in _process_source_tags(raw_chunks):
-                yield event
-
-            yield {"type": "model_used", "body": model_used}
-
-            # Generate related questions
-            async for related_q in self._generate_related_questions(question, preferred_model):
-                yield related_q
-
-            logger.info(
-                f"Profiling CompanySpecificFinanceHandler total (fallback): {time.perf_counter() - t_start:.4f}s"
-            )
-            return
-
-        yield thinking_status(
-            f"Analyzing {ticker.upper()} financials...",
-            phase=AnalysisPhase.ANALYZE,
-            step=5,
-            total_steps=6,
-        )
 
-        try:
-            # Build financial context
-            financial_context = self._build_financial_context(
-                ticker=ticker,
-                question=question,
-                data_requirement=data_requirement,
-                company_fundamental=company_fundamental,
-                annual_statements=annual_statements,
-                quarterly_statements=quarterly_statements,
-                deep_analysis=deep_analysis,
-                use_google_search=use_google_search,
+            # Fetch financial data
+            if fundamentals_task is None:
+                (
+                    company_fundamental,
+                    annual_statements,
+                    quarterly_statements,
+                ) = await self.data_optimizer.fetch_optimized_data(
+                    ticker=ticker, data_requirement=data_requirement, period_requirement=period_requirement
+                )
+            else:
+                annual_statements, quarterly_statements = await self.data_optimizer.fetch_statements(
+                    ticker, data_requirement, period_requirement
+                )
+                if data_requirement == FinancialDataRequirement.BASIC:
+                    company_fundamental = await fundamentals_task
+                else:
+                    fundamentals_task.cancel()
+                    company_fundamental = None
+
+            # Filter statements to only relevant types
+            if relevant_statements and data_requirement == FinancialDataRequirement.DETAILED:
+                valid_types = set(FinancialStatementType)
+                drop_types = valid_types - set(relevant_statements)
+                if drop_types:
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "Filtering statements: keeping %s, dropping %s",
+                            [s.value for s in relevant_statements],
+                            [d.value for d in drop_types],
+                        )
+                    for stmt in annual_statements:
+                        for t in drop_types:
+                            stmt.pop(t, None)
+                    for stmt in quarterly_statements:
+                        for t in drop_types:
+                            stmt.pop(t, None)
+
+            if data_requirement == FinancialDataRequirement.QUARTERLY_SUMMARY and len(quarterly_statements) == 1:
+                filing_url = quarterly_statements[0].get("filing_10q_url")
+                yield {
+                    "type": "attachment_url",
+                    "title": f"Quarterly 10Q report for the quarter ending on {quarterly_statements[0].get('period_end_quarter')}",
+                    "body": filing_url,
+                }
+
+            if data_requirement == FinancialDataRequirement.ANNUAL_SUMMARY and len(annual_statements) == 1:
+                filing_url = annual_statements[0].get("filing_10k_url")
+                yield {
+                    "type": "attachment_url",
+                    "title": f"Annual 10K report for the year ending {annual_statements[0].get('period_end_year')}",
+                    "body": filing_url,
+                }
+
+            # Fallback: If no data available and we have conversation context, answer generally
+            has_no_data = (
+                (not company_fundamental or not company_fundamental.get("Name"))
+                and len(annual_statements) == 0
+                and len(quarterly_statements) == 0
             )
-
-            analysis_prompt = PromptComponents.analysis_focus()
-            source_prompt = PromptComponents.source_instructions()
-
-            # Format conversation context if available
-            conversation_context = ""
-            if conversation_messages:
-                company_name = ""
-                if company_fundamental:
-                    company_name = company_fundamental.get("Name", "")
-                num_pairs = len(conversation_messages) // 2
-                conversation_context = format_conversation_context(conversation_messages, ticker, company_name)
-                conversation_context = f"\n\n{conversation_context}\n"
+            if has_no_data and conversation_messages and data_requirement != FinancialDataRequirement.NONE:
                 logger.info(
-                    f"💬 Injected {num_pairs} Q/A pair(s) of conversation context into CompanySpecificFinanceHandler prompt "
-                    f"(ticker: {ticker.upper()}, company: {company_name or ticker.upper()})"
+                    "⚠️  Fallback: No financial data available but conversation context exists. "
+                    "Answering question generally based on conversation context."
                 )
-            else:
-                logger.debug(
-                    f"💬 No conversation context to inject (CompanySpecificFinanceHandler, ticker: {ticker.upper()})"
+                yield thinking_status(
+                    f"No {ticker_label} financials available — answering from conversation context",
+                    phase=AnalysisPhase.ANALYZE,
+                    step=5,
+                    total_steps=6,
                 )
 
-            t_model = time.perf_counter()
-            agent = MultiAgent(model_name=preferred_model)
-            model_used = agent.model_name
-
-            # Combine prompts for OpenRouter (which expects a single string)
-            visual_prompt = PromptComponents.visual_output_instructions()
-            combined_prompt = (
-                f"{financial_context}{conversation_context}\n\n{analysis_prompt}\n\n{source_prompt}\n\n{visual_prompt}"
-            )
+                company_name = company_fundamental.get("Name", "") if company_fundamental else ""
+                async for event in self._stream_conversation_fallback(
+                    ticker,
+                    question,
+                    company_name,
+                    conversation_messages,
+                    preferred_model,
+                    use_google_search,
+                    related_questions_task,
+                    t_start,
+                ):
+                    yield event
+                return
 
-            # Enable Google Search for quarterly and annual summary questions to read filing URLs
-            search_enabled = use_google_search or (
-                data_requirement
-                in [FinancialDataRequirement.QUARTERLY_SUMMARY, FinancialDataRequirement.ANNUAL_SUMMARY]
+            yield thinking_status(
+                f"Analyzing {ticker_label} financials...",
+                phase=AnalysisPhase.ANALYZE,
+                step=5,
+                total_steps=6,
             )
 
-            with langfuse.start_as_current_observation(
-                as_type="generation", name="company-specific-finance-llm-call", model=model_used
-            ) as gen:
-                gen.update(
-                    input={
-                        "financial_context": financial_context,
-                        "analysis_prompt": analysis_prompt,
-                        "ticker": ticker,
-                        "use_google_search": search_enabled,
-                        "model": model_used,
-                    }
+            try:
+                # Build financial context
+                financial_context = self._build_financial_context(
+                    ticker=ticker,
+                    question=question,
+                    data_requirement=data_requirement,
+                    company_fundamental=company_fundamental,
+                    annual_statements=annual_statements,
+                    quarterly_statements=quarterly_statements,
+                    deep_analysis=deep_analysis,
+                    use_google_search=use_google_search,
                 )
 
-                first_chunk_received = False
-                completion_start_time = None
-                output_tokens = 0
-                full_output = []
+                # Format conversation context if available
+                conversation_context = ""
+                if conversation_messages:
+                    company_name = ""
+                    if company_fundamental:
+                        company_name = company_fundamental.get("Name", "")
+                    num_pairs = len(conversation_messages) // 2
+                    conversation_context = format_conversation_context(conversation_messages, ticker, company_name)
+                    conversation_context = f"\n\n{conversation_context}\n"
+                    logger.info(
+                        "💬 Injected %d Q/A pair(s) of conversation context into CompanySpecificFinanceHandler prompt "
+                        "(ticker: %s, company: %s)",
+                        num_pairs,
+                        ticker_label,
+                        company_name or ticker_label,
+                    )
+                else:
+                    logger.debug(
+                        "💬 No conversation context to inject (CompanySpecificFinanceHandler, ticker: %s)",
+                        ticker_label,
+                    )
+
+                t_model = time.perf_counter()
+                agent = get_multi_agent(preferred_model)
+                model_used = agent.model_name
+
+                # Only the per-request context goes in the user message; the static instructions ride in the
+                # system prompt
+                user_prompt = f"{financial_context}{conversation_context}"
+
+                # Enable Google Search for quarterly and annual summary questions to read filing URLs
+                search_enabled = use_google_search or (
+                    data_requirement
+                    in [FinancialDataRequirement.QUARTERLY_SUMMARY, FinancialDataRequirement.ANNUAL_SUMMARY]
+                )
 
-                # Build filing URL lookup once for enrichment
+                answer_cache_key = None if search_enabled else _answer_cache_key(model_used, user_prompt)
+                # Redis calls are blocking network round-trips, so they run off the event loop
+                cached_answer = await asyncio.to_thread(cache.get_json, answer_cache_key) if answer_cache_key else None
+                if cached_answer and cached_answer.get("events"):
+                    logger.info("Answer cache hit for %s", ticker_label)
+                    for event in cached_answer["events"]:
+                        yield event
+                        # Let the response flush between events so the cached answer still streams
+                        await asyncio.sleep(0)
+
+                    yield {"type": "model_used", "body": model_used}
+                    for related_q in await related_questions_task:
+                        yield related_q
+                    logger.info(
+                        "Profiling CompanySpecificFinanceHandler total (answer cache hit): %.4fs",
+                        time.perf_counter() - t_start,
+                    )
+                    return
+
+                # Filing URL lookup for source enrichment, shared across requests for the same statements
                 filing_lookup = PromptComponents.build_filing_url_lookup(
                     ticker, annual_statements, quarterly_statements
                 )
 
-                raw_chunks = agent.generate_content(prompt=combined_prompt, use_google_search=search_enabled)
-                for event in _collect_paragraph_sources(_process_source_tags(raw_chunks, filing_lookup=filing_lookup)):
-                    if event["type"] == "answer":
-                        text_chunk = event["body"]
-                        if not first_chunk_received:
+                streamed_events = []
+                # Input goes in at creation and everything else in one update after the stream, so the
+                # streaming loop itself never touches the span
+                with langfuse.start_as_current_observation(
+                    as_type="generation",
+                    name="company-specific-finance-llm-call",
+                    model=model_used,
+                    input={
+                        **_financial_context_trace_fields(financial_context),
+                        "analysis_prompt": _ANALYSIS_PROMPT,
+                        "ticker": ticker,
+                        "use_google_search": search_enabled,
+                        "model": model_used,
+                    },
+                ) as gen:
+                    first_chunk_received = False
+                    completion_start_time = None
+                    full_output = []
+
+                    # The model client streams synchronously; pull chunks on a worker thread so the event loop
+                    # keeps serving other requests while the answer streams
+                    raw_chunks = agent.generate_content(
+                        prompt=user_prompt,
+                        use_google_search=search_enabled,
+                        system_prompt=_ANSWER_SYSTEM_PROMPT,
+                        timeout=ANSWER_STREAM_TIMEOUT_SECONDS,
+                    )
+                    answer_events = _collect_paragraph_sources(
+                        _process_source_tags(raw_chunks, filing_lookup=filing_lookup)
+                    )
+                    events = _buffer_events(answer_events)
+
+                    # Time the first answer chunk here so the main loop below carries no first-chunk check
+                    async for event in events:
+                        if event["type"] == "answer":
                             completion_start_time = datetime.now(timezone.utc)
-                            t_first_chunk = time.perf_counter()
-                            ttft = t_first_chunk - t_model
-                            logger.info(f"Profiling CompanySpecificFinanceHandler time_to_first_token: {ttft:.4f}s")
-                            gen.update(completion_start_time=completion_start_time)
+                            ttft = time.perf_counter() - t_model
+                            logger.info("Profiling CompanySpecificFinanceHandler time_to_first_token: %.4fs", ttft)
                             first_chunk_received = True
+                            full_output.append(event["body"])
+                        streamed_events.append(event)
+                        yield event
+                        if first_chunk_received:
+                            break
+
+                    async for event in events:
+                        if event["type"] == "answer":
+                            full_output.append(event["body"])
+                        streamed_events.append(event)
+                        yield event
+
+                    if not first_chunk_received:
+                        yield {"type": "answer", "body": "❌ No analysis generated from the model"}
+
+                    # Update generation with output and usage (word count over the joined text, once)
+                    output_text = "".join(full_output)
+                    gen.update(
+                        output=output_text,
+                        completion_start_time=completion_start_time,
+                        usage_details={"output_tokens": len(output_text.split())},
+                        metadata={
+                            "ticker": ticker,
+                            "data_requirement": data_requirement,
+                            "use_google_search": search_enabled,
+                            "use_url_context": use_url_context,
+                            "model": model_used,
+                        },
+                    )
+
+                t_model_end = time.perf_counter()
+                logger.info(
+                    "Profiling CompanySpecificFinanceHandler model_generate_content: %.4fs", t_model_end - t_model
+                )
 
-                        full_output.append(text_chunk)
-                        output_tokens += len(text_chunk.split())
-
-                    yield event
+                if answer_cache_key and first_chunk_received:
+                    await asyncio.to_thread(
+                        cache.set_json, answer_cache_key, {"events": streamed_events}, ANSWER_CACHE_TTL_SECONDS
+                    )
 
-                if not first_chunk_received:
-                    yield {"type": "answer", "body": "❌ No analysis generated from the model"}
+                # Yield the model used for answer
+                yield {"type": "model_used", "body": model_used}
 
-                # Update generation with output and usage
-                gen.update(
-                    output="".join(full_output),
-                    usage_details={"output_tokens": output_tokens},
-                    metadata={
-                        "ticker": ticker,
-                        "data_requirement": data_requirement,
-                        "use_google_search": search_enabled,
-                        "use_url_context": use_url_context,
-                        "model": model_used,
-                    },
+                t_related = time.perf_counter()
+                for related_q in await related_questions_task:
+                    yield related_q
+                t_related_end = time.perf_counter()
+                logger.info(
+                    "Profiling CompanySpecificFinanceHandler related_questions: %.4fs", t_related_end - t_related
                 )
+                logger.info("Profiling CompanySpecificFinanceHandler total: %.4fs", t_related_end - t_start)
+
+            except Exception as e:
+                logger.error("Error during analysis: %s", e)
+                yield {"type": "answer", "body": "Error during analysis. Please try again later."}
+        finally:
+            # A client disconnect closes (or cancels) this generator mid-stream; drop background work nothing
+            # will read any more
+            related_questions_task.cancel()
+            if fundamentals_task is not None:
+                fundamentals_task.cancel()
+
+    async def _stream_conversation_fallback(
+        self,
+        ticker: str,
+        question: str,
+        company_name: str,
+        conversation_messages: List[Dict[str, str]],
+        preferred_model: ModelName,
+        use_google_search: bool,
+        related_questions_task: "asyncio.Task[List[Dict[str, str]]]",
+        t_start: float,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Answer from the conversation alone when there is no financial data, then close out the stream."""
+        prompt = _CONVERSATION_FALLBACK_USER_TEMPLATE.format(
+            current_date=PromptComponents.current_date(),
+            conversation_context=format_conversation_context(
+                conversation_messages, ticker or "the company", company_name
+            ),
+            question=question,
+        )
 
-            t_model_end = time.perf_counter()
-            logger.info(f"Profiling CompanySpecificFinanceHandler model_generate_content: {t_model_end - t_model:.4f}s")
+        agent = get_multi_agent(preferred_model)
+        raw_chunks = agent.generate_content(
+            prompt=prompt,
+            use_google_search=use_google_search,
+            system_prompt=_CONVERSATION_FALLBACK_SYSTEM_PROMPT,
+            timeout=ANSWER_STREAM_TIMEOUT_SECONDS,
+        )
+        async for event in _buffer_events(_process_source_tags(raw_chunks)):
+            yield event
 
-            # Yield the model used for answer
-            yield {"type": "model_used", "body": model_used}
+        yield {"type": "model_used", "body": agent.model_name}
 
-            t_related = time.perf_counter()
-            async for related_q in self._generate_related_questions(question, preferred_model):
-                yield related_q
-            t_related_end = time.perf_counter()
-            logger.info(f"Profiling CompanySpecificFinanceHandler related_questions: {t_related_end - t_related:.4f}s")
-            logger.info(f"Profiling CompanySpecificFinanceHandler total: {t_related_end - t_start:.4f}s")
+        for related_q in await related_questions_task:
+            yield related_q
 
-        except Exception as e:
-            logger.error(f"Error during analysis: {e}")
-            yield {"type": "answer", "body": "Error during analysis. Please try again later."}
+        logger.info("Profiling CompanySpecificFinanceHandler total (fallback): %.4fs", time.perf_counter() - t_start)
 
     def _build_financial_context(
         self,
@@ -385,8 +524,7 @@ Provide a helpful, general answer that builds on what we discussed before. If th
         use_google_search: bool = False,
     ) -> str:
         logger.info(
-            "Building financial context for analysis",
-            {"ticker": ticker, "data_requirement": data_requirement},
+            "Building financial context for analysis (ticker: %s, data requirement: %s)", ticker, data_requirement
         )
 
         builder = get_context_builder(data_requirement)
@@ -19,7 +19,7 @@ from .context_builders.comparison_builder import (
     ComparisonCompanyBuilderInput,
 )
 from .context_builders.components import PromptComponents
-from .handlers import _collect_paragraph_sources, _process_source_tags
+from .handlers import _buffer_events, _collect_paragraph_sources, _process_source_tags
 from .types import AnalysisPhase, thinking_status
 
 logger = logging.getLogger(__name__)
@@ -129,7 +129,7 @@ class CompanyComparisonHandler:
                 full_output = []
 
                 raw_chunks = agent.generate_content(prompt=prompt, use_google_search=use_google_search)
-                for event in _collect_paragraph_sources(_process_source_tags(raw_chunks)):
+                async for event in _buffer_events(_collect_paragraph_sources(_process_source_tags(raw_chunks))):
                     if not first_chunk_received:
                         gen.update(completion_start_time=datetime.now(timezone.utc))
                         first_chunk_received = True
@@ -27,7 +27,7 @@ from services.question_analyzer.context_builders.components import PromptCompone
 from services.question_analyzer.handlers_v2 import (
     _build_prompt_debug_event,
     _build_sources_block,
-    _collect_answer_chunks,
+    _stream_text_chunks,
     _trusted_publisher_status,
 )
 from services.search_decision_engine import SearchDecision
@@ -67,13 +67,15 @@ Based on this comparison question: "{original_question}"
 Generate {2 if short_analysis else 3} follow-up comparison questions, one per line.
         """.strip()
         agent = MultiAgent(model_name=preferred_model)
-        for q in agent.generate_content_by_lines(
-            prompt=prompt,
-            use_google_search=False,
-            max_lines=2 if short_analysis else 3,
-            min_line_length=10,
-            strip_numbering=True,
-            strip_markdown=True,
+        async for q in _stream_text_chunks(
+            agent.generate_content_by_lines(
+                prompt=prompt,
+                use_google_search=False,
+                max_lines=2 if short_analysis else 3,
+                min_line_length=10,
+                strip_numbering=True,
+                strip_markdown=True,
+            )
         ):
             yield {"type": "related_question", "body": q}
 
@@ -254,7 +256,7 @@ Generate {2 if short_analysis else 3} follow-up comparison questions, one per li
             )
 
         agent = MultiAgent(model_name=preferred_model)
-        for chunk in _collect_answer_chunks(agent.generate_content(prompt=prompt, use_google_search=False)):
+        async for chunk in _stream_text_chunks(agent.generate_content(prompt=prompt, use_google_search=False)):
             yield {"type": "answer", "body": chunk}
 
         if flat_sources or use_google_search:
@@ -20,13 +20,18 @@ CONTEXT_BUILDERS: Dict[FinancialDataRequirement, Type[ContextBuilder]] = {
     FinancialDataRequirement.URL_CONTEXT: UrlContextBuilder,
 }
 
+# Builders are stateless, so each is instantiated once and shared across requests
+_BUILDER_INSTANCES: Dict[FinancialDataRequirement, ContextBuilder] = {
+    requirement: builder_class() for requirement, builder_class in CONTEXT_BUILDERS.items()
+}
+
 
 def get_context_builder(requirement: FinancialDataRequirement) -> ContextBuilder:
     """Get the appropriate context builder for a data requirement level."""
-    builder_class = CONTEXT_BUILDERS.get(requirement)
-    if not builder_class:
+    builder = _BUILDER_INSTANCES.get(requirement)
+    if not builder:
         raise ValueError(f"No builder for requirement: {requirement}")
-    return builder_class()
+    return builder
 
 
 __all__ = [
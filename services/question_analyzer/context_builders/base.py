@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ContextBuilderInput:
     """Input data for building financial context prompts."""
 
@@ -1,5 +1,7 @@
 """Context builder for BASIC financial data requirement."""
 
+from services.shared.json_utils import compact_json
+
 from .base import ContextBuilder, ContextBuilderInput
 from .components import PromptComponents
 
@@ -10,6 +12,8 @@ class BasicContextBuilder(ContextBuilder):
     def build(self, input: ContextBuilderInput) -> str:
         """Build context using fundamental company data."""
         base_context = PromptComponents.base_context(input.ticker, input.question)
+        # Compact JSON rather than the dict's repr: fewer prompt tokens and a format models read reliably
+        fundamental_data = compact_json(input.company_fundamental or {})
 
         return f"""
             {base_context}
@@ -17,7 +21,7 @@ class BasicContextBuilder(ContextBuilder):
             {PromptComponents.grounding_rules()}
 
             Company Fundamental Data:
-            {input.company_fundamental}
+            {fundamental_data}
 
             This question requires basic financial metrics. Use the fundamental data provided to answer the question.
             Focus on key metrics like market cap, P/E ratio, basic profitability, and market performance.
@@ -1,73 +1,69 @@
 """Shared prompt components for context builders."""
 
+import functools
 import logging
 import re
+import textwrap
 from datetime import date
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
 
 from core.financial_statement_type import FinancialStatementType
 from services.shared.prompt_utils import visual_output_instructions
 
 logger = logging.getLogger(__name__)
 
-
-class PromptComponents:
-    """Reusable prompt fragments for financial context building."""
-
-    @staticmethod
-    def current_date() -> str:
-        """Return current date context for prompt grounding."""
-        today = date.today()
-        formatted = today.strftime("%B %d, %Y")
-        current_year = today.year
-        prior_year = current_year - 1
-        current_quarter_num = (today.month - 1) // 3 + 1
-        if current_quarter_num == 1:
-            last_completed_quarter = f"{prior_year}-Q4"
-        else:
-            last_completed_quarter = f"{current_year}-Q{current_quarter_num - 1}"
-        return (
-            f"Today is {formatted}; the most recently completed reporting quarter is {last_completed_quarter}. "
-            f'Treat "latest"/"recent"/"this quarter" as {last_completed_quarter} (or newer) and "this year"/"YTD" as {current_year}.'
-        )
-
-    @staticmethod
-    def grounding_rules() -> str:
-        """Unified grounding rules. Inject once near the top of any v2 prompt that supplies data blocks."""
-        return (
-            "**Grounding rules (read first):**\n"
-            "- The data blocks below — Sources, Company Fundamental Data, Annual/Quarterly Financial Statements — are the authoritative dataset for this answer. Prefer them over your training knowledge whenever they conflict; the provided data wins.\n"
-            '- Do not introduce facts (numbers, dates, names, events) not present in the data blocks. If the question (or part of it) cannot be answered from the data, say so explicitly (e.g. "this metric is not available in the data I have access to") and do not backfill from memory.\n'
-            "- Treat the data as current even if it post-dates your training cutoff; do not refuse on cutoff grounds.\n"
-            '- Do not write source attributions inline in the answer in ANY form. Forbidden: [SOURCES_JSON] blocks, bracketed markers like [1] or [2], parentheticals like "(Source: …)" / "(per Reuters)", and lead-ins like "according to …" or "as reported by …". The UI renders sources in a separate footer; your prose must contain only the analysis itself.'
-        )
-
-    @staticmethod
-    def no_data_decline() -> str:
-        """Used when no sources AND no DB data are available — instruct the model to decline rather than freelance from training."""
-        return (
-            "**No current data available.** No web sources or financial data were retrieved for this question. "
-            "Do not answer from training knowledge. Reply briefly that you do not have current data to answer reliably, "
-            "and suggest the user retry or rephrase."
-        )
-
-    @staticmethod
-    def base_context(ticker: str, question: str) -> str:
-        """Build the base context that's common to all prompts."""
-        date_context = PromptComponents.current_date()
-        return f"""
-            You are a seasoned financial analyst. {date_context}
-            Your task is to provide an insightful, non-repetitive analysis for the following question.
-            IMPORTANT: You MUST respond in the same language as the CURRENT question below, regardless of the language used in previous conversation history.
-
-            Question: {question}
-            Company: {ticker.upper()}
-        """
-
-    @staticmethod
-    def source_instructions() -> str:
-        """Build detailed source citation instructions."""
-        return """
+# Model output is scanned with RE2 (google-re2 in requirements.txt) so it always matches in linear time; stdlib re
+# is only a fallback for dev setups without the wheel
+try:
+    import re2 as _response_re
+except ImportError:
+    _response_re = re
+
+_SOURCES_BLOCK_RE = _response_re.compile(r"\[Sources?:\s*(.+?)\]")
+# A markdown link [Name](url) or a run of plain text up to the next comma
+_SOURCE_TOKEN_RE = _response_re.compile(r"\[(?P<name>[^\]]+)\]\((?P<url>[^)]+)\)|(?P<plain>[^,\[\]]+)")
+
+_RELATED_QUESTIONS_TEMPLATE = """{current_date}
+
+Based on this original question: "{original_question}"
+
+Generate exactly 3 high-quality follow-up questions that a curious investor might naturally ask next.
+
+Requirements:
+- Each question should explore a DIFFERENT dimension:
+* Question 1: Go deeper into the same topic (more specific/detailed)
+* Question 2: Compare or contrast with a related concept, company, or time period
+* Question 3: Explore a related but adjacent topic (e.g., if original was about revenue, ask about profitability or cash flow)
+- Keep questions between 8-15 words
+- Make them actionable and specific (avoid vague questions like "What else should I know?")
+- Frame questions naturally, as a user would ask them
+- Ensure questions are relevant to the original context (financial analysis, company performance, market trends)
+- Do NOT number the questions or add any prefixes
+- Put EACH question on its OWN LINE
+
+Output format (one question per line):
+How does Apple's gross margin compare to its competitors?
+What was the main driver behind revenue growth last quarter?
+Is the current valuation sustainable given industry trends?"""
+
+# Static prompt fragments, built once at import and handed out by the PromptComponents accessors. The indented
+# blocks are dedented here so every prompt that embeds them doesn't ship the source indentation to the model
+_GROUNDING_RULES = (
+    "**Grounding rules (read first):**\n"
+    "- The data blocks below — Sources, Company Fundamental Data, Annual/Quarterly Financial Statements — are the authoritative dataset for this answer. Prefer them over your training knowledge whenever they conflict; the provided data wins.\n"
+    '- Do not introduce facts (numbers, dates, names, events) not present in the data blocks. If the question (or part of it) cannot be answered from the data, say so explicitly (e.g. "this metric is not available in the data I have access to") and do not backfill from memory.\n'
+    "- Treat the data as current even if it post-dates your training cutoff; do not refuse on cutoff grounds.\n"
+    '- Do not write source attributions inline in the answer in ANY form. Forbidden: [SOURCES_JSON] blocks, bracketed markers like [1] or [2], parentheticals like "(Source: …)" / "(per Reuters)", and lead-ins like "according to …" or "as reported by …". The UI renders sources in a separate footer; your prose must contain only the analysis itself.'
+)
+
+_NO_DATA_DECLINE = (
+    "**No current data available.** No web sources or financial data were retrieved for this question. "
+    "Do not answer from training knowledge. Reply briefly that you do not have current data to answer reliably, "
+    "and suggest the user retry or rephrase."
+)
+
+_SOURCE_INSTRUCTIONS = textwrap.dedent("""
             **Source Citation Rules (follow strictly):**
             0. Freshness rule: unless the user explicitly asks for historical periods, avoid citing years older than current year - 1.
             1. NEVER write source names, document titles, or citation references as regular text inside your paragraphs.
@@ -92,32 +88,23 @@ class PromptComponents:
             Do NOT do this (wrong — redundant inline source name before the block):
             Revenue grew 6.4% in FY2024. SEC 10-K Filing 2024
             [SOURCES_JSON]{"sources": [{"name": "SEC 10-K Filing 2024", "url": "https://..."}]}[/SOURCES_JSON]
-        """
+        """).strip()
 
-    @staticmethod
-    def analysis_focus() -> str:
-        """Build analytical reasoning focus prompt."""
-        return """
+_ANALYSIS_FOCUS = textwrap.dedent("""
             Focus on analytical reasoning and interpretation. Use select key numbers to support your analysis,
             but prioritize explaining WHY trends exist and WHAT drives the financial performance.
             Include a few specific figures where they strengthen your argument, but avoid listing exhaustive metrics.
-        """
+        """).strip()
 
-    @staticmethod
-    def formatting_guidelines() -> str:
-        """Build standard formatting guidelines."""
-        return """
+_FORMATTING_GUIDELINES = textwrap.dedent("""
             **Formatting Guidelines:**
             - Start each section with its title in markdown bold: **Section Title**
             - Add a blank line after the title before starting the paragraph
             - Use numbers strategically - select 2-4 key figures per section that best support your analysis
             - Use the largest appropriate unit for numbers (e.g., "$1.5 billion" not "$1,500 million")
-        """
+        """).strip()
 
-    @staticmethod
-    def section_structure_template() -> str:
-        """Build the adaptive response format template."""
-        return """
+_SECTION_STRUCTURE_TEMPLATE = textwrap.dedent("""
             **Response Format — match length to the question's complexity:**
             - For single-fact questions (e.g. "what is X", "how much did Y earn"): answer in 1-2 sentences. State the fact and stop. Do NOT add extra context, related metrics, or explanation unless asked.
             - For simple comparison or trend questions: answer in 1-3 short paragraphs. No section headings. State the facts clearly and add a brief "why" if relevant.
@@ -127,12 +114,9 @@ class PromptComponents:
             - Use the largest appropriate unit for numbers (e.g., "$1.5 billion" not "$1,500 million").
             - If using section headings: keep them specific and catchy (3-5 words max), on separate bolded lines with a blank line after each heading.
             - Keep each section to 2-3 sentences MAX (under 60 words). Tell the story behind the numbers, not every detail.
-        """
+        """).strip()
 
-    @staticmethod
-    def example_structure() -> str:
-        """Build the example structure template showing both formats."""
-        return """
+_EXAMPLE_STRUCTURE = textwrap.dedent("""
             **Example A — Direct answer (for simple/comparison questions):**
 
             Apple's revenue grew 6.4% to **$416B** in FY2024, while Samsung reported **$211B** in the same period. Apple's growth was driven primarily by Services, which hit a record **$109B** (+13% YoY). Samsung's semiconductor recovery pushed operating profit up **$21B**, though mobile revenue remained flat.
@@ -148,8 +132,155 @@ class PromptComponents:
             **Section Heading 2**
 
             [Another focused insight]
+        """).strip()
+
+_DATA_GROUNDING_RULES = textwrap.dedent("""
+            CRITICAL DATA GROUNDING RULES:
+            - You may ONLY cite numbers and facts that are explicitly present in the financial data provided above. Calculations derived solely from provided figures (e.g., margins, growth rates, ratios) are allowed.
+            - If the requested metric (e.g., dividend per share, buyback amount, insider ownership) does not appear in the provided data and cannot be derived from it, you MUST explicitly state: "This specific metric is not available in the financial data I have access to."
+            - Do NOT present figures that would require data not present in the statements above.
+            - Do NOT cite any source URL unless it was explicitly provided in the context above or returned by Google Search results.
+            - If you cannot fully answer the question with the provided data, suggest the user check the company's investor relations page for this specific information.
+        """).strip()
+
+
+@functools.lru_cache(maxsize=1)
+def _current_date_context(today: date) -> str:
+    """Date grounding text for today; every prompt of the day embeds it, so it is rendered once per day."""
+    formatted = today.strftime("%B %d, %Y")
+    current_year = today.year
+    prior_year = current_year - 1
+    current_quarter_num = (today.month - 1) // 3 + 1
+    if current_quarter_num == 1:
+        last_completed_quarter = f"{prior_year}-Q4"
+    else:
+        last_completed_quarter = f"{current_year}-Q{current_quarter_num - 1}"
+    return (
+        f"Today is {formatted}; the most recently completed reporting quarter is {last_completed_quarter}. "
+        f'Treat "latest"/"recent"/"this quarter" as {last_completed_quarter} (or newer) and "this year"/"YTD" as {current_year}.'
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _base_context(ticker: str, question: str, today: date) -> str:
+    """Base prompt for a question; keyed on the date too, since it embeds the date grounding."""
+    return f"""
+            You are a seasoned financial analyst. {_current_date_context(today)}
+            Your task is to provide an insightful, non-repetitive analysis for the following question.
+            IMPORTANT: You MUST respond in the same language as the CURRENT question below, regardless of the language used in previous conversation history.
+
+            Question: {question}
+            Company: {ticker.upper()}
         """
 
+
+def _filing_pairs(
+    annual_statements: List[Dict], quarterly_statements: List[Dict]
+) -> Tuple[Tuple[Tuple[object, str], ...], Tuple[Tuple[object, str], ...]]:
+    """Hashable (period, url) pairs of the statements' filings, the key for the filing-derived caches below."""
+    return (
+        tuple((stmt.get("period_end_year", "unknown"), stmt.get("filing_10k_url")) for stmt in annual_statements),
+        tuple((stmt.get("period_end_quarter", "unknown"), stmt.get("filing_10q_url")) for stmt in quarterly_statements),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _available_sources(
+    ticker: str,
+    annual_filings: Tuple[Tuple[object, str], ...],
+    quarterly_filings: Tuple[Tuple[object, str], ...],
+) -> str:
+    """Filing URL reference block; built once per ticker and filing set, like the lookup below."""
+    lines = [f"- {ticker} Annual 10-K Filing ({year}): {url}" for year, url in annual_filings if url]
+    lines.extend(f"- {ticker} Quarterly 10-Q Filing ({quarter}): {url}" for quarter, url in quarterly_filings if url)
+    if not lines:
+        return ""
+    header = "**Available Source URLs (use these EXACT URLs when citing):**"
+    return f"{header}\n" + "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=256)
+def _filing_url_lookup(
+    ticker: str,
+    annual_filings: Tuple[Tuple[object, str], ...],
+    quarterly_filings: Tuple[Tuple[object, str], ...],
+) -> Mapping[str, str]:
+    """Filing name→URL lookup; popular tickers hit the same statements on every request, so it is built once."""
+    lookup: Dict[str, str] = {}
+    for year, url in annual_filings:
+        if url:
+            # Match the exact name format used in available_sources()
+            lookup[f"{ticker} Annual 10-K Filing ({year})"] = url
+            # Also add common AI-generated variants
+            lookup[f"SEC 10-K Filing {year}"] = url
+            lookup[f"SEC 10-K Filing ({year})"] = url
+            lookup[f"10-K Filing {year}"] = url
+            lookup[f"Annual Report {year}"] = url
+    for quarter, url in quarterly_filings:
+        if url:
+            lookup[f"{ticker} Quarterly 10-Q Filing ({quarter})"] = url
+            lookup[f"SEC 10-Q Filing {quarter}"] = url
+            lookup[f"SEC 10-Q Filing ({quarter})"] = url
+            lookup[f"10-Q Filing {quarter}"] = url
+            lookup[f"Quarterly Statement {quarter}"] = url
+    return MappingProxyType(lookup)
+
+
+class PromptComponents:
+    """Reusable prompt fragments for financial context building."""
+
+    @staticmethod
+    def current_date() -> str:
+        """Return current date context for prompt grounding."""
+        return _current_date_context(date.today())
+
+    @staticmethod
+    def related_questions(original_question: str) -> str:
+        """Prompt asking for 3 follow-up questions, one per line."""
+        return _RELATED_QUESTIONS_TEMPLATE.format(
+            current_date=PromptComponents.current_date(), original_question=original_question
+        )
+
+    @staticmethod
+    def grounding_rules() -> str:
+        """Unified grounding rules. Inject once near the top of any v2 prompt that supplies data blocks."""
+        return _GROUNDING_RULES
+
+    @staticmethod
+    def no_data_decline() -> str:
+        """Used when no sources AND no DB data are available — instruct the model to decline rather than freelance from training."""
+        return _NO_DATA_DECLINE
+
+    @staticmethod
+    def base_context(ticker: str, question: str) -> str:
+        """Build the base context that's common to all prompts."""
+        return _base_context(ticker, question, date.today())
+
+    @staticmethod
+    def source_instructions() -> str:
+        """Build detailed source citation instructions."""
+        return _SOURCE_INSTRUCTIONS
+
+    @staticmethod
+    def analysis_focus() -> str:
+        """Build analytical reasoning focus prompt."""
+        return _ANALYSIS_FOCUS
+
+    @staticmethod
+    def formatting_guidelines() -> str:
+        """Build standard formatting guidelines."""
+        return _FORMATTING_GUIDELINES
+
+    @staticmethod
+    def section_structure_template() -> str:
+        """Build the adaptive response format template."""
+        return _SECTION_STRUCTURE_TEMPLATE
+
+    @staticmethod
+    def example_structure() -> str:
+        """Build the example structure template showing both formats."""
+        return _EXAMPLE_STRUCTURE
+
     @staticmethod
     def visual_output_instructions() -> str:
         """Instructions for emitting inline SVG/HTML visuals via fenced code blocks."""
@@ -157,14 +288,7 @@ class PromptComponents:
 
     @staticmethod
     def data_grounding_rules() -> str:
-        return """
-            CRITICAL DATA GROUNDING RULES:
-            - You may ONLY cite numbers and facts that are explicitly present in the financial data provided above. Calculations derived solely from provided figures (e.g., margins, growth rates, ratios) are allowed.
-            - If the requested metric (e.g., dividend per share, buyback amount, insider ownership) does not appear in the provided data and cannot be derived from it, you MUST explicitly state: "This specific metric is not available in the financial data I have access to."
-            - Do NOT present figures that would require data not present in the statements above.
-            - Do NOT cite any source URL unless it was explicitly provided in the context above or returned by Google Search results.
-            - If you cannot fully answer the question with the provided data, suggest the user check the company's investor relations page for this specific information.
-        """
+        return _DATA_GROUNDING_RULES
 
     @staticmethod
     def data_coverage_notice(annual_statements: List[Dict], quarterly_statements: List[Dict]) -> str:
@@ -192,51 +316,16 @@ class PromptComponents:
         quarterly_statements: List[Dict],
     ) -> str:
         """Extract filing URLs from statement data into a reference block for the prompt."""
-        lines = []
-        for stmt in annual_statements:
-            url = stmt.get("filing_10k_url")
-            year = stmt.get("period_end_year", "unknown")
-            if url:
-                lines.append(f"- {ticker.upper()} Annual 10-K Filing ({year}): {url}")
-        for stmt in quarterly_statements:
-            url = stmt.get("filing_10q_url")
-            quarter = stmt.get("period_end_quarter", "unknown")
-            if url:
-                lines.append(f"- {ticker.upper()} Quarterly 10-Q Filing ({quarter}): {url}")
-        if not lines:
-            return ""
-        header = "**Available Source URLs (use these EXACT URLs when citing):**"
-        return f"{header}\n" + "\n".join(lines)
+        return _available_sources(ticker.upper(), *_filing_pairs(annual_statements, quarterly_statements))
 
     @staticmethod
     def build_filing_url_lookup(
         ticker: str,
         annual_statements: List[Dict],
         quarterly_statements: List[Dict],
-    ) -> Dict[str, str]:
-        """Build a name→URL lookup from statement filing URLs for source enrichment."""
-        lookup: Dict[str, str] = {}
-        for stmt in annual_statements:
-            url = stmt.get("filing_10k_url")
-            year = stmt.get("period_end_year", "unknown")
-            if url:
-                # Match the exact name format used in available_sources()
-                lookup[f"{ticker.upper()} Annual 10-K Filing ({year})"] = url
-                # Also add common AI-generated variants
-                lookup[f"SEC 10-K Filing {year}"] = url
-                lookup[f"SEC 10-K Filing ({year})"] = url
-                lookup[f"10-K Filing {year}"] = url
-                lookup[f"Annual Report {year}"] = url
-        for stmt in quarterly_statements:
-            url = stmt.get("filing_10q_url")
-            quarter = stmt.get("period_end_quarter", "unknown")
-            if url:
-                lookup[f"{ticker.upper()} Quarterly 10-Q Filing ({quarter})"] = url
-                lookup[f"SEC 10-Q Filing {quarter}"] = url
-                lookup[f"SEC 10-Q Filing ({quarter})"] = url
-                lookup[f"10-Q Filing {quarter}"] = url
-                lookup[f"Quarterly Statement {quarter}"] = url
-        return lookup
+    ) -> Mapping[str, str]:
+        """Build a read-only name→URL lookup from statement filing URLs for source enrichment."""
+        return _filing_url_lookup(ticker.upper(), *_filing_pairs(annual_statements, quarterly_statements))
 
     @staticmethod
     def extract_sources_from_response(text: str) -> List[Dict]:
@@ -246,24 +335,17 @@ class PromptComponents:
         """
         sources: List[Dict] = []
         seen_keys: set = set()
-        # Match all [Sources: ...] blocks
-        for block_match in re.finditer(r"\[Sources?:\s*(.+?)\]", text):
-            block_content = block_match.group(1)
-            # Extract markdown links [Name](url)
-            for link_match in re.finditer(r"\[([^\]]+)\]\(([^)]+)\)", block_content):
-                name, url = link_match.group(1), link_match.group(2)
-                key = url
+        # Match all [Sources: ...] blocks, then sweep each one for links and plain names in a single pass
+        for block_match in _SOURCES_BLOCK_RE.finditer(text):
+            for token in _SOURCE_TOKEN_RE.finditer(block_match.group(1)):
+                url = token.group("url")
+                if url:
+                    name, key = token.group("name"), url
+                else:
+                    name = key = token.group("plain").strip()
+                    if not name:
+                        continue
                 if key not in seen_keys:
                     seen_keys.add(key)
                     sources.append({"name": name, "url": url})
-            # Extract plain text sources (not inside markdown links)
-            # Remove markdown links first, then split by comma
-            plain = re.sub(r"\[([^\]]+)\]\([^)]+\)", "", block_content)
-            for part in plain.split(","):
-                part = part.strip()
-                if part:
-                    key = part
-                    if key not in seen_keys:
-                        seen_keys.add(key)
-                        sources.append({"name": part, "url": None})
         return sources
@@ -7,6 +7,18 @@ from .components import PromptComponents
 
 logger = logging.getLogger(__name__)
 
+# Everything after the data blocks is static, so the short-analysis instructions are assembled once at import
+_SHORT_ANALYSIS_INSTRUCTIONS = f"""**Instructions for your analysis:**
+
+            Analyze the financial data and provide a clear, direct answer to the user's question.
+            Choose the response format that best serves the answer — a direct response for simple questions, or organized sections for complex multi-topic analysis.
+            Use AT MOST 2-3 sections. Start each section heading on its own line in markdown bold: **Section Title**
+
+            {PromptComponents.section_structure_template()}
+
+            Answer in a professional, informative tone. Prioritize clarity and directness.
+        """
+
 
 class DetailedContextBuilder(ContextBuilder):
     """Builds context for questions requiring detailed financial analysis."""
@@ -20,7 +32,6 @@ class DetailedContextBuilder(ContextBuilder):
     def _build_short_analysis(self, input: ContextBuilderInput) -> str:
         """Build context for short, scannable analysis (default)."""
         base_context = PromptComponents.base_context(input.ticker, input.question)
-        section_structure = PromptComponents.section_structure_template()
         available_sources = PromptComponents.available_sources(
             input.ticker, input.annual_statements, input.quarterly_statements
         )
@@ -44,16 +55,7 @@ class DetailedContextBuilder(ContextBuilder):
 
             {available_sources}
 
-            **Instructions for your analysis:**
-
-            Analyze the financial data and provide a clear, direct answer to the user's question.
-            Choose the response format that best serves the answer — a direct response for simple questions, or organized sections for complex multi-topic analysis.
-            Use AT MOST 2-3 sections. Start each section heading on its own line in markdown bold: **Section Title**
-
-            {section_structure}
-
-            Answer in a professional, informative tone. Prioritize clarity and directness.
-        """
+            {_SHORT_ANALYSIS_INSTRUCTIONS}"""
 
     def _build_deep_analysis(self, input: ContextBuilderInput) -> str:
         """Build context for comprehensive, detailed analysis."""
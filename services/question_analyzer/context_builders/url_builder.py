@@ -3,65 +3,21 @@
 from .base import ContextBuilder, ContextBuilderInput
 from .components import PromptComponents
 
-
-class UrlContextBuilder(ContextBuilder):
-    """Builds context for questions requiring URL-based document analysis."""
-
-    def build(self, input: ContextBuilderInput) -> str:
-        """Build context for URL-based document analysis."""
-        if input.deep_analysis:
-            return self._build_deep_analysis(input)
-        return self._build_short_analysis(input)
-
-    def _build_short_analysis(self, input: ContextBuilderInput) -> str:
-        """Build context for short, scannable analysis (default)."""
-        base_context = PromptComponents.base_context(input.ticker, input.question)
-
-        # Extract URL from input
-        source_url = input.source_url or "No source URL available"
-        url_context = f"Source Document URL: {source_url}"
-
-        section_structure = PromptComponents.section_structure_template()
-
-        return f"""
-            {base_context}
-
-            {PromptComponents.grounding_rules()}
-
-            {url_context}
-
-            **Instructions for your analysis:**
+# Everything after the source URL is static, so each mode's instructions are assembled once at import.
+# Deep analysis allocates 80 words to the summary and 160 to each of the two main sections (total: 400).
+_SHORT_ANALYSIS_INSTRUCTIONS = f"""**Instructions for your analysis:**
 
             Analyze the document available at the URL provided above and provide a clear, direct answer to the user's question.
             If the URL is accessible, use it as your ONLY source of information. Do not search for additional data sources. This is critical.
 
             Choose the response format that best serves the answer — a direct response for simple questions, or organized sections for complex multi-topic analysis.
 
-            {section_structure}
+            {PromptComponents.section_structure_template()}
 
             Answer in a professional, informative tone. Prioritize clarity and directness.
         """
 
-    def _build_deep_analysis(self, input: ContextBuilderInput) -> str:
-        """Build context for comprehensive, detailed analysis."""
-        base_context = PromptComponents.base_context(input.ticker, input.question)
-
-        # Extract URL from input
-        source_url = input.source_url or "No source URL available"
-        url_context = f"Source Document URL: {source_url}"
-
-        # Word allocation: 80 words for summary, 160 words each for 2 main sections (total: 400)
-        summary_words = 80
-        section_words = 160
-
-        return f"""
-            {base_context}
-
-            {PromptComponents.grounding_rules()}
-
-            {url_context}
-
-            **Instructions for your analysis:**
+_DEEP_ANALYSIS_INSTRUCTIONS = """**Instructions for your analysis:**
 
             Analyze the document available at the URL provided above. If the URL is accessible, use it as your ONLY source of information. Do not search for additional data sources. This is critical.
 
@@ -69,18 +25,18 @@ class UrlContextBuilder(ContextBuilder):
 
             **Summary**
 
-            (~{summary_words} words) Provide a concise overview that directly answers the user's question and previews the key findings from the two sections below. Highlight the most important takeaway.
+            (~80 words) Provide a concise overview that directly answers the user's question and previews the key findings from the two sections below. Highlight the most important takeaway.
 
             **Key Financial Highlights**
 
-            (~{section_words} words) Focus on:
+            (~160 words) Focus on:
             - Revenue, profit margins, growth rates and trends over the years mentioned in the report
             - Indicate if performance is strong, weak, or mixed
             - Include specific numbers and percentages where available
 
             **Business Operations & Risk Factors**
 
-            (~{section_words} words) Focus on:
+            (~160 words) Focus on:
             - Key business developments and operational metrics in the report
             - Assess if operations are improving, declining, or stable
             - Notable risks, challenges, competitive landscape mentioned in the report
@@ -102,3 +58,47 @@ class UrlContextBuilder(ContextBuilder):
             - NO DUPLICATION: Each sentence should add new information
             - Only reference information from the document at the provided URL
         """
+
+
+class UrlContextBuilder(ContextBuilder):
+    """Builds context for questions requiring URL-based document analysis."""
+
+    def build(self, input: ContextBuilderInput) -> str:
+        """Build context for URL-based document analysis."""
+        if input.deep_analysis:
+            return self._build_deep_analysis(input)
+        return self._build_short_analysis(input)
+
+    def _build_short_analysis(self, input: ContextBuilderInput) -> str:
+        """Build context for short, scannable analysis (default)."""
+        base_context = PromptComponents.base_context(input.ticker, input.question)
+
+        # Extract URL from input
+        source_url = input.source_url or "No source URL available"
+        url_context = f"Source Document URL: {source_url}"
+
+        return f"""
+            {base_context}
+
+            {PromptComponents.grounding_rules()}
+
+            {url_context}
+
+            {_SHORT_ANALYSIS_INSTRUCTIONS}"""
+
+    def _build_deep_analysis(self, input: ContextBuilderInput) -> str:
+        """Build context for comprehensive, detailed analysis."""
+        base_context = PromptComponents.base_context(input.ticker, input.question)
+
+        # Extract URL from input
+        source_url = input.source_url or "No source URL available"
+        url_context = f"Source Document URL: {source_url}"
+
+        return f"""
+            {base_context}
+
+            {PromptComponents.grounding_rules()}
+
+            {url_context}
+
+            {_DEEP_ANALYSIS_INSTRUCTIONS}"""
@@ -1,11 +1,13 @@
 """Optimizes financial data fetching based on question requirements."""
 
+import asyncio
 import logging
-import time
 from typing import Any, Dict, List, Optional, Tuple
 
 from connectors.company_financial import CompanyFinancialConnector
 from external_knowledge.company_fundamental import get_company_fundamental
+from utils.langfuse_config import observe_if_enabled
+from utils.profiling import profiled
 
 from .types import FinancialDataRequirement, FinancialPeriodRequirement
 
@@ -41,50 +43,103 @@ class FinancialDataOptimizer:
         Returns:
             Tuple of (company_fundamental, annual_statements, quarterly_statements)
         """
-        company_fundamental = None
-        annual_statements: List[Dict[str, Any]] = []
-        quarterly_statements: List[Dict[str, Any]] = []
+        if data_requirement == FinancialDataRequirement.NONE:
+            return None, [], []
+
+        statements = self.fetch_statements(ticker, data_requirement, period_requirement)
 
-        # Fetch basic company data if needed
+        # Fetch basic company data if needed, alongside the statements rather than before them
         if data_requirement in [FinancialDataRequirement.BASIC]:
-            t_start = time.perf_counter()
-            company_fundamental = get_company_fundamental(ticker)
-            t_end = time.perf_counter()
-            logger.info(f"Profiling get_company_fundamental: {t_end - t_start:.4f}s")
+            company_fundamental, (annual_statements, quarterly_statements) = await asyncio.gather(
+                self.fetch_fundamentals(ticker), statements
+            )
+        else:
+            company_fundamental = None
+            annual_statements, quarterly_statements = await statements
+        return company_fundamental, annual_statements, quarterly_statements
+
+    @observe_if_enabled(name="get_company_fundamental")
+    @profiled("get_company_fundamental")
+    async def fetch_fundamentals(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch company fundamentals (needed for BASIC questions).
+
+        Doesn't depend on the period requirement, so callers can start it before period classification.
+
+        Args:
+            ticker: Company ticker symbol
+
+        Returns:
+            Company fundamental data, or None if unavailable
+        """
+        return await asyncio.to_thread(get_company_fundamental, ticker)
+
+    async def fetch_statements(
+        self,
+        ticker: str,
+        data_requirement: FinancialDataRequirement,
+        period_requirement: Optional[FinancialPeriodRequirement] = None,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Fetch the annual/quarterly statements required by the data and period requirements.
+
+        Args:
+            ticker: Company ticker symbol
+            data_requirement: Level of data required
+            period_requirement: Which specific periods to fetch (only used if DETAILED or a summary)
+
+        Returns:
+            Tuple of (annual_statements, quarterly_statements)
+        """
+        annual_statements: List[Dict[str, Any]] = []
+        quarterly_statements: List[Dict[str, Any]] = []
 
         # Fetch quarterly summary data (minimal: just 1 quarter with filing URL)
         if data_requirement == FinancialDataRequirement.QUARTERLY_SUMMARY:
-            t_start = time.perf_counter()
             quarterly_statements = await self._fetch_quarterly_summary(ticker, period_requirement)
-            t_end = time.perf_counter()
-            logger.info(f"Profiling fetch_quarterly_summary: {t_end - t_start:.4f}s")
-            logger.info(f"Fetched {len(quarterly_statements)} quarterly statement(s) for summary")
+            logger.info("Fetched %d quarterly statement(s) for summary", len(quarterly_statements))
 
         # Fetch annual summary data (minimal: just 1 year with filing URL)
         if data_requirement == FinancialDataRequirement.ANNUAL_SUMMARY:
-            t_start = time.perf_counter()
             annual_statements = await self._fetch_annual_summary(ticker, period_requirement)
-            t_end = time.perf_counter()
-            logger.info(f"Profiling fetch_annual_summary: {t_end - t_start:.4f}s")
-            logger.info(f"Fetched {len(annual_statements)} annual statement(s) for summary")
+            logger.info("Fetched %d annual statement(s) for summary", len(annual_statements))
 
         # Fetch detailed financial statements only if required
         if data_requirement == FinancialDataRequirement.DETAILED and period_requirement:
-            t_start = time.perf_counter()
+            annual_statements, quarterly_statements = await self._fetch_detailed_statements(ticker, period_requirement)
+            logger.info(
+                "Fetched %d annual + %d quarterly statements", len(annual_statements), len(quarterly_statements)
+            )
 
-            # Fetch annual statements if needed
-            if period_requirement.period_type in ["annual", "both"]:
-                annual_statements = await self._fetch_annual_statements(ticker, period_requirement)
+        return annual_statements, quarterly_statements
 
-            # Fetch quarterly statements if needed
-            if period_requirement.period_type in ["quarterly", "both"]:
-                quarterly_statements = await self._fetch_quarterly_statements(ticker, period_requirement)
+    @observe_if_enabled(name="get_financial_statements (optimized)")
+    @profiled("get_financial_statements (optimized)")
+    async def _fetch_detailed_statements(
+        self, ticker: str, period_requirement: FinancialPeriodRequirement
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Fetch the annual and/or quarterly statements named by the period requirement.
 
-            t_end = time.perf_counter()
-            logger.info(f"Profiling get_financial_statements (optimized): {t_end - t_start:.4f}s")
-            logger.info(f"Fetched {len(annual_statements)} annual + {len(quarterly_statements)} quarterly statements")
+        Args:
+            ticker: Company ticker symbol
+            period_requirement: Period specification
 
-        return company_fundamental, annual_statements, quarterly_statements
+        Returns:
+            Tuple of (annual_statements, quarterly_statements)
+        """
+        # Fetch annual and quarterly statements concurrently when both are needed
+        if period_requirement.period_type == "both":
+            annual_statements, quarterly_statements = await asyncio.gather(
+                self._fetch_annual_statements(ticker, period_requirement),
+                self._fetch_quarterly_statements(ticker, period_requirement),
+            )
+            return annual_statements, quarterly_statements
+        if period_requirement.period_type == "annual":
+            return await self._fetch_annual_statements(ticker, period_requirement), []
+        if period_requirement.period_type == "quarterly":
+            return [], await self._fetch_quarterly_statements(ticker, period_requirement)
+        return [], []
 
     async def _fetch_annual_statements(
         self, ticker: str, period_requirement: FinancialPeriodRequirement
@@ -100,23 +155,29 @@ class FinancialDataOptimizer:
             List of annual statement dictionaries
         """
         if period_requirement.specific_years:
-            statements_raw = self.company_financial_connector.get_company_financial_statements_by_years(
-                ticker, period_requirement.specific_years
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_financial_statements_by_years,
+                ticker,
+                period_requirement.specific_years,
             )
             logger.info(
-                f"Fetched {len(statements_raw)} annual statements for years: {period_requirement.specific_years}"
+                "Fetched %d annual statements for years: %s", len(statements_raw), period_requirement.specific_years
             )
         elif period_requirement.num_periods:
-            statements_raw = self.company_financial_connector.get_company_financial_statements_recent(
-                ticker, period_requirement.num_periods
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_financial_statements_recent,
+                ticker,
+                period_requirement.num_periods,
             )
-            logger.info(f"Fetched {len(statements_raw)} most recent annual statements")
+            logger.info("Fetched %d most recent annual statements", len(statements_raw))
         else:
             # Fallback: get last 3 years by default
-            statements_raw = self.company_financial_connector.get_company_financial_statements_recent(ticker, 3)
-            logger.info(f"Fetched {len(statements_raw)} annual statements (default: 3 most recent)")
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_financial_statements_recent, ticker, 3
+            )
+            logger.info("Fetched %d annual statements (default: 3 most recent)", len(statements_raw))
 
-        return [CompanyFinancialConnector.to_dict(item) for item in statements_raw]
+        return CompanyFinancialConnector.to_dicts(statements_raw)
 
     async def _fetch_quarterly_statements(
         self, ticker: str, period_requirement: FinancialPeriodRequirement
@@ -132,26 +193,32 @@ class FinancialDataOptimizer:
             List of quarterly statement dictionaries
         """
         if period_requirement.specific_quarters:
-            statements_raw = self.company_financial_connector.get_company_quarterly_financial_statements_by_quarters(
-                ticker, period_requirement.specific_quarters
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_quarterly_financial_statements_by_quarters,
+                ticker,
+                period_requirement.specific_quarters,
             )
             logger.info(
-                f"Fetched {len(statements_raw)} quarterly statements for: {period_requirement.specific_quarters}"
+                "Fetched %d quarterly statements for: %s", len(statements_raw), period_requirement.specific_quarters
             )
         elif period_requirement.num_periods:
-            statements_raw = self.company_financial_connector.get_company_quarterly_financial_statements_recent(
-                ticker, period_requirement.num_periods
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_quarterly_financial_statements_recent,
+                ticker,
+                period_requirement.num_periods,
             )
-            logger.info(f"Fetched {len(statements_raw)} most recent quarterly statements")
+            logger.info("Fetched %d most recent quarterly statements", len(statements_raw))
         else:
             # Fallback: get last 4 quarters by default
-            statements_raw = self.company_financial_connector.get_company_quarterly_financial_statements_recent(
-                ticker, 4
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_quarterly_financial_statements_recent, ticker, 4
             )
-            logger.info(f"Fetched {len(statements_raw)} quarterly statements (default: 4 most recent)")
+            logger.info("Fetched %d quarterly statements (default: 4 most recent)", len(statements_raw))
 
-        return [CompanyFinancialConnector.to_dict(item) for item in statements_raw]
+        return CompanyFinancialConnector.to_dicts(statements_raw)
 
+    @observe_if_enabled(name="fetch_quarterly_summary")
+    @profiled("fetch_quarterly_summary")
     async def _fetch_quarterly_summary(
         self, ticker: str, period_requirement: Optional[FinancialPeriodRequirement] = None
     ) -> List[Dict[str, Any]]:
@@ -172,27 +239,31 @@ class FinancialDataOptimizer:
             and period_requirement.specific_quarters
             and period_requirement.specific_quarters != ["latest"]
         ):
-            statements_raw = self.company_financial_connector.get_company_quarterly_financial_statements_by_quarters(
-                ticker, period_requirement.specific_quarters
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_quarterly_financial_statements_by_quarters,
+                ticker,
+                period_requirement.specific_quarters,
             )
             logger.info(
-                f"Fetched {len(statements_raw)} quarterly statement(s) for: {period_requirement.specific_quarters}"
+                "Fetched %d quarterly statement(s) for: %s", len(statements_raw), period_requirement.specific_quarters
             )
         elif period_requirement and period_requirement.num_periods:
             # Use num_periods if specified (typically 1 for summary questions)
-            statements_raw = self.company_financial_connector.get_company_quarterly_financial_statements_recent(
-                ticker, period_requirement.num_periods
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_quarterly_financial_statements_recent,
+                ticker,
+                period_requirement.num_periods,
             )
-            logger.info(f"Fetched {period_requirement.num_periods} most recent quarterly statement(s) for summary")
+            logger.info("Fetched %d most recent quarterly statement(s) for summary", period_requirement.num_periods)
         else:
             # Default: fetch only the most recent quarter
-            statements_raw = self.company_financial_connector.get_company_quarterly_financial_statements_recent(
-                ticker, 1
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_quarterly_financial_statements_recent, ticker, 1
             )
             logger.info("Fetched latest quarterly statement for summary")
 
         # Convert to dict - filing_10q_url is already included in the model
-        statements_dict = [CompanyFinancialConnector.to_dict(item) for item in statements_raw]
+        statements_dict = CompanyFinancialConnector.to_dicts(statements_raw)
 
         # Filter out statements that don't have a filing_10q_url
         filtered_statements = [
@@ -202,10 +273,14 @@ class FinancialDataOptimizer:
         ]
 
         logger.info(
-            f"Filtered to {len(filtered_statements)} quarterly statement(s) with valid filing URLs out of {len(statements_dict)} total"
+            "Filtered to %d quarterly statement(s) with valid filing URLs out of %d total",
+            len(filtered_statements),
+            len(statements_dict),
         )
         return filtered_statements
 
+    @observe_if_enabled(name="fetch_annual_summary")
+    @profiled("fetch_annual_summary")
     async def _fetch_annual_summary(
         self, ticker: str, period_requirement: Optional[FinancialPeriodRequirement] = None
     ) -> List[Dict[str, Any]]:
@@ -222,25 +297,31 @@ class FinancialDataOptimizer:
         """
         # Check if specific years are requested
         if period_requirement and period_requirement.specific_years:
-            statements_raw = self.company_financial_connector.get_company_financial_statements_by_years(
-                ticker, period_requirement.specific_years
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_financial_statements_by_years,
+                ticker,
+                period_requirement.specific_years,
             )
             logger.info(
-                f"Fetched {len(statements_raw)} annual statement(s) for years: {period_requirement.specific_years}"
+                "Fetched %d annual statement(s) for years: %s", len(statements_raw), period_requirement.specific_years
             )
         elif period_requirement and period_requirement.num_periods:
             # Use num_periods if specified (typically 1 for summary questions)
-            statements_raw = self.company_financial_connector.get_company_financial_statements_recent(
-                ticker, period_requirement.num_periods
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_financial_statements_recent,
+                ticker,
+                period_requirement.num_periods,
             )
-            logger.info(f"Fetched {period_requirement.num_periods} most recent annual statement(s) for summary")
+            logger.info("Fetched %d most recent annual statement(s) for summary", period_requirement.num_periods)
         else:
             # Default: fetch only the most recent year
-            statements_raw = self.company_financial_connector.get_company_financial_statements_recent(ticker, 1)
+            statements_raw = await asyncio.to_thread(
+                self.company_financial_connector.get_company_financial_statements_recent, ticker, 1
+            )
             logger.info("Fetched latest annual statement for summary")
 
         # Convert to dict - filing_10k_url is already included in the model
-        statements_dict = [CompanyFinancialConnector.to_dict(item) for item in statements_raw]
+        statements_dict = CompanyFinancialConnector.to_dicts(statements_raw)
 
         # Filter out statements that don't have a filing_10k_url
         filtered_statements = [
@@ -250,6 +331,8 @@ class FinancialDataOptimizer:
         ]
 
         logger.info(
-            f"Filtered to {len(filtered_statements)} annual statement(s) with valid filing URLs out of {len(statements_dict)} total"
+            "Filtered to %d annual statement(s) with valid filing URLs out of %d total",
+            len(filtered_statements),
+            len(statements_dict),
         )
         return filtered_statements
@@ -1,17 +1,22 @@
 """Question handlers for different types of financial questions."""
 
+import asyncio
+import hashlib
 import json
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Dict, Generator, Iterable, List, Optional, Union
+from typing import Any, AsyncGenerator, Dict, Generator, Iterable, List, Mapping, Optional, Union
 
 from langfuse import get_client, observe
 
 from agent.agent import Agent
-from agent.multi_agent import MultiAgent
+from agent.multi_agent import MultiAgent, get_multi_agent
 from ai_models.model_name import ModelName
 from ai_models.openrouter_client import OpenRouterClient
+from connectors import cache
 from connectors.company import CompanyConnector
 from utils.conversation_format import format_conversation_context
 
@@ -37,13 +42,24 @@ def get_openrouter_client() -> Optional[OpenRouterClient]:
     return _openrouter_client
 
 
+# Related questions depend only on the question text and the model, so repeats (suggested-question chips,
+# retries) can reuse them instead of paying another LLM call
+RELATED_QUESTIONS_CACHE_TTL_SECONDS = 24 * 3600
+
+
+def _related_questions_cache_key(question: str, preferred_model: str) -> str:
+    normalized = " ".join(question.lower().split())
+    digest = hashlib.blake2b(f"{preferred_model}\n{normalized}".encode(), digest_size=16).hexdigest()
+    return f"related_questions:{digest}"
+
+
 SOURCE_START_TAG = "[SOURCES_JSON]"
 SOURCE_END_TAG = "[/SOURCES_JSON]"
 
 
 def _process_source_tags(
     chunks: Iterable[Union[str, dict]],
-    filing_lookup: Optional[Dict[str, str]] = None,
+    filing_lookup: Optional[Mapping[str, str]] = None,
 ) -> Generator[Dict[str, Any], None, None]:
     """Process a stream of text chunks, extracting [SOURCES_JSON] blocks into sources events.
 
@@ -249,6 +265,63 @@ def _collect_paragraph_sources(
         }
 
 
+# Roughly one or two paragraphs of events; the model stream reads this far ahead of a slow client
+_EVENT_BUFFER_SIZE = 32
+_EVENTS_END = object()
+
+# A stream holds its worker for the whole answer, so streams get their own pool rather than starving
+# asyncio.to_thread callers (DB queries, fundamentals) in the loop's default executor. 40 matches the
+# anyio thread limit these streams used to share via iterate_in_threadpool.
+_STREAM_WORKERS = 40
+_stream_executor = ThreadPoolExecutor(max_workers=_STREAM_WORKERS, thread_name_prefix="answer-stream")
+
+
+async def _buffer_events(events: Iterable[Any], maxsize: int = _EVENT_BUFFER_SIZE) -> AsyncGenerator[Any, None]:
+    """Drain a sync event stream on a dedicated worker thread into a bounded buffer.
+
+    The worker keeps reading the model stream while the client catches up, and blocks once
+    ``maxsize`` events are waiting so memory stays flat however long the answer runs. When the
+    consumer stops early the worker closes the stream, releasing the model's HTTP response.
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Any]" = asyncio.Queue()
+    slots = threading.Semaphore(maxsize)
+    stopped = threading.Event()
+    failure: List[Exception] = []
+
+    def produce() -> None:
+        try:
+            # A stream queued behind busy workers may be abandoned before it ever starts
+            if not stopped.is_set():
+                for event in events:
+                    slots.acquire()
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, event)
+        except Exception as e:
+            failure.append(e)
+        finally:
+            # Generators must be closed on the thread that iterates them
+            close = getattr(events, "close", None)
+            if close is not None:
+                close()
+        if not stopped.is_set():
+            loop.call_soon_threadsafe(queue.put_nowait, _EVENTS_END)
+
+    producer = loop.run_in_executor(_stream_executor, produce)
+    try:
+        while (event := await queue.get()) is not _EVENTS_END:
+            slots.release()
+            yield event
+        await producer
+        if failure:
+            raise failure[0]
+    finally:
+        # Wake a worker waiting for room so it sees the stop instead of reading the rest of the stream
+        stopped.set()
+        slots.release(maxsize)
+
+
 class BaseQuestionHandler:
     """Base class for question handlers."""
 
@@ -268,9 +341,10 @@ class BaseQuestionHandler:
         self, original_question: str, preferred_model: ModelName = ModelName.Auto
     ) -> AsyncGenerator[Dict[str, str], None]:
         """
-        Generate related follow-up questions using MultiAgent with streaming.
+        Generate related follow-up questions using MultiAgent.
 
-        Buffers streaming chunks to yield complete questions one at a time.
+        The questions are awaited on the event loop, so cancelling the consumer aborts the LLM call. A full
+        set of questions is cached in Redis per model and normalized question, and a cache hit skips the LLM call.
 
         Args:
             original_question: The original question asked
@@ -279,49 +353,61 @@ class BaseQuestionHandler:
         Yields:
             Dictionary with type "related_question" and body containing the complete question
         """
+        cache_key = _related_questions_cache_key(original_question, preferred_model)
+        # Redis calls are blocking network round-trips, so they run off the event loop
+        cached = await asyncio.to_thread(cache.get_json, cache_key)
+        if cached and cached.get("questions"):
+            logger.info("Related questions cache hit")
+            for question in cached["questions"]:
+                yield {"type": "related_question", "body": question}
+            return
+
         try:
-            prompt = f"""
-                {PromptComponents.current_date()}
-
-                Based on this original question: "{original_question}"
-
-                Generate exactly 3 high-quality follow-up questions that a curious investor might naturally ask next.
-
-                Requirements:
-                - Each question should explore a DIFFERENT dimension:
-                * Question 1: Go deeper into the same topic (more specific/detailed)
-                * Question 2: Compare or contrast with a related concept, company, or time period
-                * Question 3: Explore a related but adjacent topic (e.g., if original was about revenue, ask about profitability or cash flow)
-                - Keep questions between 8-15 words
-                - Make them actionable and specific (avoid vague questions like "What else should I know?")
-                - Frame questions naturally, as a user would ask them
-                - Ensure questions are relevant to the original context (financial analysis, company performance, market trends)
-                - Do NOT number the questions or add any prefixes
-                - Put EACH question on its OWN LINE
-
-                Output format (one question per line):
-                How does Apple's gross margin compare to its competitors?
-                What was the main driver behind revenue growth last quarter?
-                Is the current valuation sustainable given industry trends?
-            """
+            prompt = PromptComponents.related_questions(original_question)
 
-            agent = MultiAgent(model_name=preferred_model)
+            agent = get_multi_agent(preferred_model)
 
-            # Stream complete questions one at a time
-            for question in agent.generate_content_by_lines(
+            questions = await agent.agenerate_content_by_lines(
                 prompt=prompt,
-                use_google_search=False,
                 max_lines=3,
                 min_line_length=10,
                 strip_numbering=True,
                 strip_markdown=True,
-            ):
+            )
+            for question in questions:
                 yield {"type": "related_question", "body": question}
 
+            if len(questions) == 3:
+                await asyncio.to_thread(
+                    cache.set_json, cache_key, {"questions": questions}, RELATED_QUESTIONS_CACHE_TTL_SECONDS
+                )
+
         except Exception as e:
             logger.error(f"Error generating related questions with MultiAgent: {e}")
             # Silently fail - related questions are non-critical
 
+    def _prefetch_related_questions(
+        self, original_question: str, preferred_model: ModelName = ModelName.Auto
+    ) -> "asyncio.Task[List[Dict[str, str]]]":
+        """
+        Start generating related questions in the background so they overlap the main answer.
+
+        Cancelling the returned task aborts the generation, so handlers cancel it once the answer
+        stream is closed.
+
+        Args:
+            original_question: The original question asked
+            preferred_model: Preferred model to use for question generation
+
+        Returns:
+            Task resolving to the list of related question events
+        """
+
+        async def collect() -> List[Dict[str, str]]:
+            return [event async for event in self._generate_related_questions(original_question, preferred_model)]
+
+        return asyncio.create_task(collect())
+
 
 class GeneralFinanceHandler(BaseQuestionHandler):
     """Handles general financial concept questions."""
@@ -348,8 +434,12 @@ class GeneralFinanceHandler(BaseQuestionHandler):
             Dictionary chunks with analysis results
         """
         t_start = time.perf_counter()
+        # Related questions depend only on the question, so they generate while the answer streams
+        related_questions_task = self._prefetch_related_questions(question, preferred_model)
 
         try:
+            if use_google_search:
+                yield thinking_status("Searching for the latest data...", phase=AnalysisPhase.SEARCH, step=2)
             yield thinking_status("Writing your answer...", phase=AnalysisPhase.ANALYZE, step=3, total_steps=4)
 
             # Conversation context (important for follow-ups like "then?", "so?", "based on that?")
@@ -410,11 +500,10 @@ class GeneralFinanceHandler(BaseQuestionHandler):
 
                 first_chunk_received = False
                 completion_start_time = None
-                output_tokens = 0
                 full_output = []
 
                 raw_chunks = agent.generate_content(prompt=prompt, use_google_search=use_google_search)
-                for event in _process_source_tags(raw_chunks):
+                async for event in _buffer_events(_process_source_tags(raw_chunks)):
                     if event["type"] == "answer":
                         if not first_chunk_received:
                             completion_start_time = datetime.now(timezone.utc)
@@ -425,14 +514,14 @@ class GeneralFinanceHandler(BaseQuestionHandler):
                             first_chunk_received = True
 
                         full_output.append(event["body"])
-                        output_tokens += len(event["body"].split())
 
                     yield event
 
-                # Update generation with output and usage
+                # Update generation with output and usage (word count over the joined text, once)
+                output_text = "".join(full_output)
                 gen.update(
-                    output="".join(full_output),
-                    usage_details={"output_tokens": output_tokens},
+                    output=output_text,
+                    usage_details={"output_tokens": len(output_text.split())},
                     metadata={
                         "use_google_search": use_google_search,
                         "use_url_context": use_url_context,
@@ -447,7 +536,7 @@ class GeneralFinanceHandler(BaseQuestionHandler):
             yield {"type": "model_used", "body": model_used}
 
             t_related = time.perf_counter()
-            async for related_q in self._generate_related_questions(question, preferred_model):
+            for related_q in await related_questions_task:
                 yield related_q
             t_related_end = time.perf_counter()
             logger.info(f"Profiling GeneralFinanceHandler related_questions: {t_related_end - t_related:.4f}s")
@@ -456,6 +545,9 @@ class GeneralFinanceHandler(BaseQuestionHandler):
         except Exception as e:
             logger.error(f"❌ Error generating explanation: {e}")
             yield {"type": "answer", "body": "❌ Error generating explanation. Please try again later."}
+        finally:
+            # Nothing reads the related questions once the stream is closed or failed
+            related_questions_task.cancel()
 
 
 class CompanyGeneralHandler(BaseQuestionHandler):
@@ -496,6 +588,9 @@ class CompanyGeneralHandler(BaseQuestionHandler):
             total_steps=4,
         )
 
+        # Related questions depend only on the question, so they generate while the answer streams
+        related_questions_task = self._prefetch_related_questions(question, preferred_model)
+
         try:
             source_instructions = PromptComponents.source_instructions()
 
@@ -546,11 +641,10 @@ class CompanyGeneralHandler(BaseQuestionHandler):
 
                 first_chunk_received = False
                 completion_start_time = None
-                output_tokens = 0
                 full_output = []
 
                 raw_chunks = agent.generate_content(prompt=prompt, use_google_search=use_google_search)
-                for event in _collect_paragraph_sources(_process_source_tags(raw_chunks)):
+                async for event in _buffer_events(_collect_paragraph_sources(_process_source_tags(raw_chunks))):
                     if event["type"] == "answer":
                         if not first_chunk_received:
                             completion_start_time = datetime.now(timezone.utc)
@@ -561,14 +655,14 @@ class CompanyGeneralHandler(BaseQuestionHandler):
                             first_chunk_received = True
 
                         full_output.append(event["body"])
-                        output_tokens += len(event["body"].split())
 
                     yield event
 
-                # Update generation with output and usage
+                # Update generation with output and usage (word count over the joined text, once)
+                output_text = "".join(full_output)
                 gen.update(
-                    output="".join(full_output),
-                    usage_details={"output_tokens": output_tokens},
+                    output=output_text,
+                    usage_details={"output_tokens": len(output_text.split())},
                     metadata={
                         "ticker": ticker,
                         "use_google_search": use_google_search,
@@ -584,7 +678,7 @@ class CompanyGeneralHandler(BaseQuestionHandler):
             yield {"type": "model_used", "body": model_used}
 
             t_related = time.perf_counter()
-            async for related_q in self._generate_related_questions(question, preferred_model):
+            for related_q in await related_questions_task:
                 yield related_q
             t_related_end = time.perf_counter()
             logger.info(f"Profiling CompanyGeneralHandler related_questions: {t_related_end - t_related:.4f}s")
@@ -593,3 +687,6 @@ class CompanyGeneralHandler(BaseQuestionHandler):
         except Exception as e:
             logger.error(f"Error generating answer: {str(e)}")
             yield {"type": "answer", "body": "❌ Error generating answer."}
+        finally:
+            # Nothing reads the related questions once the stream is closed or failed
+            related_questions_task.cancel()
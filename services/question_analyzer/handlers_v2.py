@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional
 
 from agent.multi_agent import MultiAgent
 from ai_models.model_name import ModelName
@@ -19,10 +21,11 @@ from services.analyze_retrieval.query_reformulator import QueryReformulator
 from services.analyze_retrieval.retrieval import retrieve_for_analyze
 from services.analyze_retrieval.schemas import AnalyzePassage
 from services.analyze_retrieval.url_ingest import UrlIngestError, ingest_url
-from services.question_analyzer.classifier import QuestionClassifier
+from services.question_analyzer.classifier import QuestionClassifier, _is_likely_basic_question
 from services.question_analyzer.context_builders import ContextBuilderInput, get_context_builder
 from services.question_analyzer.context_builders.components import PromptComponents
 from services.question_analyzer.data_optimizer import FinancialDataOptimizer
+from services.question_analyzer.handlers import _buffer_events
 from services.question_analyzer.types import FinancialDataRequirement
 from services.search_decision_engine import SearchDecision
 from utils.conversation_format import format_conversation_context
@@ -69,8 +72,12 @@ def _select_grounding(
     return _NO_DATA_DECLINE
 
 
-def _collect_answer_chunks(chunks) -> list[str]:
-    return [chunk for chunk in chunks if isinstance(chunk, str)]
+async def _stream_text_chunks(chunks: Iterable[Any]) -> AsyncGenerator[str, None]:
+    """Text chunks of a sync model stream, read ahead on a stream worker so the event loop stays free."""
+    async with aclosing(_buffer_events(chunks)) as events:
+        async for chunk in events:
+            if isinstance(chunk, str):
+                yield chunk
 
 
 def _build_prompt_debug_event(
@@ -129,13 +136,15 @@ Do not add numbering.
         """.strip()
 
         agent = MultiAgent(model_name=preferred_model)
-        for question in agent.generate_content_by_lines(
-            prompt=prompt,
-            use_google_search=False,
-            max_lines=3,
-            min_line_length=10,
-            strip_numbering=True,
-            strip_markdown=True,
+        async for question in _stream_text_chunks(
+            agent.generate_content_by_lines(
+                prompt=prompt,
+                use_google_search=False,
+                max_lines=3,
+                min_line_length=10,
+                strip_numbering=True,
+                strip_markdown=True,
+            )
         ):
             yield {"type": "related_question", "body": question}
 
@@ -249,7 +258,7 @@ Use short paragraphs and bullet points for readability.
             )
 
         agent = MultiAgent(model_name=preferred_model)
-        for chunk in _collect_answer_chunks(agent.generate_content(prompt=prompt, use_google_search=False)):
+        async for chunk in _stream_text_chunks(agent.generate_content(prompt=prompt, use_google_search=False)):
             yield {"type": "answer", "body": chunk}
 
         if retrieved_sources and not is_url_grounded:
@@ -351,13 +360,15 @@ Do not add numbering.
         """.strip()
 
         agent = MultiAgent(model_name=preferred_model)
-        for question in agent.generate_content_by_lines(
-            prompt=prompt,
-            use_google_search=False,
-            max_lines=3,
-            min_line_length=10,
-            strip_numbering=True,
-            strip_markdown=True,
+        async for question in _stream_text_chunks(
+            agent.generate_content_by_lines(
+                prompt=prompt,
+                use_google_search=False,
+                max_lines=3,
+                min_line_length=10,
+                strip_numbering=True,
+                strip_markdown=True,
+            )
         ):
             yield {"type": "related_question", "body": question}
 
@@ -470,7 +481,7 @@ Keep the answer under 150 words. Break into short paragraphs.
             )
 
         agent = MultiAgent(model_name=preferred_model)
-        for chunk in _collect_answer_chunks(agent.generate_content(prompt=prompt, use_google_search=False)):
+        async for chunk in _stream_text_chunks(agent.generate_content(prompt=prompt, use_google_search=False)):
             yield {"type": "answer", "body": chunk}
 
         if retrieved_sources and not is_url_grounded:
@@ -504,13 +515,15 @@ Generate exactly 3 high-quality follow-up questions, one per line.
 Do not add numbering.
         """.strip()
         agent = MultiAgent(model_name=preferred_model)
-        for question in agent.generate_content_by_lines(
-            prompt=prompt,
-            use_google_search=False,
-            max_lines=3,
-            min_line_length=10,
-            strip_numbering=True,
-            strip_markdown=True,
+        async for question in _stream_text_chunks(
+            agent.generate_content_by_lines(
+                prompt=prompt,
+                use_google_search=False,
+                max_lines=3,
+                min_line_length=10,
+                strip_numbering=True,
+                strip_markdown=True,
+            )
         ):
             yield {"type": "related_question", "body": question}
 
@@ -535,9 +548,7 @@ IMPORTANT: Always respond in the same language as the CURRENT question above.
 Provide a helpful, general answer that builds on what we discussed before."""
 
         agent = MultiAgent(model_name=preferred_model)
-        for chunk in agent.generate_content(prompt=prompt, use_google_search=False):
-            if not isinstance(chunk, str):
-                continue
+        async for chunk in _stream_text_chunks(agent.generate_content(prompt=prompt, use_google_search=False)):
             yield {"type": "answer", "body": chunk}
         yield {"type": "model_used", "body": agent.model_name}
 
@@ -580,31 +591,49 @@ Provide a helpful, general answer that builds on what we discussed before."""
             total_steps=6,
         )
 
-        (
-            data_requirement,
-            period_requirement,
-            relevant_statements,
-        ) = await self.classifier.classify_data_and_period_requirement(
-            ticker_norm, question, available_metrics=available_metrics
-        )
-
-        if period_requirement is not None:
-            yield thinking_status(
-                f"Loading {ticker_norm.upper()} {period_requirement.period_type} financial reports...",
-                phase=AnalysisPhase.DATA_FETCH,
-                step=4,
-                total_steps=6,
+        # Fundamentals don't depend on the period, so fetch them while the classifier runs (mirrors v1);
+        # only BASIC uses them, so speculate only when keywords make BASIC likely
+        fundamentals_task = None
+        if _is_likely_basic_question(question):
+            fundamentals_task = asyncio.create_task(self.data_optimizer.fetch_fundamentals(ticker_norm))
+
+        try:
+            (
+                data_requirement,
+                period_requirement,
+                relevant_statements,
+            ) = await self.classifier.classify_data_and_period_requirement(
+                ticker_norm, question, available_metrics=available_metrics
             )
 
-        (
-            company_fundamental,
-            annual_statements,
-            quarterly_statements,
-        ) = await self.data_optimizer.fetch_optimized_data(
-            ticker=ticker_norm,
-            data_requirement=data_requirement,
-            period_requirement=period_requirement,
-        )
+            if period_requirement is not None:
+                yield thinking_status(
+                    f"Loading {ticker_norm.upper()} {period_requirement.period_type} financial reports...",
+                    phase=AnalysisPhase.DATA_FETCH,
+                    step=4,
+                    total_steps=6,
+                )
+
+            if fundamentals_task is None:
+                (
+                    company_fundamental,
+                    annual_statements,
+                    quarterly_statements,
+                ) = await self.data_optimizer.fetch_optimized_data(
+                    ticker=ticker_norm,
+                    data_requirement=data_requirement,
+                    period_requirement=period_requirement,
+                )
+            else:
+                annual_statements, quarterly_statements = await self.data_optimizer.fetch_statements(
+                    ticker_norm, data_requirement, period_requirement
+                )
+                company_fundamental = (
+                    await fundamentals_task if data_requirement == FinancialDataRequirement.BASIC else None
+                )
+        finally:
+            if fundamentals_task is not None:
+                fundamentals_task.cancel()
 
         if relevant_statements and data_requirement == FinancialDataRequirement.DETAILED:
             valid_types = set(FinancialStatementType)
@@ -780,7 +809,7 @@ Provide a helpful, general answer that builds on what we discussed before."""
             )
 
         agent = MultiAgent(model_name=preferred_model)
-        for chunk in _collect_answer_chunks(agent.generate_content(prompt=combined_prompt, use_google_search=False)):
+        async for chunk in _stream_text_chunks(agent.generate_content(prompt=combined_prompt, use_google_search=False)):
             yield {"type": "answer", "body": chunk}
 
         if retrieved_sources and not is_url_grounded:
@@ -0,0 +1,30 @@
+"""Structured-output schemas for classifier LLM responses."""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+
+class PeriodRequirementSchema(BaseModel):
+    period_type: Literal["annual", "quarterly", "both"] = "annual"
+    specific_years: list[int] | None = None
+    specific_quarters: list[str] | None = None
+    num_periods: int | None = None
+
+
+class DataAndPeriodSchema(BaseModel):
+    data_requirement: Literal["none", "basic", "detailed", "quarterly_summary", "annual_summary"]
+    period_requirement: PeriodRequirementSchema | None = None
+    relevant_statements: list[Literal["income_statement", "balance_sheet", "cash_flow"]] | None = None
+
+
+class CombinedClassificationSchema(DataAndPeriodSchema):
+    question_type: Literal["general-finance", "company-specific-finance", "company-general"]
+
+
+def json_schema_response_format(schema: type[BaseModel]) -> dict[str, Any]:
+    """Build an OpenAI-compatible response_format that asks the provider for JSON matching schema."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": schema.__name__, "schema": schema.model_json_schema()},
+    }
@@ -0,0 +1,98 @@
+"""In-process embedding-similarity cache for coarse classifier labels."""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from connectors.semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticClassificationCache:
+    """
+    Reuse classifier labels across paraphrased questions ("What's Apple's revenue?" vs "Show Apple revenue").
+
+    Entries are partitioned by (method, ticker) and searched by cosine similarity over unit-normalized
+    question embeddings. Both the entries per partition and the number of partitions are capped, since tickers
+    come from requests and each full partition holds ~1.5 MB of embeddings. Only use this for coarse labels — anything carrying specific periods or tickers
+    would be wrong for a near-duplicate question.
+    """
+
+    DEFAULT_THRESHOLD = 0.92
+    MAX_ENTRIES_PER_PARTITION = 256
+    MAX_PARTITIONS = 128
+
+    def __init__(
+        self,
+        embedder: Optional[SemanticCache] = None,
+        thresholds: Optional[Dict[str, float]] = None,
+        max_entries_per_partition: int = MAX_ENTRIES_PER_PARTITION,
+        max_partitions: int = MAX_PARTITIONS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            embedder: Embedding provider (reuses the answer cache's OpenAI embeddings by default)
+            thresholds: Optional per-method cosine similarity thresholds
+            max_entries_per_partition: Oldest entries are dropped beyond this many per (method, ticker)
+            max_partitions: Least recently used (method, ticker) partitions are dropped beyond this many
+        """
+        self.embedder = embedder or SemanticCache()
+        self.thresholds = thresholds or {}
+        self.max_entries_per_partition = max_entries_per_partition
+        self.max_partitions = max_partitions
+        self._partitions: OrderedDict[Tuple[str, str], Deque[Tuple[np.ndarray, Any]]] = OrderedDict()
+
+    async def lookup(self, method: str, ticker: str, question: str) -> Tuple[Optional[Any], Optional[np.ndarray]]:
+        """
+        Find the label of the most similar cached question.
+
+        Returns:
+            Tuple of (cached label or None, question embedding or None if embedding failed).
+            Pass the embedding back to store() on a miss to avoid embedding twice.
+        """
+        # Embed the question exactly as the answer cache does, so both share the embedder's memo
+        try:
+            raw = await asyncio.to_thread(self.embedder.embed, question)
+        except Exception as e:
+            logger.warning(f"Semantic classification cache embedding failed: {e}")
+            return None, None
+
+        embedding = np.asarray(raw, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        if norm == 0:
+            return None, None
+        embedding /= norm
+
+        key = (method, (ticker or "").lower())
+        entries = self._partitions.get(key)
+        if not entries:
+            return None, embedding
+        self._partitions.move_to_end(key)
+
+        similarities = np.stack([vector for vector, _ in entries]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.thresholds.get(method, self.DEFAULT_THRESHOLD):
+            return None, embedding
+
+        logger.info(f"Semantic classification cache hit for {method} (similarity={similarities[best]:.4f})")
+        return entries[best][1], embedding
+
+    def store(self, method: str, ticker: str, embedding: Optional[np.ndarray], value: Any) -> None:
+        """Remember a label for the question that produced embedding."""
+        if embedding is None:
+            return
+        key = (method, (ticker or "").lower())
+        entries = self._partitions.get(key)
+        if entries is None:
+            entries = self._partitions[key] = deque(maxlen=self.max_entries_per_partition)
+            if len(self._partitions) > self.max_partitions:
+                self._partitions.popitem(last=False)
+        else:
+            self._partitions.move_to_end(key)
+        entries.append((embedding, value))
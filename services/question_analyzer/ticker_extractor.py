@@ -6,9 +6,10 @@ import re
 import time
 from typing import Optional
 
-from agent.multi_agent import MultiAgent
+from agent.multi_agent import _join_text_chunks, get_multi_agent
 from ai_models.model_name import ModelName
 from connectors.company import CompanyConnector
+from services.shared.json_utils import read_json_object
 
 from .context_builders.components import PromptComponents
 
@@ -73,31 +74,10 @@ _COMPARISON_PATTERN = re.compile(
     re.IGNORECASE | re.VERBOSE,
 )
 
+# Ticker-shaped token: 1-5 uppercase letters/digits starting with a letter
+_TICKER_TOKEN_PATTERN = re.compile(r"\b[A-Z][A-Z0-9]{0,4}\b")
 
-def _has_comparison_signals(question: str) -> bool:
-    """Fast check: does the question contain comparison language or multiple ticker-like tokens?"""
-    if _COMPARISON_PATTERN.search(question):
-        return True
-    # Multiple uppercase ticker-like tokens (e.g. "AAPL MSFT revenue")
-    ticker_like = re.findall(r"\b[A-Z][A-Z0-9]{0,4}\b", question)
-    ticker_like = [t for t in ticker_like if t not in TICKER_STOPWORDS]
-    return len(ticker_like) >= 2
-
-
-class StockTickerExtractor:
-    """Extract 2-4 stock tickers from comparison questions using hybrid approach."""
-
-    def __init__(self):
-        self.connector = CompanyConnector()
-        self.agent = MultiAgent(model_name=ModelName.Gemini31FlashLite)
-
-    async def _preprocess_question_with_context(self, question: str, current_ticker: str) -> str:
-        """
-        Use AI to resolve contextual references in the question.
-
-        Handles: "this stock", "this company", "this one", "it" → current ticker
-        """
-        prompt = f"""{PromptComponents.current_date()}
+_CONTEXT_REWRITE_PROMPT_TEMPLATE = """{current_date}
 
 You are helping resolve contextual references in stock comparison questions.
 
@@ -125,12 +105,55 @@ Output: "Compare AAPL vs MSFT"
 
 Return ONLY the rewritten question, no explanation."""
 
-        try:
-            response = ""
-            for chunk in self.agent.generate_content(prompt):
-                response += chunk
+_TICKER_EXTRACTION_PROMPT_TEMPLATE = """{current_date}
+
+Extract stock ticker symbols from this comparison question.
+
+Question: "{question}"
+
+Return a JSON object with a "tickers" array of 2-4 stock ticker symbols.
+- Prefer the official ticker symbol (e.g. "AAPL" not "Apple", "MSFT" not "Microsoft")
+- For non-US companies, use their most widely known ticker (e.g. "SSNLF" for Samsung, "XIACY" for Xiaomi)
+- Only extract if the question is comparing companies — otherwise return empty array
+- Return only the JSON object, no other text
 
-            rewritten = response.strip()
+Examples:
+- "Compare AAPL vs MSFT" → {{"tickers": ["AAPL", "MSFT"]}}
+- "Apple vs Microsoft margins" → {{"tickers": ["AAPL", "MSFT"]}}
+- "Compare Apple and Samsung profit" → {{"tickers": ["AAPL", "SSNLF"]}}
+- "compare apple vs xiaomi" → {{"tickers": ["AAPL", "XIACY"]}}
+- "What is Apple's revenue?" → {{"tickers": []}}"""
+
+
+def _has_comparison_signals(question: str) -> bool:
+    """Fast check: does the question contain comparison language or multiple ticker-like tokens?"""
+    if _COMPARISON_PATTERN.search(question):
+        return True
+    # Multiple uppercase ticker-like tokens (e.g. "AAPL MSFT revenue")
+    ticker_like = _TICKER_TOKEN_PATTERN.findall(question)
+    ticker_like = [t for t in ticker_like if t not in TICKER_STOPWORDS]
+    return len(ticker_like) >= 2
+
+
+class StockTickerExtractor:
+    """Extract 2-4 stock tickers from comparison questions using hybrid approach."""
+
+    def __init__(self):
+        self.connector = CompanyConnector()
+        self.agent = get_multi_agent(ModelName.Gemini31FlashLite)
+
+    async def _preprocess_question_with_context(self, question: str, current_ticker: str) -> str:
+        """
+        Use AI to resolve contextual references in the question.
+
+        Handles: "this stock", "this company", "this one", "it" → current ticker
+        """
+        prompt = _CONTEXT_REWRITE_PROMPT_TEMPLATE.format(
+            current_date=PromptComponents.current_date(), question=question, current_ticker=current_ticker
+        )
+
+        try:
+            rewritten = _join_text_chunks(self.agent.generate_content(prompt)).strip()
             return rewritten if rewritten else question
 
         except Exception as e:
@@ -192,8 +215,7 @@ Return ONLY the rewritten question, no explanation."""
         Returns:
             List of validated tickers found in question
         """
-        pattern = r"\b[A-Z][A-Z0-9]{0,4}\b"
-        potential_tickers = re.findall(pattern, question)
+        potential_tickers = _TICKER_TOKEN_PATTERN.findall(question)
 
         # Filter stopwords and validate against database
         valid_tickers = []
@@ -218,32 +240,12 @@ Return ONLY the rewritten question, no explanation."""
         - "How does Nvidia compare to AMD?"
         - Mixed: "Compare AAPL to Microsoft"
         """
-        prompt = f"""{PromptComponents.current_date()}
-
-Extract stock ticker symbols from this comparison question.
-
-Question: "{question}"
-
-Return a JSON object with a "tickers" array of 2-4 stock ticker symbols.
-- Prefer the official ticker symbol (e.g. "AAPL" not "Apple", "MSFT" not "Microsoft")
-- For non-US companies, use their most widely known ticker (e.g. "SSNLF" for Samsung, "XIACY" for Xiaomi)
-- Only extract if the question is comparing companies — otherwise return empty array
-- Return only the JSON object, no other text
-
-Examples:
-- "Compare AAPL vs MSFT" → {{"tickers": ["AAPL", "MSFT"]}}
-- "Apple vs Microsoft margins" → {{"tickers": ["AAPL", "MSFT"]}}
-- "Compare Apple and Samsung profit" → {{"tickers": ["AAPL", "SSNLF"]}}
-- "compare apple vs xiaomi" → {{"tickers": ["AAPL", "XIACY"]}}
-- "What is Apple's revenue?" → {{"tickers": []}}"""
+        prompt = _TICKER_EXTRACTION_PROMPT_TEMPLATE.format(
+            current_date=PromptComponents.current_date(), question=question
+        )
 
         try:
-            response = ""
-            for chunk in self.agent.generate_content(prompt):
-                if isinstance(chunk, str):
-                    response += chunk
-
-            response = response.strip()
+            response = read_json_object(self.agent.generate_content(prompt)).strip()
             if response.startswith("```"):
                 response = response.split("```")[1]
                 if response.startswith("json"):
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from enum import Enum, StrEnum
 from typing import List, Optional
 
+from core.financial_statement_type import FinancialStatementType
 from services.analysis_progress import AnalysisPhase, thinking_status  # noqa: F401
 
 
@@ -37,6 +38,17 @@ class FinancialPeriodRequirement:
     num_periods: Optional[int] = None  # Number of recent periods
 
 
+@dataclass(frozen=True)
+class QuestionClassification:
+    """Combined result of question-type and data/period classification."""
+
+    question_type: Optional[str]  # QuestionType value, None when classification failed
+    comparison_tickers: Optional[List[str]]
+    data_requirement: FinancialDataRequirement
+    period_requirement: Optional[FinancialPeriodRequirement]
+    relevant_statements: Optional[List[FinancialStatementType]]
+
+
 @dataclass(frozen=True)
 class AnalysisChunk:
     """A chunk of analysis response."""
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import datetime
-import json
 import logging
 import os
 import re
@@ -31,12 +30,16 @@ from services.analyze_retrieval.schemas import AnalyzePassage, AnalyzeSource
 from services.analyze_retrieval.source_policy import Market, is_trusted
 from services.market_recap.url_utils import source_id_for
 from services.recap_query_reformulator import RecapQueryReformulator
+from services.shared.json_utils import first_json_object
 from utils.visual_stream import VisualAnswerStreamSplitter
 
 logger = logging.getLogger(__name__)
 
 RecapRoute = Literal["recap_related", "market_search", "unrelated_nonfinance"]
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_AFTER_RECAP_RE = re.compile(r"\b(after|since|following|changed|new|latest|update|updated)\b", re.IGNORECASE)
+
 
 @dataclass(frozen=True)
 class RecapRelevanceDecision:
@@ -49,17 +52,11 @@ def recap_conversation_scope(recap_id: int) -> str:
 
 
 def _clean_whitespace(value: str) -> str:
-    return re.sub(r"\s+", " ", value).strip()
+    return _WHITESPACE_RE.sub(" ", value).strip()
 
 
 def _json_block(text: str) -> dict[str, Any]:
-    match = re.search(r"\{.*\}", text, re.DOTALL)
-    if not match:
-        raise ValueError("No JSON object found")
-    parsed = json.loads(match.group(0))
-    if not isinstance(parsed, dict):
-        raise ValueError("JSON block is not an object")
-    return parsed
+    return first_json_object(text)
 
 
 def _market_for_recap(recap: MarketRecapDto) -> Market:
@@ -150,7 +147,7 @@ def _format_conversation(messages: list[dict[str, str]] | None) -> str:
 
 
 def _asks_after_recap(question: str) -> bool:
-    return bool(re.search(r"\b(after|since|following|changed|new|latest|update|updated)\b", question, re.IGNORECASE))
+    return bool(_AFTER_RECAP_RE.search(question))
 
 
 def _filter_post_recap_sources(
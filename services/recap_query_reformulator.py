@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-import json
 import logging
-import re
 from dataclasses import dataclass
 from datetime import date
 from typing import Callable, Optional
@@ -12,10 +10,10 @@ from langfuse import observe
 from agent.multi_agent import MultiAgent
 from ai_models.model_name import ModelName
 from services.question_analyzer.context_builders.components import PromptComponents
+from services.shared.json_utils import first_json_object, read_json_object
 
 logger = logging.getLogger(__name__)
 
-_JSON_BLOCK_RE = re.compile(r"\{.*\}", re.DOTALL)
 
 _MAX_QUERIES = 3
 
@@ -117,15 +115,12 @@ class RecapQueryReformulator:
         )
         agent = MultiAgent(model_name=self.model_name)
         chunks = agent.generate_content(prompt=prompt, use_google_search=False)
-        text = "".join(chunk for chunk in chunks if isinstance(chunk, str))
-        return text.strip()
+        # Only the first JSON object is parsed, so stop reading (and close the stream) once it is complete
+        return read_json_object(chunks).strip()
 
     @staticmethod
     def _parse_queries(raw: str) -> dict:
-        match = _JSON_BLOCK_RE.search(raw)
-        if not match:
-            raise ValueError("No JSON object in classifier output")
-        obj = json.loads(match.group(0))
+        obj = first_json_object(raw)
 
         queries = obj.get("queries")
         if not isinstance(queries, list) or not queries:
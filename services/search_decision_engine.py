@@ -1,23 +1,22 @@
 """LLM-based Google Search decision engine."""
 
 import asyncio
-import json
 import logging
 import re
 from dataclasses import dataclass
 from typing import Callable, Optional
 
 from langfuse import observe
+from pydantic import BaseModel, Field, StrictBool, StrictFloat, StrictStr, ValidationError
 
 from agent.multi_agent import MultiAgent
 from ai_models.model_name import ModelName
 from ai_models.openrouter_client import get_openrouter_model_name
 from services.question_analyzer.context_builders.components import PromptComponents
+from services.shared.json_utils import first_json_object, read_json_object
 
 logger = logging.getLogger(__name__)
 
-_JSON_BLOCK_RE = re.compile(r"\{.*\}", re.DOTALL)
-
 # Patterns for historical/static company facts that never need search
 _STATIC_FACT_PATTERNS = [
     re.compile(r"\b(who|whom)\b.*(found|establish|start|creat|incorporat)", re.IGNORECASE),
@@ -29,6 +28,41 @@ _STATIC_FACT_PATTERNS = [
 ]
 
 
+# Constant tail of the classifier prompt; hoisted so each decision only formats the per-question header
+_DECISION_RULES = """Rules:
+- Return false for well-known historical facts about companies: founding date, founders, company origin, headquarters location, name etymology, IPO date, historical milestones — these don't change and are reliably in training data.
+- Return false for stable educational concepts and timeless explanations.
+- Return false when the database already has financial data covering the requested periods.
+- Return true for time-sensitive asks: latest/current/today/now/news/recent/events/regulatory changes/price-now/real-time/current CEO/current leadership.
+- If unsure, prefer true.
+- Output ONLY JSON (no markdown) with exact keys:
+  - use_google_search (boolean)
+  - reason_code (string snake_case)
+  - confidence (float between 0 and 1)
+
+Examples:
+- "Who founded Nike?" -> {"use_google_search": false, "reason_code": "stable_concept", "confidence": 0.95}
+- "When was Apple established?" -> {"use_google_search": false, "reason_code": "stable_concept", "confidence": 0.95}
+- "What is Tesla's IPO date?" -> {"use_google_search": false, "reason_code": "stable_concept", "confidence": 0.9}
+- "Where is Microsoft headquartered?" -> {"use_google_search": false, "reason_code": "stable_concept", "confidence": 0.95}
+- "Who is the current CEO of Nike?" -> {"use_google_search": true, "reason_code": "time_sensitive", "confidence": 0.85}
+- "What is Nike's latest earnings?" -> {"use_google_search": true, "reason_code": "latest_info", "confidence": 0.95}
+- "What is FORTUM.HE's dividend per share?" (DB has revenue, net income but NOT dividend per share) -> {"use_google_search": true, "reason_code": "db_metric_missing", "confidence": 0.9}
+
+Allowed reason_code values:
+time_sensitive, latest_info, stable_concept, db_data_sufficient, db_metric_missing, ambiguous_default_on, other
+"""
+
+_DB_COVERAGE_INSTRUCTION = "\nIMPORTANT: If the question asks about financial metrics (revenue, profit, earnings, etc.) for periods covered by the database, return false — database data is sufficient. Only return true when the question needs information the database CANNOT provide (e.g., news, real-time price, regulatory changes, events, analyst opinions)."
+_DB_METRICS_INSTRUCTION = "\nIMPORTANT: The database ONLY contains the metrics listed above. If the question asks about a metric NOT in the available metrics list (e.g., dividend per share, buyback amount, insider ownership), return true — the database does NOT have that data and web search is needed.\nIf the question asks about metrics that ARE in the list for periods covered by the database, return false — database data is sufficient."
+
+
+class _DecisionSchema(BaseModel):
+    use_google_search: StrictBool
+    reason_code: StrictStr = Field(pattern=r"\S")
+    confidence: StrictFloat = 0.0
+
+
 @dataclass(frozen=True)
 class SearchDecision:
     use_google_search: bool
@@ -100,10 +134,10 @@ class SearchDecisionEngine:
             return decision
 
         try:
-            raw = await asyncio.wait_for(
-                asyncio.to_thread(self._classify_sync, question, ticker, is_etf, available_periods, available_metrics),
-                timeout=self.timeout_seconds,
-            )
+            async with asyncio.timeout(self.timeout_seconds):
+                raw = await asyncio.to_thread(
+                    self._classify_sync, question, ticker, is_etf, available_periods, available_metrics
+                )
             parsed = self._parse_decision(raw)
             decision = SearchDecision(
                 use_google_search=parsed["use_google_search"],
@@ -155,10 +189,10 @@ class SearchDecisionEngine:
             annual = available_periods.get("annual", [])
             quarterly = available_periods.get("quarterly", [])
             metrics_line = ""
-            metrics_instruction = "\nIMPORTANT: If the question asks about financial metrics (revenue, profit, earnings, etc.) for periods covered by the database, return false — database data is sufficient. Only return true when the question needs information the database CANNOT provide (e.g., news, real-time price, regulatory changes, events, analyst opinions)."
+            metrics_instruction = _DB_COVERAGE_INSTRUCTION
             if available_metrics:
                 metrics_line = f"\n- Available metrics: {', '.join(available_metrics)}"
-                metrics_instruction = "\nIMPORTANT: The database ONLY contains the metrics listed above. If the question asks about a metric NOT in the available metrics list (e.g., dividend per share, buyback amount, insider ownership), return true — the database does NOT have that data and web search is needed.\nIf the question asks about metrics that ARE in the list for periods covered by the database, return false — database data is sufficient."
+                metrics_instruction = _DB_METRICS_INSTRUCTION
             db_context = f"""
 Financial data already available in our database for {ticker}:
 - Annual statements: {annual if annual else "none"}
@@ -175,56 +209,22 @@ Question: {question}
 Ticker context: {ticker or "none"}
 Is ETF flow: {str(is_etf).lower()}
 {db_context}
-Rules:
-- Return false for well-known historical facts about companies: founding date, founders, company origin, headquarters location, name etymology, IPO date, historical milestones — these don't change and are reliably in training data.
-- Return false for stable educational concepts and timeless explanations.
-- Return false when the database already has financial data covering the requested periods.
-- Return true for time-sensitive asks: latest/current/today/now/news/recent/events/regulatory changes/price-now/real-time/current CEO/current leadership.
-- If unsure, prefer true.
-- Output ONLY JSON (no markdown) with exact keys:
-  - use_google_search (boolean)
-  - reason_code (string snake_case)
-  - confidence (float between 0 and 1)
-
-Examples:
-- "Who founded Nike?" -> {{"use_google_search": false, "reason_code": "stable_concept", "confidence": 0.95}}
-- "When was Apple established?" -> {{"use_google_search": false, "reason_code": "stable_concept", "confidence": 0.95}}
-- "What is Tesla's IPO date?" -> {{"use_google_search": false, "reason_code": "stable_concept", "confidence": 0.9}}
-- "Where is Microsoft headquartered?" -> {{"use_google_search": false, "reason_code": "stable_concept", "confidence": 0.95}}
-- "Who is the current CEO of Nike?" -> {{"use_google_search": true, "reason_code": "time_sensitive", "confidence": 0.85}}
-- "What is Nike's latest earnings?" -> {{"use_google_search": true, "reason_code": "latest_info", "confidence": 0.95}}
-- "What is FORTUM.HE's dividend per share?" (DB has revenue, net income but NOT dividend per share) -> {{"use_google_search": true, "reason_code": "db_metric_missing", "confidence": 0.9}}
-
-Allowed reason_code values:
-time_sensitive, latest_info, stable_concept, db_data_sufficient, db_metric_missing, ambiguous_default_on, other
-"""
+{_DECISION_RULES}"""
         agent = MultiAgent(model_name=self.model_name)
         chunks = agent.generate_content(prompt=prompt, use_google_search=False)
-        text = "".join(chunk for chunk in chunks if isinstance(chunk, str))
-        return text.strip()
+        # Only the first JSON object is parsed, so stop reading (and close the stream) once it is complete
+        return read_json_object(chunks).strip()
 
     @staticmethod
     def _parse_decision(raw: str) -> dict:
-        match = _JSON_BLOCK_RE.search(raw)
-        if not match:
-            raise ValueError("No JSON object in classifier output")
-        obj = json.loads(match.group(0))
-
-        if not isinstance(obj.get("use_google_search"), bool):
-            raise ValueError("Invalid use_google_search")
-        reason_code = obj.get("reason_code")
-        if not isinstance(reason_code, str) or not reason_code.strip():
-            raise ValueError("Invalid reason_code")
-
-        confidence = obj.get("confidence", 0.0)
-        if isinstance(confidence, int):
-            confidence = float(confidence)
-        if not isinstance(confidence, float):
-            raise ValueError("Invalid confidence type")
-        confidence = max(0.0, min(1.0, confidence))
+        # Bare JSON parses and validates in a single pass; only wrapped output needs the object scan
+        try:
+            decision = _DecisionSchema.model_validate_json(raw)
+        except ValidationError:
+            decision = _DecisionSchema.model_validate(first_json_object(raw))
 
         return {
-            "use_google_search": obj["use_google_search"],
-            "reason_code": reason_code.strip(),
-            "confidence": confidence,
+            "use_google_search": decision.use_google_search,
+            "reason_code": decision.reason_code.strip(),
+            "confidence": max(0.0, min(1.0, decision.confidence)),
         }
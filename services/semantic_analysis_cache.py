@@ -37,30 +37,7 @@ _URL_GROUNDED_REPORT_TERMS = (
 
 def _legacy_related_prompt(original_question: str) -> str:
     """Same shape as BaseQuestionHandler._generate_related_questions for non-ETF flows."""
-    return f"""
-                {PromptComponents.current_date()}
-
-                Based on this original question: "{original_question}"
-
-                Generate exactly 3 high-quality follow-up questions that a curious investor might naturally ask next.
-
-                Requirements:
-                - Each question should explore a DIFFERENT dimension:
-                * Question 1: Go deeper into the same topic (more specific/detailed)
-                * Question 2: Compare or contrast with a related concept, company, or time period
-                * Question 3: Explore a related but adjacent topic (e.g., if original was about revenue, ask about profitability or cash flow)
-                - Keep questions between 8-15 words
-                - Make them actionable and specific (avoid vague questions like "What else should I know?")
-                - Frame questions naturally, as a user would ask them
-                - Ensure questions are relevant to the original context (financial analysis, company performance, market trends)
-                - Do NOT number the questions or add any prefixes
-                - Put EACH question on its OWN LINE
-
-                Output format (one question per line):
-                How does Apple's gross margin compare to its competitors?
-                What was the main driver behind revenue growth last quarter?
-                Is the current valuation sustainable given industry trends?
-            """
+    return PromptComponents.related_questions(original_question)
 
 
 def _resolve_model_for_related(stored: str | None) -> ModelName:
@@ -0,0 +1,82 @@
+"""Shared JSON helpers for LLM responses, prompt data and streamed analyze events."""
+
+import json
+from typing import Any, Iterable
+
+# orjson serializes the per-chunk stream events several times faster than stdlib json. It is optional
+# (see connectors.cache); stdlib json produces equivalent frames.
+try:
+    import orjson as _fast_json
+except ImportError:
+    _fast_json = None
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def first_json_object(text: str) -> dict:
+    """Decode the JSON object that starts at the first "{" in text.
+
+    One pass that stops at the object's closing brace, so markdown fences and trailing prose around it
+    are ignored (a greedy DOTALL {.*} match has to reach the last brace in the text instead).
+
+    Raises:
+        ValueError: If text contains no "{" or the object is not valid JSON
+    """
+    start = text.find("{")
+    if start == -1:
+        raise ValueError("No JSON object found")
+    parsed, _ = _JSON_DECODER.raw_decode(text, start)
+    return parsed
+
+
+def read_json_object(chunks: Iterable) -> str:
+    """
+    Accumulate streamed text until the first top-level JSON object closes.
+
+    Anything the model emits after the object (closing fence, commentary) is not waited for,
+    and the stream is closed as soon as the object is complete.
+    """
+    parts: list[str] = []
+    depth = 0
+    in_string = escaped = False
+    try:
+        for chunk in chunks:
+            if not isinstance(chunk, str):
+                continue
+            for i, char in enumerate(chunk):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == "\\":
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = depth > 0
+                elif char == "{":
+                    depth += 1
+                elif char == "}" and depth > 0:
+                    depth -= 1
+                    if depth == 0:
+                        parts.append(chunk[: i + 1])
+                        return "".join(parts)
+            parts.append(chunk)
+        return "".join(parts)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def compact_json(value: Any) -> str:
+    """Compact JSON text for embedding data in a prompt; values JSON can't encode fall back to str()."""
+    if _fast_json:
+        return _fast_json.dumps(value, default=str).decode("utf-8")
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_stream_event(event: dict) -> bytes:
+    """Frame one analyze stream event as UTF-8 JSON followed by the blank-line separator."""
+    if _fast_json:
+        return _fast_json.dumps(event) + b"\n\n"
+    return (json.dumps(event) + "\n\n").encode("utf-8")
@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+
+from connectors.company_financial import CompanyFinancialConnector
+from models.company_financial_statement import CompanyFinancialStatement
+
+
+def _statement(year):
+    return CompanyFinancialStatement(
+        company_symbol="AAPL",
+        period_end_year=year,
+        created_at=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        income_statement={"Total Revenue": 100},
+    )
+
+
+def test_to_dicts_matches_per_item_conversion():
+    statements = [_statement(2024), _statement(2025)]
+
+    assert CompanyFinancialConnector.to_dicts(statements) == [
+        CompanyFinancialConnector.to_dict(statement) for statement in statements
+    ]
+    assert CompanyFinancialConnector.to_dicts(statements)[0]["created_at"] == "2025-01-02T00:00:00+00:00"
+
+
+def test_to_dicts_of_empty_batch():
+    assert CompanyFinancialConnector.to_dicts([]) == []
@@ -27,6 +27,12 @@ class TestParseQueries:
 
         assert parsed["queries"] == ["AAPL revenue breakdown Q2 2026"]
 
+    def test_trailing_prose_with_braces_is_ignored(self):
+        raw = '{"queries": ["AAPL services revenue 2026"], "reasoning": "ok"}\nNote: swap {ticker} if needed.'
+        parsed = QueryReformulator._parse_queries(raw)
+
+        assert parsed["queries"] == ["AAPL services revenue 2026"]
+
     def test_missing_queries_key_raises(self):
         raw = '{"search_terms": ["something"], "reasoning": "bad"}'
         with pytest.raises(ValueError, match="queries"):
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.question_analyzer.company_specific_finance_handler import (
+    _ANSWER_SYSTEM_PROMPT,
+    _CONVERSATION_FALLBACK_SYSTEM_PROMPT,
+    CompanySpecificFinanceHandler,
+    _financial_context_trace_fields,
+)
+from services.question_analyzer.types import FinancialDataRequirement
+
+
+async def _fake_related(*args, **kwargs):
+    return
+    yield
+
+
+def _make_handler(data_requirement):
+    classifier = MagicMock()
+    classifier.classify_data_and_period_requirement = AsyncMock(return_value=(data_requirement, None, None))
+    optimizer = MagicMock()
+    optimizer.fetch_fundamentals = AsyncMock(return_value={"Name": "Apple Inc."})
+    optimizer.fetch_statements = AsyncMock(return_value=([], []))
+    optimizer.fetch_optimized_data = AsyncMock(return_value=(None, [], []))
+    handler = CompanySpecificFinanceHandler(
+        agent=MagicMock(), company_connector=MagicMock(), data_optimizer=optimizer, classifier=classifier
+    )
+    handler._generate_related_questions = _fake_related  # type: ignore[attr-defined]
+    return handler, optimizer
+
+
+@pytest.mark.asyncio
+@patch("services.question_analyzer.company_specific_finance_handler.cache")
+@patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+async def test_basic_question_uses_fundamentals_fetched_during_classification(mock_agent_class, mock_cache):
+    mock_agent_class.return_value.model_name = "test-model"
+    mock_agent_class.return_value.generate_content.return_value = iter(["Apple's P/E is 30."])
+    mock_cache.get_json.return_value = None
+    handler, optimizer = _make_handler(FinancialDataRequirement.BASIC)
+
+    _ = [event async for event in handler.handle("aapl", "What is Apple's P/E ratio?", False, False)]
+
+    optimizer.fetch_fundamentals.assert_awaited_once_with("aapl")
+    optimizer.fetch_statements.assert_awaited_once()
+    optimizer.fetch_optimized_data.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("services.question_analyzer.company_specific_finance_handler.cache")
+@patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+async def test_filing_summary_question_skips_speculative_fundamentals(mock_agent_class, mock_cache):
+    mock_agent_class.return_value.model_name = "test-model"
+    mock_agent_class.return_value.generate_content.return_value = iter(["Summary."])
+    handler, optimizer = _make_handler(FinancialDataRequirement.ANNUAL_SUMMARY)
+
+    _ = [event async for event in handler.handle("aapl", "Summarize Apple's latest 10-K", False, False)]
+
+    optimizer.fetch_fundamentals.assert_not_called()
+    optimizer.fetch_optimized_data.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("services.question_analyzer.company_specific_finance_handler.cache")
+@patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+async def test_question_without_basic_hint_skips_speculative_fundamentals(mock_agent_class, mock_cache):
+    mock_agent_class.return_value.model_name = "test-model"
+    mock_agent_class.return_value.generate_content.return_value = iter(["Revenue grew."])
+    mock_cache.get_json.return_value = None
+    handler, optimizer = _make_handler(FinancialDataRequirement.DETAILED)
+
+    _ = [event async for event in handler.handle("aapl", "How has Apple's revenue grown since 2020?", False, False)]
+
+    optimizer.fetch_fundamentals.assert_not_called()
+    optimizer.fetch_optimized_data.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("services.question_analyzer.company_specific_finance_handler.cache")
+@patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+async def test_streams_every_chunk_after_the_first(mock_agent_class, mock_cache):
+    mock_agent_class.return_value.model_name = "test-model"
+    mock_agent_class.return_value.generate_content.return_value = iter(["Apple's ", "P/E ", "is 30."])
+    mock_cache.get_json.return_value = None
+    handler, _ = _make_handler(FinancialDataRequirement.BASIC)
+
+    events = [event async for event in handler.handle("aapl", "What is Apple's P/E ratio?", False, False)]
+
+    assert "".join(e["body"] for e in events if e["type"] == "answer") == "Apple's P/E is 30."
+    _, value, _ = mock_cache.set_json.call_args.args
+    assert "".join(e["body"] for e in value["events"] if e["type"] == "answer") == "Apple's P/E is 30."
+
+
+@pytest.mark.asyncio
+@patch("services.question_analyzer.company_specific_finance_handler.cache")
+@patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+async def test_static_instructions_are_sent_as_system_prompt(mock_agent_class, mock_cache):
+    mock_agent_class.return_value.model_name = "test-model"
+    mock_agent_class.return_value.generate_content.return_value = iter(["Apple's P/E is 30."])
+    mock_cache.get_json.return_value = None
+    handler, _ = _make_handler(FinancialDataRequirement.BASIC)
+
+    _ = [event async for event in handler.handle("aapl", "What is Apple's P/E ratio?", False, False)]
+
+    kwargs = mock_agent_class.return_value.generate_content.call_args.kwargs
+    assert kwargs["system_prompt"] == _ANSWER_SYSTEM_PROMPT
+    assert "What is Apple's P/E ratio?" in kwargs["prompt"]
+    assert _ANSWER_SYSTEM_PROMPT not in kwargs["prompt"]
+
+
+def test_trace_fields_fingerprint_context_instead_of_embedding_it():
+    with patch("services.question_analyzer.company_specific_finance_handler.random.random", return_value=0.5):
+        fields = _financial_context_trace_fields("Revenue: 100")
+
+    assert "financial_context" not in fields
+    assert fields["financial_context_chars"] == 12
+    assert len(fields["financial_context_sha256"]) == 16
+
+
+def test_sampled_trace_fields_keep_full_context():
+    with patch("services.question_analyzer.company_specific_finance_handler.random.random", return_value=0.0):
+        fields = _financial_context_trace_fields("Revenue: 100")
+
+    assert fields["financial_context"] == "Revenue: 100"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_stream_cancels_background_tasks():
+    handler, optimizer = _make_handler(FinancialDataRequirement.BASIC)
+    classifier_waiting = asyncio.Event()
+
+    async def slow_classifier(*args, **kwargs):
+        classifier_waiting.set()
+        await asyncio.sleep(60)
+
+    async def slow_fundamentals(ticker):
+        await asyncio.sleep(60)
+
+    handler.classifier.classify_data_and_period_requirement = slow_classifier
+    optimizer.fetch_fundamentals = slow_fundamentals
+    related_task = asyncio.create_task(asyncio.sleep(60))
+    handler._prefetch_related_questions = MagicMock(return_value=related_task)  # type: ignore[method-assign]
+    created_tasks = []
+    original_create_task = asyncio.create_task
+
+    def tracking_create_task(coro):
+        task = original_create_task(coro)
+        created_tasks.append(task)
+        return task
+
+    async def consume():
+        async for _ in handler.handle("aapl", "What is Apple's P/E ratio?", False, False):
+            pass
+
+    with patch("services.question_analyzer.company_specific_finance_handler.asyncio.create_task", tracking_create_task):
+        consumer = original_create_task(consume())
+        await classifier_waiting.wait()
+        consumer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+    await asyncio.sleep(0)
+
+    assert related_task.cancelled()
+    assert [task.cancelled() for task in created_tasks] == [True]
+
+
+@pytest.mark.asyncio
+@patch("services.question_analyzer.handlers.cache")
+@patch("services.question_analyzer.handlers.get_multi_agent")
+async def test_aborted_request_aborts_related_questions_generation(mock_related_agent, mock_related_cache):
+    mock_related_cache.get_json.return_value = None
+    handler, _ = _make_handler(FinancialDataRequirement.BASIC)
+    del handler._generate_related_questions
+    generating = asyncio.Event()
+    aborted = asyncio.Event()
+
+    async def slow_generation(**kwargs):
+        generating.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            aborted.set()
+            raise
+
+    async def slow_classifier(*args, **kwargs):
+        await asyncio.sleep(60)
+
+    mock_related_agent.return_value.agenerate_content_by_lines = slow_generation
+    handler.classifier.classify_data_and_period_requirement = slow_classifier
+
+    async def consume():
+        async for _ in handler.handle("aapl", "What is Apple's P/E ratio?", False, False):
+            pass
+
+    consumer = asyncio.create_task(consume())
+    await generating.wait()
+    consumer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await consumer
+
+    await asyncio.wait_for(aborted.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+@patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+async def test_conversation_fallback_sends_static_instructions_as_system_prompt(mock_agent_class):
+    mock_agent_class.return_value.model_name = "test-model"
+    mock_agent_class.return_value.generate_content.return_value = iter(["Diversify."])
+    handler, _ = _make_handler(FinancialDataRequirement.BASIC)
+    conversation = [{"role": "user", "content": "Tell me about Apple"}, {"role": "assistant", "content": "Apple..."}]
+
+    events = [
+        event
+        async for event in handler.handle(
+            "", "How should I size the position?", False, False, conversation_messages=conversation
+        )
+    ]
+
+    kwargs = mock_agent_class.return_value.generate_content.call_args.kwargs
+    assert kwargs["system_prompt"] == _CONVERSATION_FALLBACK_SYSTEM_PROMPT
+    assert kwargs["prompt"].endswith("Current question: How should I size the position?")
+    assert {"type": "model_used", "body": "test-model"} in events
+
+
+@pytest.mark.asyncio
+@patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+async def test_conversation_fallback_ends_with_prefetched_related_questions(mock_agent_class):
+    mock_agent_class.return_value.model_name = "test-model"
+    mock_agent_class.return_value.generate_content.return_value = iter(["Diversify."])
+    handler, _ = _make_handler(FinancialDataRequirement.BASIC)
+    related = asyncio.get_running_loop().create_future()
+    related.set_result([{"type": "related_question", "body": "What about bonds?"}])
+    handler._prefetch_related_questions = MagicMock(return_value=related)  # type: ignore[method-assign]
+    conversation = [{"role": "user", "content": "Tell me about Apple"}, {"role": "assistant", "content": "Apple..."}]
+
+    events = [
+        event
+        async for event in handler.handle(
+            "", "How should I size the position?", False, False, conversation_messages=conversation
+        )
+    ]
+
+    assert events[-2:] == [
+        {"type": "model_used", "body": "test-model"},
+        {"type": "related_question", "body": "What about bonds?"},
+    ]
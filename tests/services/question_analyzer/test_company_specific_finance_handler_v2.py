@@ -35,6 +35,8 @@ def _make_handler_deps(
     optimizer = MagicMock()
     fundamental_value = {"Name": "Apple Inc."} if fundamental is _UNSET else fundamental
     optimizer.fetch_optimized_data = AsyncMock(return_value=(fundamental_value, annual or [], quarterly or []))
+    optimizer.fetch_fundamentals = AsyncMock(return_value=fundamental_value)
+    optimizer.fetch_statements = AsyncMock(return_value=(annual or [], quarterly or []))
     return company_connector, classifier, optimizer
 
 
@@ -626,7 +628,9 @@ async def test_fallback_no_db_data_with_conversation(mock_multi_agent_cls):
         events.append(event)
 
     classifier.classify_data_and_period_requirement.assert_called_once()
-    optimizer.fetch_optimized_data.assert_called_once()
+    # "follow up?" gives no hint of a BASIC question, so fundamentals are fetched only after classification
+    optimizer.fetch_fundamentals.assert_not_called()
+    optimizer.fetch_optimized_data.assert_awaited_once()
     thinking_bodies = [e["body"] for e in events if e["type"] == "thinking_status"]
     assert any("No ZZZZ financials" in b or "conversation" in b.lower() for b in thinking_bodies)
     assert all(e["type"] != "sources" for e in events)
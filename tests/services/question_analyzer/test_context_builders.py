@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import re
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+import re2
+
+from services.question_analyzer.context_builders import ContextBuilderInput, components, get_context_builder
+from services.question_analyzer.context_builders.components import (
+    PromptComponents,
+    _base_context,
+    _current_date_context,
+)
+from services.question_analyzer.types import FinancialDataRequirement
+
+
+def test_get_context_builder_reuses_one_instance_per_requirement():
+    assert get_context_builder(FinancialDataRequirement.BASIC) is get_context_builder(FinancialDataRequirement.BASIC)
+    assert get_context_builder(FinancialDataRequirement.BASIC) is not get_context_builder(
+        FinancialDataRequirement.DETAILED
+    )
+
+
+def test_current_date_context_follows_the_date_it_is_given():
+    assert "most recently completed reporting quarter is 2025-Q4" in _current_date_context(date(2026, 2, 10))
+    assert "most recently completed reporting quarter is 2026-Q2" in _current_date_context(date(2026, 8, 3))
+
+
+def test_base_context_is_rendered_once_per_question_and_day():
+    first = _base_context("aapl", "What is Apple's P/E?", date(2026, 2, 10))
+
+    assert _base_context("aapl", "What is Apple's P/E?", date(2026, 2, 10)) is first
+    assert "2025-Q4" in first and "Company: AAPL" in first
+    assert "2026-Q2" in _base_context("aapl", "What is Apple's P/E?", date(2026, 8, 3))
+
+
+def test_available_sources_lists_filings_and_matches_lookup_names():
+    annual = [{"period_end_year": 2024, "filing_10k_url": "https://sec.gov/10k"}, {"period_end_year": 2023}]
+    quarterly = [{"period_end_quarter": "2025-Q1", "filing_10q_url": "https://sec.gov/10q"}]
+
+    block = PromptComponents.available_sources("aapl", annual, quarterly)
+
+    assert block.splitlines() == [
+        "**Available Source URLs (use these EXACT URLs when citing):**",
+        "- AAPL Annual 10-K Filing (2024): https://sec.gov/10k",
+        "- AAPL Quarterly 10-Q Filing (2025-Q1): https://sec.gov/10q",
+    ]
+    assert PromptComponents.available_sources("AAPL", [dict(s) for s in annual], quarterly) is block
+    assert PromptComponents.available_sources("aapl", [], []) == ""
+
+
+def test_filing_url_lookup_is_shared_for_the_same_filings():
+    annual = [{"period_end_year": 2024, "filing_10k_url": "https://sec.gov/10k"}]
+    quarterly = [{"period_end_quarter": "2025-Q1", "filing_10q_url": "https://sec.gov/10q"}]
+
+    lookup = PromptComponents.build_filing_url_lookup("aapl", annual, quarterly)
+
+    assert lookup["AAPL Annual 10-K Filing (2024)"] == "https://sec.gov/10k"
+    assert lookup["AAPL Quarterly 10-Q Filing (2025-Q1)"] == "https://sec.gov/10q"
+    assert PromptComponents.build_filing_url_lookup("AAPL", [dict(s) for s in annual], quarterly) is lookup
+    assert "AAPL Annual 10-K Filing (2023)" in PromptComponents.build_filing_url_lookup(
+        "AAPL", [{"period_end_year": 2023, "filing_10k_url": "https://sec.gov/10k"}], quarterly
+    )
+
+
+def test_basic_builder_embeds_fundamentals_as_compact_json():
+    context = get_context_builder(FinancialDataRequirement.BASIC).build(
+        ContextBuilderInput(
+            ticker="AAPL",
+            question="What is Apple's P/E ratio?",
+            company_fundamental={"Name": "Apple Inc.", "PERatio": "30.1"},
+            annual_statements=[],
+            quarterly_statements=[],
+        )
+    )
+
+    assert '{"Name":"Apple Inc.","PERatio":"30.1"}' in context
+
+
+def test_extract_sources_from_response_dedupes_names_across_blocks():
+    text = "Revenue grew. [Sources: Apple 10-K, Reuters] Margins fell. [Source: Reuters, Bloomberg ]"
+
+    assert PromptComponents.extract_sources_from_response(text) == [
+        {"name": "Apple 10-K", "url": None},
+        {"name": "Reuters", "url": None},
+        {"name": "Bloomberg", "url": None},
+    ]
+
+
+def test_source_patterns_use_re2():
+    assert components._response_re is re2
+
+
+@pytest.mark.parametrize("engine", [re, re2], ids=["re", "re2"])
+def test_source_patterns_match_the_same_with_either_engine(engine):
+    text = "Revenue grew. [Sources: Apple 10-K, Reuters] Margins fell. [Source: Reuters, Bloomberg ]"
+    token_pattern = engine.compile(components._SOURCE_TOKEN_RE.pattern)
+
+    with (
+        patch.object(components, "_SOURCES_BLOCK_RE", engine.compile(components._SOURCES_BLOCK_RE.pattern)),
+        patch.object(components, "_SOURCE_TOKEN_RE", token_pattern),
+    ):
+        sources = PromptComponents.extract_sources_from_response(text)
+
+    assert [source["name"] for source in sources] == ["Apple 10-K", "Reuters", "Bloomberg"]
+    link = token_pattern.search("[Apple 10-K](https://sec.gov/aapl), Reuters")
+    assert (link.group("name"), link.group("url")) == ("Apple 10-K", "https://sec.gov/aapl")
+
+
+def test_static_prompt_fragments_drop_source_indentation():
+    for fragment in (
+        PromptComponents.source_instructions(),
+        PromptComponents.section_structure_template(),
+        PromptComponents.data_grounding_rules(),
+    ):
+        assert fragment == fragment.strip()
+        assert not any(line.startswith("            ") for line in fragment.splitlines())
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import importlib
+import logging
+import threading
+from collections import defaultdict
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.question_analyzer import data_optimizer
+from services.question_analyzer.data_optimizer import FinancialDataOptimizer
+from services.question_analyzer.types import FinancialDataRequirement, FinancialPeriodRequirement
+
+
+@pytest.mark.asyncio
+async def test_detailed_both_fetches_annual_and_quarterly_concurrently():
+    # Each connector call waits for the other one to start, so a sequential fetch would time out
+    both_started = threading.Barrier(2, timeout=2)
+
+    def annual(ticker, num_periods):
+        both_started.wait()
+        return ["annual"]
+
+    def quarterly(ticker, num_periods):
+        both_started.wait()
+        return ["quarterly"]
+
+    connector = MagicMock()
+    connector.get_company_financial_statements_recent.side_effect = annual
+    connector.get_company_quarterly_financial_statements_recent.side_effect = quarterly
+    optimizer = FinancialDataOptimizer(company_financial_connector=connector)
+
+    with patch("services.question_analyzer.data_optimizer.CompanyFinancialConnector.to_dicts", side_effect=list):
+        _, annual_statements, quarterly_statements = await optimizer.fetch_optimized_data(
+            ticker="AAPL",
+            data_requirement=FinancialDataRequirement.DETAILED,
+            period_requirement=FinancialPeriodRequirement(period_type="both", num_periods=2),
+        )
+
+    assert annual_statements == ["annual"]
+    assert quarterly_statements == ["quarterly"]
+
+
+@pytest.mark.asyncio
+async def test_detailed_annual_only_skips_quarterly_fetch():
+    connector = MagicMock()
+    connector.get_company_financial_statements_recent.return_value = []
+    optimizer = FinancialDataOptimizer(company_financial_connector=connector)
+
+    _, _, quarterly_statements = await optimizer.fetch_optimized_data(
+        ticker="AAPL",
+        data_requirement=FinancialDataRequirement.DETAILED,
+        period_requirement=FinancialPeriodRequirement(period_type="annual", num_periods=3),
+    )
+
+    assert quarterly_statements == []
+    connector.get_company_quarterly_financial_statements_recent.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_basic_fetches_fundamentals_without_statements():
+    connector = MagicMock()
+    optimizer = FinancialDataOptimizer(company_financial_connector=connector)
+
+    with patch(
+        "services.question_analyzer.data_optimizer.get_company_fundamental", return_value={"Name": "Apple Inc."}
+    ) as mock_fundamental:
+        fundamental, annual_statements, quarterly_statements = await optimizer.fetch_optimized_data(
+            ticker="AAPL", data_requirement=FinancialDataRequirement.BASIC
+        )
+
+    assert fundamental == {"Name": "Apple Inc."}
+    assert (annual_statements, quarterly_statements) == ([], [])
+    mock_fundamental.assert_called_once_with("AAPL")
+    assert connector.method_calls == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_statements_never_fetches_fundamentals():
+    optimizer = FinancialDataOptimizer(company_financial_connector=MagicMock())
+
+    with patch("services.question_analyzer.data_optimizer.get_company_fundamental") as mock_fundamental:
+        assert await optimizer.fetch_statements("AAPL", FinancialDataRequirement.BASIC) == ([], [])
+
+    mock_fundamental.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_annual_summary_queries_database_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    query_threads = []
+
+    def recent(ticker, num_periods):
+        query_threads.append(threading.get_ident())
+        return [{"period_end_year": 2025, "filing_10k_url": "https://sec.gov/10k"}]
+
+    connector = MagicMock()
+    connector.get_company_financial_statements_recent.side_effect = recent
+    optimizer = FinancialDataOptimizer(company_financial_connector=connector)
+
+    with patch("services.question_analyzer.data_optimizer.CompanyFinancialConnector.to_dicts", side_effect=list):
+        annual_statements, _ = await optimizer.fetch_statements("AAPL", FinancialDataRequirement.ANNUAL_SUMMARY)
+
+    assert [s["period_end_year"] for s in annual_statements] == [2025]
+    assert query_threads and loop_thread not in query_threads
+
+
+@pytest.mark.asyncio
+async def test_none_requirement_returns_without_fetching():
+    connector = MagicMock()
+    optimizer = FinancialDataOptimizer(company_financial_connector=connector)
+
+    with patch("services.question_analyzer.data_optimizer.get_company_fundamental") as mock_fundamental:
+        result = await optimizer.fetch_optimized_data("AAPL", FinancialDataRequirement.NONE)
+
+    assert result == (None, [], [])
+    mock_fundamental.assert_not_called()
+    assert connector.method_calls == []
+
+
+@pytest.mark.asyncio
+async def test_profiles_fundamentals_only_when_info_enabled(caplog):
+    optimizer = FinancialDataOptimizer(company_financial_connector=MagicMock())
+    logger_name = "services.question_analyzer.data_optimizer"
+
+    with patch("services.question_analyzer.data_optimizer.get_company_fundamental", return_value=None):
+        with caplog.at_level(logging.WARNING, logger=logger_name):
+            await optimizer.fetch_fundamentals("AAPL")
+        assert not any("Profiling" in record.getMessage() for record in caplog.records)
+
+        with caplog.at_level(logging.INFO, logger=logger_name):
+            await optimizer.fetch_fundamentals("AAPL")
+    assert any(record.getMessage().startswith("Profiling get_company_fundamental: ") for record in caplog.records)
+
+
+_current_span = contextvars.ContextVar("current_span", default="csf_handler")
+
+
+def _fake_observe(name, **_kwargs):
+    """Stand-in for langfuse.observe that makes each decorated call the current span."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            token = _current_span.set(name)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _current_span.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+class _SpanRecorder:
+    def __init__(self):
+        self.metadata = defaultdict(dict)
+
+    def update_current_span(self, metadata):
+        self.metadata[_current_span.get()].update(metadata)
+
+
+@pytest.fixture
+def traced_optimizer_module(monkeypatch):
+    monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk")
+    monkeypatch.setenv("LANGFUSE_SECRET_KEY", "sk")
+    with patch("utils.langfuse_config.observe", _fake_observe):
+        module = importlib.reload(data_optimizer)
+    yield module
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY")
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY")
+    importlib.reload(data_optimizer)
+
+
+@pytest.mark.asyncio
+async def test_fetch_durations_land_on_their_own_spans(traced_optimizer_module, caplog):
+    connector = MagicMock()
+    connector.get_company_financial_statements_recent.return_value = []
+    optimizer = traced_optimizer_module.FinancialDataOptimizer(company_financial_connector=connector)
+    recorder = _SpanRecorder()
+
+    with (
+        patch("utils.profiling.get_client", return_value=recorder),
+        patch.object(traced_optimizer_module, "get_company_fundamental", return_value=None),
+        caplog.at_level(logging.INFO, logger="services.question_analyzer.data_optimizer"),
+    ):
+        # The CSF handler runs the fundamentals fetch as a task that copies its context
+        fundamentals_task = asyncio.create_task(optimizer.fetch_fundamentals("AAPL"))
+        await optimizer._fetch_annual_summary("AAPL")
+        await fundamentals_task
+
+    assert set(recorder.metadata) == {"get_company_fundamental", "fetch_annual_summary"}
+    assert set(recorder.metadata["get_company_fundamental"]) == {"duration_s.get_company_fundamental"}
+    assert set(recorder.metadata["fetch_annual_summary"]) == {"duration_s.fetch_annual_summary"}
@@ -265,3 +265,74 @@ async def test_search_on_emits_all_retrieved_sources_regardless_of_inline_citati
     sources_events = [e for e in events if e["type"] == "sources"]
     assert len(sources_events) == 1
     assert [s["source_id"] for s in sources_events[0]["body"]] == ["s_1"]
+
+
+@pytest.mark.asyncio
+@patch("services.question_analyzer.handlers_v2.MultiAgent")
+async def test_answer_stream_does_not_block_event_loop(mock_multi_agent_cls):
+    import asyncio
+    import threading
+
+    from services.question_analyzer.handlers_v2 import GeneralFinanceHandlerV2
+
+    # The model stream waits for a coroutine on the loop, so pulling it on the loop thread would deadlock
+    loop_ran = threading.Event()
+
+    def slow_chunks():
+        assert loop_ran.wait(timeout=2)
+        yield "Concept"
+
+    async def mark_loop_ran():
+        loop_ran.set()
+
+    mock_agent = MagicMock()
+    mock_agent.model_name = "test-model"
+    mock_agent.generate_content.return_value = slow_chunks()
+    mock_multi_agent_cls.return_value = mock_agent
+
+    handler = GeneralFinanceHandlerV2()
+
+    async def _fake_related(*_a, **_k):
+        if False:
+            yield {}
+
+    handler._generate_related_questions = _fake_related  # type: ignore[attr-defined]
+
+    async def collect():
+        return [
+            event
+            async for event in handler.handle(
+                question="What is P/E?",
+                search_decision=_decision(False),
+                use_url_context=False,
+                preferred_model=ModelName.Auto,
+                conversation_messages=None,
+            )
+        ]
+
+    events, _ = await asyncio.gather(collect(), mark_loop_ran())
+
+    assert [event["body"] for event in events if event["type"] == "answer"] == ["Concept"]
+
+
+@pytest.mark.asyncio
+async def test_text_stream_drops_citations_and_closes_on_early_stop():
+    import threading
+
+    from services.question_analyzer.handlers_v2 import _stream_text_chunks
+
+    closed = threading.Event()
+
+    def stream():
+        try:
+            yield {"type": "url_citation", "url": "https://example.com"}
+            for i in range(100):
+                yield f"chunk {i} "
+        finally:
+            closed.set()
+
+    chunks = _stream_text_chunks(stream())
+    assert await anext(chunks) == "chunk 0 "
+    await chunks.aclose()
+
+    assert closed.wait(timeout=2)
@@ -0,0 +1,125 @@
+"""Client-disconnect cancellation in the v1 FinancialAnalyzer and ETFAnalyzer streams."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.etf_analyzer import ETFAnalyzer
+from services.etf_question_analyzer.types import ETFDataRequirement, ETFQuestionType
+from services.financial_analyzer import FinancialAnalyzer
+from services.question_analyzer.types import FinancialDataRequirement, QuestionClassification, QuestionType
+from utils.langfuse_config import aclose_observed_stream
+
+
+def _search_engine():
+    engine = MagicMock()
+    engine.decide = AsyncMock(return_value=SimpleNamespace(use_google_search=False))
+    return engine
+
+
+class _EndlessStream:
+    """Stand-in handler whose answer stream only ends when it is closed."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def handle(self, *_args, **_kwargs):
+        try:
+            while True:
+                yield {"type": "answer", "body": "chunk "}
+        finally:
+            self.closed = True
+
+
+def _financial_analyzer(question_type, comparison_tickers=None):
+    analyzer = FinancialAnalyzer(
+        agent=MagicMock(),
+        company_connector=MagicMock(),
+        company_financial_connector=MagicMock(),
+        search_decision_engine=_search_engine(),
+    )
+    analyzer.classifier = MagicMock()
+    analyzer.classifier.classify_all = AsyncMock(
+        return_value=QuestionClassification(
+            question_type=question_type,
+            comparison_tickers=comparison_tickers,
+            data_requirement=FinancialDataRequirement.NONE,
+            period_requirement=None,
+            relevant_statements=None,
+        )
+    )
+    return analyzer
+
+
+def _etf_analyzer(question_type, comparison_tickers=None):
+    analyzer = ETFAnalyzer(search_decision_engine=_search_engine())
+    analyzer.classifier = MagicMock()
+    analyzer.classifier.classify_question = AsyncMock(
+        return_value=(question_type, ETFDataRequirement.NONE, comparison_tickers)
+    )
+    analyzer.data_optimizer = MagicMock()
+    analyzer.data_optimizer.fetch_optimized_data = AsyncMock(return_value=None)
+    return analyzer
+
+
+async def _consume_until_cancelled(analyzer_generator, cancel_event, stream):
+    """Set cancel_event on the first answer chunk; report whether the stream was closed before the loop shuts down."""
+    events = []
+    async for event in analyzer_generator:
+        events.append(event)
+        if event.get("type") == "answer":
+            cancel_event.set()
+    return events, stream.closed
+
+
+@pytest.mark.parametrize("analyzer_type", ["financial", "etf"])
+def test_cancel_event_closes_comparison_stream(analyzer_type):
+    stream = _EndlessStream()
+    if analyzer_type == "financial":
+        analyzer = _financial_analyzer(QuestionType.COMPANY_COMPARISON.value, ["AAPL", "MSFT"])
+    else:
+        analyzer = _etf_analyzer(ETFQuestionType.ETF_COMPARISON, ["SPY", "QQQ"])
+    analyzer.comparison_handler = stream
+    cancel_event = asyncio.Event()
+
+    events, closed = asyncio.run(
+        _consume_until_cancelled(
+            analyzer.analyze_question("AAPL", "Compare them", cancel_event=cancel_event), cancel_event, stream
+        )
+    )
+
+    assert closed
+    assert sum(1 for event in events if event.get("type") == "answer") == 1
+
+
+def test_cancel_event_closes_etf_handler_stream():
+    stream = _EndlessStream()
+    analyzer = _etf_analyzer(ETFQuestionType.GENERAL_ETF)
+    analyzer.general_handler = stream
+    cancel_event = asyncio.Event()
+
+    _, closed = asyncio.run(
+        _consume_until_cancelled(
+            analyzer.analyze_question("SPY", "What is an ETF?", cancel_event=cancel_event), cancel_event, stream
+        )
+    )
+
+    assert closed
+
+
+def test_closing_observed_analyzer_stream_closes_handler_stream():
+    stream = _EndlessStream()
+    analyzer = _financial_analyzer(QuestionType.GENERAL_FINANCE.value)
+    analyzer.handlers[QuestionType.GENERAL_FINANCE.value] = stream
+
+    async def run():
+        analyzer_generator = analyzer.analyze_question("AAPL", "What is a P/E ratio?")
+        async for event in analyzer_generator:
+            if event.get("type") == "answer":
+                break
+        await aclose_observed_stream(analyzer_generator)
+        return stream.closed
+
+    assert asyncio.run(run())
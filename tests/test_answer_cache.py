@@ -0,0 +1,116 @@
+"""Tests for the exact-match answer cache in CompanySpecificFinanceHandler."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.question_analyzer.company_specific_finance_handler import (
+    CompanySpecificFinanceHandler,
+    _answer_cache_key,
+)
+from services.question_analyzer.types import FinancialDataRequirement, QuestionClassification
+
+CACHED_EVENTS = [
+    {"type": "answer", "body": "Apple's revenue grew 5%."},
+    {"type": "sources", "body": [{"name": "Apple 10-K", "url": "https://example.com"}]},
+]
+
+
+def _handler():
+    optimizer = MagicMock()
+    optimizer.fetch_optimized_data = AsyncMock(return_value=({"Name": "Apple Inc."}, [], []))
+    return CompanySpecificFinanceHandler(
+        agent=MagicMock(), company_connector=MagicMock(), data_optimizer=optimizer, classifier=MagicMock()
+    )
+
+
+def _collect(handler, data_requirement, use_google_search=False):
+    classification = QuestionClassification(
+        question_type=None,
+        comparison_tickers=None,
+        data_requirement=data_requirement,
+        period_requirement=None,
+        relevant_statements=None,
+    )
+
+    async def run():
+        return [
+            event
+            async for event in handler.handle(
+                "aapl", "How did Apple grow?", use_google_search, False, data_classification=classification
+            )
+        ]
+
+    return asyncio.run(run())
+
+
+def _stub_related_questions(handler):
+    async def no_related_questions(*args, **kwargs):
+        return
+        yield
+
+    handler._generate_related_questions = no_related_questions
+
+
+class TestAnswerCache:
+    def test_cache_key_depends_on_model(self):
+        assert _answer_cache_key("model-a", "prompt") != _answer_cache_key("model-b", "prompt")
+
+    @patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+    @patch("services.question_analyzer.company_specific_finance_handler.cache")
+    def test_cache_hit_replays_events_without_calling_model(self, mock_cache, mock_agent_class):
+        mock_agent_class.return_value.model_name = "test-model"
+        mock_cache.get_json.return_value = {"events": CACHED_EVENTS}
+        handler = _handler()
+        _stub_related_questions(handler)
+
+        events = _collect(handler, FinancialDataRequirement.BASIC)
+
+        assert [e for e in events if e["type"] in ("answer", "sources")] == CACHED_EVENTS
+        assert events[-1] == {"type": "model_used", "body": "test-model"}
+        mock_agent_class.return_value.generate_content.assert_not_called()
+
+    @patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+    @patch("services.question_analyzer.company_specific_finance_handler.cache")
+    def test_cache_miss_stores_streamed_events(self, mock_cache, mock_agent_class):
+        mock_agent_class.return_value.model_name = "test-model"
+        mock_agent_class.return_value.generate_content.return_value = iter(["Apple's revenue grew 5%."])
+        mock_cache.get_json.return_value = None
+        handler = _handler()
+        _stub_related_questions(handler)
+
+        _collect(handler, FinancialDataRequirement.BASIC)
+
+        key, value, _ = mock_cache.set_json.call_args.args
+        assert key.startswith("csf_answer:")
+        assert "".join(e["body"] for e in value["events"] if e["type"] == "answer") == "Apple's revenue grew 5%."
+
+    @patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+    @patch("services.question_analyzer.company_specific_finance_handler.cache")
+    def test_search_enabled_answers_bypass_cache(self, mock_cache, mock_agent_class):
+        mock_agent_class.return_value.model_name = "test-model"
+        mock_agent_class.return_value.generate_content.return_value = iter(["Latest news says..."])
+        handler = _handler()
+        _stub_related_questions(handler)
+
+        _collect(handler, FinancialDataRequirement.BASIC, use_google_search=True)
+
+        mock_cache.get_json.assert_not_called()
+        mock_cache.set_json.assert_not_called()
+
+    @patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
+    @patch("services.question_analyzer.company_specific_finance_handler.cache")
+    def test_cache_round_trips_run_off_the_event_loop(self, mock_cache, mock_agent_class):
+        mock_agent_class.return_value.model_name = "test-model"
+        mock_agent_class.return_value.generate_content.return_value = iter(["Apple's revenue grew 5%."])
+        loop_thread = threading.get_ident()
+        cache_threads = []
+        mock_cache.get_json.side_effect = lambda key: cache_threads.append(threading.get_ident())
+        mock_cache.set_json.side_effect = lambda *args: cache_threads.append(threading.get_ident())
+        handler = _handler()
+        _stub_related_questions(handler)
+
+        _collect(handler, FinancialDataRequirement.BASIC)
+
+        assert len(cache_threads) == 2
+        assert loop_thread not in cache_threads
@@ -0,0 +1,24 @@
+"""Tests for the JSON helpers in connectors.cache."""
+
+from unittest.mock import patch
+
+from connectors import cache
+
+
+class TestJsonHelpers:
+    @patch("connectors.cache.redis_client")
+    def test_set_then_get_round_trips_value(self, mock_redis):
+        value = {"events": [{"type": "answer", "body": "Revenue grew 5% — driven by iPhone."}]}
+
+        cache.set_json("key", value, 60)
+        _, ttl, payload = mock_redis.setex.call_args.args
+        mock_redis.get.return_value = payload if isinstance(payload, bytes) else payload.encode()
+
+        assert ttl == 60
+        assert cache.get_json("key") == value
+
+    @patch("connectors.cache.redis_client")
+    def test_invalid_json_is_a_miss(self, mock_redis):
+        mock_redis.get.return_value = b"{not json"
+
+        assert cache.get_json("key") is None
@@ -0,0 +1,67 @@
+"""Tests for the in-process cache in external_knowledge.company_fundamental."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from external_knowledge import company_fundamental
+
+APPLE = {"Name": "Apple Inc.", "MarketCapitalization": "3000000000000"}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    company_fundamental._company_fundamental_cache.clear()
+    yield
+    company_fundamental._company_fundamental_cache.clear()
+
+
+class TestFundamentalCache:
+    @patch("external_knowledge.company_fundamental.time.monotonic")
+    @patch("external_knowledge.company_fundamental._get_from_alpha_vantage", return_value=APPLE)
+    def test_refetches_once_the_entry_expires(self, mock_fetch, mock_monotonic):
+        mock_monotonic.return_value = 1000.0
+        assert company_fundamental.get_company_fundamental("AAPL") == APPLE
+        assert company_fundamental.get_company_fundamental("AAPL") == APPLE
+        assert mock_fetch.call_count == 1
+
+        mock_monotonic.return_value = 1000.0 + company_fundamental.FUNDAMENTAL_CACHE_TTL_SECONDS + 1
+        company_fundamental.get_company_fundamental("AAPL")
+
+        assert mock_fetch.call_count == 2
+
+    @patch("external_knowledge.company_fundamental._get_from_yfinance", return_value=None)
+    @patch("external_knowledge.company_fundamental._get_from_alpha_vantage", return_value=None)
+    def test_failed_fetches_are_not_cached(self, mock_fetch, _):
+        assert company_fundamental.get_company_fundamental("ZZZZ") is None
+        assert company_fundamental.get_company_fundamental("ZZZZ") is None
+
+        assert mock_fetch.call_count == 2
+
+    def test_concurrent_misses_share_one_upstream_fetch(self):
+        fetch_started = threading.Event()
+        release_fetch = threading.Event()
+        calls = []
+
+        def slow_fetch(ticker):
+            calls.append(ticker)
+            fetch_started.set()
+            release_fetch.wait(timeout=2)
+            return APPLE
+
+        results = []
+        with patch("external_knowledge.company_fundamental._get_from_alpha_vantage", side_effect=slow_fetch):
+            threads = [
+                threading.Thread(target=lambda: results.append(company_fundamental.get_company_fundamental("AAPL")))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            fetch_started.wait(timeout=2)
+            release_fetch.set()
+            for thread in threads:
+                thread.join(timeout=2)
+
+        assert calls == ["AAPL"]
+        assert results == [APPLE] * 4
@@ -160,7 +160,7 @@ class TestCompanySpecificFinanceHandlerPromptInjection:
     """Test conversation context injection in CompanySpecificFinanceHandler."""
 
     @pytest.mark.asyncio
-    @patch("services.question_analyzer.company_specific_finance_handler.MultiAgent")
+    @patch("services.question_analyzer.company_specific_finance_handler.get_multi_agent")
     @patch("services.question_analyzer.company_specific_finance_handler.QuestionClassifier")
     @patch("services.question_analyzer.company_specific_finance_handler.FinancialDataOptimizer")
     @patch("services.question_analyzer.company_specific_finance_handler.CompanyConnector")
@@ -185,6 +185,9 @@ class TestCompanySpecificFinanceHandlerPromptInjection:
                 [],  # quarterly_statements
             )
         )
+        # Without a precomputed classification the handler fetches fundamentals and statements separately
+        mock_optimizer.fetch_fundamentals = AsyncMock(return_value={"name": "Apple Inc."})
+        mock_optimizer.fetch_statements = AsyncMock(return_value=([], []))
         mock_optimizer_class.return_value = mock_optimizer
 
         mock_agent_instance = MagicMock()
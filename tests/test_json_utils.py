@@ -0,0 +1,66 @@
+"""Tests for the shared JSON helpers."""
+
+import json
+from datetime import date
+from unittest.mock import patch
+
+from services.shared import json_utils
+from services.shared.json_utils import compact_json, encode_stream_event, read_json_object
+
+
+class TestReadJsonObject:
+    def test_stops_at_closing_brace_of_top_level_object(self):
+        def chunks():
+            yield '{"tickers": {"first": "AAPL"}, '
+            yield '"second": "MSFT"}\n```'
+            raise AssertionError("stream consumed past the JSON object")
+
+        assert read_json_object(chunks()) == '{"tickers": {"first": "AAPL"}, "second": "MSFT"}'
+
+    def test_ignores_braces_inside_strings(self):
+        assert read_json_object(iter(['```json\n{"tickers": ["A}", "B"]}', "\n```"])) == (
+            '```json\n{"tickers": ["A}", "B"]}'
+        )
+
+    def test_closes_stream_after_object(self):
+        closed = []
+
+        def chunks():
+            try:
+                yield '{"tickers": []}'
+                yield "trailing"
+            finally:
+                closed.append(True)
+
+        read_json_object(chunks())
+
+        assert closed == [True]
+
+    def test_returns_full_text_when_no_object(self):
+        assert read_json_object(iter(["no ", "json"])) == "no json"
+
+
+class TestEncodeStreamEvent:
+    def test_frames_event_as_json_followed_by_blank_line(self):
+        event = {"type": "answer", "body": "Fortum's revenue grew 5% — driven by Nordic power."}
+
+        frame = encode_stream_event(event)
+
+        assert frame.endswith(b"\n\n")
+        assert json.loads(frame.decode("utf-8")) == event
+
+    def test_stdlib_fallback_produces_equivalent_frame(self):
+        event = {"type": "sources", "body": [{"name": "Apple 10-K", "url": None}]}
+
+        with patch.object(json_utils, "_fast_json", None):
+            frame = encode_stream_event(event)
+
+        assert frame.endswith(b"\n\n")
+        assert json.loads(frame.decode("utf-8")) == event
+
+
+class TestCompactJson:
+    def test_dumps_without_whitespace_and_stringifies_unknown_types(self):
+        assert compact_json({"Name": "Fortum Oyj", "LatestQuarter": date(2025, 6, 30)}) == (
+            '{"Name":"Fortum Oyj","LatestQuarter":"2025-06-30"}'
+        )
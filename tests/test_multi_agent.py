@@ -0,0 +1,17 @@
+"""Tests for line splitting in MultiAgent."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from agent.multi_agent import MultiAgent
+
+
+class TestAgenerateContentByLines:
+    def test_cleans_filters_and_caps_lines(self):
+        agent = MultiAgent()
+        text = "1. **How did margins change?**\nok\n2) What drove revenue growth?\n3. Is the dividend safe?\n4. Extra?"
+
+        with patch.object(agent.client, "achat", AsyncMock(return_value=text)):
+            lines = asyncio.run(agent.agenerate_content_by_lines("prompt", max_lines=3))
+
+        assert lines == ["How did margins change?", "What drove revenue growth?", "Is the dividend safe?"]
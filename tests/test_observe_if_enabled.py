@@ -0,0 +1,22 @@
+from utils.langfuse_config import observe_if_enabled
+
+
+def _answer() -> int:
+    return 42
+
+
+class TestObserveIfEnabled:
+    def test_returns_bare_function_when_langfuse_not_configured(self, monkeypatch):
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+        assert observe_if_enabled(name="answer")(_answer) is _answer
+
+    def test_wraps_function_when_langfuse_configured(self, monkeypatch):
+        monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk")
+        monkeypatch.setenv("LANGFUSE_SECRET_KEY", "sk")
+
+        wrapped = observe_if_enabled(name="answer")(_answer)
+
+        assert wrapped is not _answer
+        assert wrapped.__name__ == "_answer"
@@ -0,0 +1,65 @@
+"""Tests for connection reuse and request options in OpenRouterClient."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ai_models.model_name import ModelName
+from ai_models.openrouter_client import OpenRouterClient
+
+
+class TestSharedClient:
+    def test_clients_with_same_credentials_share_connection_pool(self):
+        first = OpenRouterClient(api_key="key", base_url="https://example.com/v1", model_name=ModelName.Auto)
+        second = OpenRouterClient(api_key="key", base_url="https://example.com/v1", model_name=ModelName.Fastest)
+
+        assert first.client is second.client
+        assert first.model_name != second.model_name
+
+    def test_different_credentials_get_separate_clients(self):
+        first = OpenRouterClient(api_key="key-a", base_url="https://example.com/v1")
+        second = OpenRouterClient(api_key="key-b", base_url="https://example.com/v1")
+
+        assert first.client is not second.client
+
+
+class TestTimeout:
+    def test_achat_timeout_applies_per_request_options(self):
+        client = OpenRouterClient(api_key="key", base_url="https://example.com/v1")
+        limited = MagicMock()
+        limited.chat.completions.create = AsyncMock(
+            return_value=MagicMock(choices=[MagicMock(message=MagicMock(content="basic"))])
+        )
+        async_client = MagicMock()
+        async_client.with_options.return_value = limited
+
+        with patch("ai_models.openrouter_client.AsyncOpenAI", return_value=async_client):
+            assert asyncio.run(client.achat("Classify", timeout=8.0)) == "basic"
+        async_client.with_options.assert_called_once_with(timeout=8.0, max_retries=1)
+
+    def test_stream_chat_without_timeout_keeps_client_defaults(self):
+        client = OpenRouterClient(api_key="key", base_url="https://example.com/v1")
+        client.client = MagicMock()
+        client.client.chat.completions.create.return_value = iter([])
+
+        assert list(client.stream_chat("Explain")) == []
+        client.client.with_options.assert_not_called()
+
+
+class TestAsyncClient:
+    def test_async_client_is_reused_within_a_loop(self):
+        client = OpenRouterClient(api_key="key", base_url="https://example.com/v1")
+
+        async def get_twice():
+            return client.async_client, client.async_client
+
+        first, second = asyncio.run(get_twice())
+
+        assert first is second
+
+    def test_each_event_loop_gets_its_own_async_client(self):
+        client = OpenRouterClient(api_key="key", base_url="https://example.com/v1")
+
+        async def get():
+            return client.async_client
+
+        assert asyncio.run(get()) is not asyncio.run(get())
@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from unittest.mock import MagicMock, patch
+
+from utils.profiling import profiled
+
+
+@profiled("double")
+async def _double(value: int) -> int:
+    return value * 2
+
+
+class TestProfiled:
+    def test_logs_duration_when_info_enabled(self, caplog):
+        with caplog.at_level(logging.INFO, logger=__name__):
+            assert asyncio.run(_double(2)) == 4
+
+        assert any(record.getMessage().startswith("Profiling double: ") for record in caplog.records)
+
+    def test_skips_timing_when_info_disabled(self, caplog):
+        with caplog.at_level(logging.WARNING, logger=__name__):
+            assert asyncio.run(_double(3)) == 6
+
+        assert not any("Profiling" in record.getMessage() for record in caplog.records)
+
+    def test_preserves_function_metadata(self):
+        assert _double.__name__ == "_double"
+
+    def test_sibling_durations_on_a_shared_span_keep_separate_keys(self, caplog):
+        @profiled("triple")
+        async def _triple(value: int) -> int:
+            return value * 3
+
+        async def run() -> None:
+            await asyncio.gather(_double(1), _triple(1))
+
+        client = MagicMock()
+        with patch("utils.profiling.get_client", return_value=client), caplog.at_level(logging.INFO, logger=__name__):
+            asyncio.run(run())
+
+        keys = [key for call in client.update_current_span.call_args_list for key in call.kwargs["metadata"]]
+        assert sorted(keys) == ["duration_s.double", "duration_s.triple"]
@@ -1,35 +1,34 @@
 """Tests for QuestionClassifier.classify_data_and_period_requirement (merged classifier)."""
 
 import asyncio
-from unittest.mock import MagicMock
+import re
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+import re2
 
 from core.financial_statement_type import FinancialStatementType
-from services.question_analyzer.classifier import QuestionClassifier
+from services.question_analyzer import classifier as classifier_module
+from services.question_analyzer.classifier import QuestionClassifier, _fast_path_categories, _is_likely_basic_question
+from services.question_analyzer.semantic_classification_cache import SemanticClassificationCache
 from services.question_analyzer.types import FinancialDataRequirement, FinancialPeriodRequirement
 
 
 def _make_classifier_with_llm_response(response_text: str) -> tuple[QuestionClassifier, MagicMock]:
-    """Build a QuestionClassifier whose underlying agent yields a fixed text response."""
+    """Build a QuestionClassifier whose underlying agent returns a fixed text response."""
     mock_agent = MagicMock()
 
-    def fake_generate_content(prompt: str):
-        # generate_content is a sync generator that yields text chunks
-        yield response_text
-
-    mock_agent.generate_content = MagicMock(side_effect=fake_generate_content)
+    mock_agent.agenerate_content = AsyncMock(return_value=response_text)
     classifier = QuestionClassifier(agent=mock_agent)
     return classifier, mock_agent
 
 
 def _make_classifier_with_llm_error(exc: Exception) -> tuple[QuestionClassifier, MagicMock]:
-    """Build a QuestionClassifier whose underlying agent raises when iterated."""
+    """Build a QuestionClassifier whose underlying agent raises when called."""
     mock_agent = MagicMock()
-
-    def raising_generate_content(prompt: str):
-        raise exc
-        yield  # pragma: no cover  -- make this a generator
-
-    mock_agent.generate_content = MagicMock(side_effect=raising_generate_content)
+    mock_agent.agenerate_content = AsyncMock(side_effect=exc)
     classifier = QuestionClassifier(agent=mock_agent)
     return classifier, mock_agent
 
@@ -47,7 +46,7 @@ class TestClassifyDataAndPeriodRequirementFastPaths:
         assert data_req == FinancialDataRequirement.QUARTERLY_SUMMARY
         assert period_req is None
         assert rel_stmts is None
-        mock_agent.generate_content.assert_not_called()
+        mock_agent.agenerate_content.assert_not_called()
 
     def test_annual_keyword_short_circuits_without_llm_call(self):
         classifier, mock_agent = _make_classifier_with_llm_response("ignored")
@@ -61,7 +60,7 @@ class TestClassifyDataAndPeriodRequirementFastPaths:
         assert data_req == FinancialDataRequirement.ANNUAL_SUMMARY
         assert period_req is None
         assert rel_stmts is None
-        mock_agent.generate_content.assert_not_called()
+        mock_agent.agenerate_content.assert_not_called()
 
 
 class TestClassifyDataAndPeriodRequirementLLMPath:
@@ -85,7 +84,7 @@ class TestClassifyDataAndPeriodRequirementLLMPath:
             period_type="annual", specific_years=None, specific_quarters=None, num_periods=3
         )
         assert rel_stmts == [FinancialStatementType.INCOME_STATEMENT]
-        mock_agent.generate_content.assert_called_once()
+        mock_agent.agenerate_content.assert_called_once()
 
     def test_detailed_with_specific_years(self):
         response = (
@@ -268,3 +267,399 @@ class TestClassifyDataAndPeriodRequirementLLMPath:
         assert data_req == FinancialDataRequirement.BASIC
         assert period_req is None
         assert rel_stmts is None
+
+    def test_data_requirement_label_is_case_and_whitespace_insensitive(self):
+        response = '{"data_requirement": " NONE ", "period_requirement": null, "relevant_statements": null}'
+        classifier, _ = _make_classifier_with_llm_response(response)
+
+        data_req, _, _ = asyncio.run(classifier.classify_data_and_period_requirement("AAPL", "What does Apple do?"))
+
+        assert data_req == FinancialDataRequirement.NONE
+
+
+class TestClassifyAll:
+    COMBINED_RESPONSE = (
+        '{"question_type": "company-specific-finance", "data_requirement": "detailed", '
+        '"period_requirement": {"period_type": "quarterly", "specific_years": null, '
+        '"specific_quarters": ["2024-Q3"], "num_periods": null}, '
+        '"relevant_statements": ["income_statement"]}'
+    )
+
+    def test_answers_both_classifications_with_one_combined_call(self):
+        classifier, mock_agent = _make_classifier_with_llm_response(self.COMBINED_RESPONSE)
+        classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=["AAPL"])
+
+        result = asyncio.run(classifier.classify_all("How did Apple perform in Q3 2024?", "AAPL"))
+
+        assert result.question_type == "company-specific-finance"
+        assert result.comparison_tickers is None
+        assert result.data_requirement == FinancialDataRequirement.DETAILED
+        assert result.period_requirement == FinancialPeriodRequirement(
+            period_type="quarterly", specific_quarters=["2024-Q3"]
+        )
+        assert result.relevant_statements == [FinancialStatementType.INCOME_STATEMENT]
+        assert mock_agent.agenerate_content.call_count == 1
+        assert (
+            mock_agent.agenerate_content.call_args.kwargs["system_prompt"] == QuestionClassifier.COMBINED_SYSTEM_PROMPT
+        )
+
+    def test_combined_result_seeds_per_method_caches(self):
+        classifier, mock_agent = _make_classifier_with_llm_response(self.COMBINED_RESPONSE)
+        classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=["AAPL"])
+
+        asyncio.run(classifier.classify_all("How did Apple perform in Q3 2024?", "AAPL"))
+        question_type = asyncio.run(classifier.classify_question_type("How did Apple perform in Q3 2024?", "AAPL"))
+        data = asyncio.run(classifier.classify_data_and_period_requirement("AAPL", "How did Apple perform in Q3 2024?"))
+
+        assert question_type == ("company-specific-finance", None)
+        assert data[0] == FinancialDataRequirement.DETAILED
+        assert mock_agent.agenerate_content.call_count == 1
+
+    def test_follow_up_combined_result_does_not_seed_context_free_cache(self):
+        classifier, mock_agent = _make_classifier_with_llm_response(self.COMBINED_RESPONSE)
+        classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=["AAPL"])
+        conversation = [{"role": "user", "content": "Tell me about Q3 2024"}, {"role": "assistant", "content": "..."}]
+
+        asyncio.run(classifier.classify_all("And how did it do?", "AAPL", conversation_messages=conversation))
+        asyncio.run(classifier.classify_data_and_period_requirement("AAPL", "And how did it do?"))
+
+        assert mock_agent.agenerate_content.call_count == 2
+
+    def test_falls_back_to_separate_calls_when_combined_answer_is_unusable(self):
+        mock_agent = MagicMock()
+
+        async def fake_agenerate_content(prompt: str, system_prompt: str | None = None, **kwargs):
+            if system_prompt == QuestionClassifier.COMBINED_SYSTEM_PROMPT:
+                return "not json"
+            elif system_prompt == QuestionClassifier.DATA_AND_PERIOD_SYSTEM_PROMPT:
+                return '{"data_requirement": "basic", "period_requirement": null, "relevant_statements": null}'
+            else:
+                return "company-specific-finance"
+
+        mock_agent.agenerate_content = AsyncMock(side_effect=fake_agenerate_content)
+        classifier = QuestionClassifier(agent=mock_agent)
+        classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=["AAPL"])
+
+        result = asyncio.run(classifier.classify_all("How did Apple perform in Q3 2024?", "AAPL"))
+
+        assert result.question_type == "company-specific-finance"
+        assert result.data_requirement == FinancialDataRequirement.BASIC
+        assert mock_agent.agenerate_content.call_count == 3
+
+    def test_only_missing_half_goes_to_the_llm(self):
+        classifier, mock_agent = _make_classifier_with_llm_response("company-specific-finance")
+        classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=["AAPL"])
+
+        result = asyncio.run(classifier.classify_all("Summarize the latest 10-K filing", "AAPL"))
+
+        assert result.question_type == "company-specific-finance"
+        assert result.data_requirement == FinancialDataRequirement.ANNUAL_SUMMARY
+        assert mock_agent.agenerate_content.call_count == 1
+        assert (
+            mock_agent.agenerate_content.call_args.kwargs["system_prompt"]
+            == QuestionClassifier.QUESTION_TYPE_SYSTEM_PROMPT
+        )
+
+
+class TestClassificationCache:
+    def test_repeated_question_is_served_from_cache(self):
+        response = '{"data_requirement": "basic", "period_requirement": null, "relevant_statements": null}'
+        classifier, mock_agent = _make_classifier_with_llm_response(response)
+
+        first = asyncio.run(classifier.classify_data_and_period_requirement("AAPL", "Is Apple profitable?"))
+        second = asyncio.run(classifier.classify_data_and_period_requirement("aapl", "  is apple   PROFITABLE? "))
+
+        assert first == second == (FinancialDataRequirement.BASIC, None, None)
+        assert mock_agent.agenerate_content.call_count == 1
+        assert classifier.cache_info()["hits"] == 1
+
+    def test_failed_classification_is_not_cached(self):
+        classifier, mock_agent = _make_classifier_with_llm_error(RuntimeError("boom"))
+
+        asyncio.run(classifier.classify_data_and_period_requirement("AAPL", "Is Apple profitable?"))
+        asyncio.run(classifier.classify_data_and_period_requirement("AAPL", "Is Apple profitable?"))
+
+        assert mock_agent.agenerate_content.call_count == 2
+        assert classifier.cache_info()["size"] == 0
+
+
+def _make_classifier_with_slow_llm(response_text: str) -> tuple[QuestionClassifier, list]:
+    """Build a QuestionClassifier whose LLM answers after the (local, mocked) embedding; returns finished calls."""
+    completed = []
+
+    async def slow_llm(**kwargs):
+        await asyncio.sleep(0.2)
+        completed.append(kwargs["prompt"])
+        return response_text
+
+    mock_agent = MagicMock()
+    mock_agent.agenerate_content = AsyncMock(side_effect=slow_llm)
+    classifier = QuestionClassifier(agent=mock_agent)
+    classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=["AAPL"])
+    return classifier, completed
+
+
+class TestSemanticClassificationCache:
+    def test_paraphrased_question_reuses_question_type_label(self):
+        classifier, completed = _make_classifier_with_slow_llm("company-specific-finance")
+        embedder = MagicMock()
+        embedder.embed = MagicMock(
+            side_effect=lambda text: [1.0, 0.0] if "perform" in text else [0.0, 1.0],
+        )
+        classifier.semantic_cache = SemanticClassificationCache(embedder=embedder)
+
+        first = asyncio.run(classifier.classify_question_type("How is Apple performing?", "AAPL"))
+        second = asyncio.run(classifier.classify_question_type("How has Apple been performing lately?", "AAPL"))
+
+        assert first == second == ("company-specific-finance", None)
+        assert len(completed) == 1
+
+    def test_slow_embedding_does_not_delay_the_llm_answer(self):
+        classifier, _ = _make_classifier_with_llm_response("company-general")
+        classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=["AAPL"])
+        release_embedding = threading.Event()
+        embedder = MagicMock()
+        embedder.embed = MagicMock(side_effect=lambda text: release_embedding.wait(timeout=2) and [1.0, 0.0])
+        classifier.semantic_cache = SemanticClassificationCache(embedder=embedder)
+
+        async def run():
+            result = await classifier.classify_question_type("What products does Apple sell?", "AAPL")
+            still_embedding = not release_embedding.is_set()
+            release_embedding.set()
+            await asyncio.gather(*classifier._pending_lookups)
+            return result, still_embedding
+
+        result, still_embedding = asyncio.run(run())
+
+        assert result == ("company-general", None)
+        assert still_embedding
+        label, _ = asyncio.run(
+            classifier.semantic_cache.lookup("question_type", "AAPL", "What products does Apple sell?")
+        )
+        assert label == "company-general"
+
+    def test_non_finance_semantic_hit_cancels_combined_call(self):
+        classifier, completed = _make_classifier_with_slow_llm("{}")
+        embedder = MagicMock()
+        embedder.embed = MagicMock(return_value=[1.0, 0.0])
+        classifier.semantic_cache = SemanticClassificationCache(embedder=embedder)
+        classifier.semantic_cache.store("question_type", "AAPL", np.array([1.0, 0.0]), "company-general")
+
+        result = asyncio.run(classifier.classify_all("What is Apple's brand strategy?", "AAPL"))
+
+        assert result.question_type == "company-general"
+        assert result.data_requirement == FinancialDataRequirement.NONE
+        assert completed == []
+
+    def test_embeds_question_as_the_answer_cache_does(self):
+        embedder = MagicMock()
+        embedder.embed = MagicMock(return_value=[1.0, 0.0])
+        cache = SemanticClassificationCache(embedder=embedder)
+
+        asyncio.run(cache.lookup("question_type", "AAPL", "  How is Apple DOING?"))
+
+        embedder.embed.assert_called_once_with("  How is Apple DOING?")
+
+    def test_least_recently_used_partition_is_dropped_beyond_the_cap(self):
+        embedder = MagicMock()
+        embedder.embed = MagicMock(return_value=[1.0, 0.0])
+        cache = SemanticClassificationCache(embedder=embedder, max_partitions=2)
+        vector = np.array([1.0, 0.0], dtype=np.float32)
+
+        cache.store("question_type", "AAPL", vector, "company-general")
+        cache.store("question_type", "MSFT", vector, "company-general")
+        asyncio.run(cache.lookup("question_type", "AAPL", "What does Apple sell?"))
+        cache.store("question_type", "NVDA", vector, "company-general")
+
+        assert list(cache._partitions) == [("question_type", "aapl"), ("question_type", "nvda")]
+
+    def test_dissimilar_question_falls_through_to_llm(self):
+        classifier, mock_agent = _make_classifier_with_llm_response("company-general")
+        classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=["AAPL"])
+        embedder = MagicMock()
+        embedder.embed = MagicMock(side_effect=lambda text: [1.0, 0.0] if "products" in text else [0.0, 1.0])
+        classifier.semantic_cache = SemanticClassificationCache(embedder=embedder)
+
+        asyncio.run(classifier.classify_question_type("What products does Apple sell?", "AAPL"))
+        asyncio.run(classifier.classify_question_type("Does Apple design its own chips?", "AAPL"))
+
+        assert mock_agent.agenerate_content.call_count == 2
+
+
+class TestPromptPrefixCaching:
+    def test_static_instructions_sent_as_identical_system_prompt(self):
+        response = '{"data_requirement": "basic", "period_requirement": null, "relevant_statements": null}'
+        classifier, mock_agent = _make_classifier_with_llm_response(response)
+
+        asyncio.run(classifier.classify_data_and_period_requirement("AAPL", "Is Apple profitable?"))
+        asyncio.run(classifier.classify_data_and_period_requirement("MSFT", "Is Microsoft profitable?"))
+
+        first_call, second_call = mock_agent.agenerate_content.call_args_list
+        assert first_call.kwargs["system_prompt"] == second_call.kwargs["system_prompt"]
+        assert "AAPL" not in first_call.kwargs["system_prompt"]
+        assert "AAPL" in first_call.kwargs["prompt"]
+
+
+class TestParseJsonFromResponse:
+    def test_raw_json_with_surrounding_prose_is_parsed(self):
+        classifier, _ = _make_classifier_with_llm_response("")
+
+        parsed = classifier._parse_json_from_response(
+            'Here you go: {"data_requirement": "detailed", "period_requirement": {"period_type": "annual"}} '
+            "Let me know if {anything} else is needed."
+        )
+
+        assert parsed == {"data_requirement": "detailed", "period_requirement": {"period_type": "annual"}}
+
+    def test_fenced_json_is_parsed(self):
+        classifier, _ = _make_classifier_with_llm_response("")
+
+        parsed = classifier._parse_json_from_response('```json\n{"data_requirement": "basic"}\n```')
+
+        assert parsed == {"data_requirement": "basic"}
+
+    def test_response_patterns_use_re2(self):
+        assert classifier_module._response_re is re2
+
+    @pytest.mark.parametrize("engine", [re, re2], ids=["re", "re2"])
+    def test_fenced_json_is_parsed_by_either_engine(self, engine):
+        classifier, _ = _make_classifier_with_llm_response("")
+        pattern = engine.compile(classifier_module._MARKDOWN_JSON_RE.pattern)
+
+        with patch("services.question_analyzer.classifier._MARKDOWN_JSON_RE", pattern):
+            parsed = classifier._parse_json_from_response('Sure:\n```json\n{"data_requirement": "basic"}\n```\nDone.')
+
+        assert parsed == {"data_requirement": "basic"}
+
+    def test_bare_json_skips_markdown_scan(self):
+        classifier, _ = _make_classifier_with_llm_response("")
+
+        with patch("services.question_analyzer.classifier._MARKDOWN_JSON_RE") as mock_markdown_re:
+            parsed = classifier._parse_json_from_response('  {"data_requirement": "basic"}\n')
+
+        assert parsed == {"data_requirement": "basic"}
+        mock_markdown_re.search.assert_not_called()
+
+
+class TestStructuredOutput:
+    def test_data_and_period_call_requests_json_schema_output(self):
+        response = '{"data_requirement": "basic", "period_requirement": null, "relevant_statements": null}'
+        classifier, mock_agent = _make_classifier_with_llm_response(response)
+
+        asyncio.run(classifier.classify_data_and_period_requirement("AAPL", "Is Apple profitable?"))
+
+        response_format = mock_agent.agenerate_content.call_args.kwargs["response_format"]
+        assert response_format["type"] == "json_schema"
+        assert response_format["json_schema"]["name"] == "DataAndPeriodSchema"
+
+    def test_question_type_call_caps_output_tokens(self):
+        classifier, mock_agent = _make_classifier_with_llm_response("general-finance")
+        classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=[])
+
+        asyncio.run(classifier.classify_question_type("How does inflation affect stocks?", ""))
+
+        kwargs = mock_agent.agenerate_content.call_args.kwargs
+        assert kwargs["max_output_tokens"] == QuestionClassifier.QUESTION_TYPE_MAX_OUTPUT_TOKENS
+        assert kwargs["stop_sequences"] == ["\n"]
+
+    def test_invalid_period_type_uses_fallback_period(self):
+        response = (
+            '{"data_requirement": "detailed", "period_requirement": {"period_type": "weekly"}, '
+            '"relevant_statements": ["income_statement"]}'
+        )
+        classifier, _ = _make_classifier_with_llm_response(response)
+
+        _, period_req, _ = asyncio.run(classifier.classify_data_and_period_requirement("AAPL", "Apple revenue trend?"))
+
+        assert period_req == FinancialPeriodRequirement(period_type="annual", num_periods=3)
+
+
+class TestClassifyQuestionTypeFastPaths:
+    def _classifier(self):
+        classifier, mock_agent = _make_classifier_with_llm_response("general-finance")
+        classifier.ticker_extractor.extract_tickers = AsyncMock(return_value=["AAPL"])
+        return classifier, mock_agent
+
+    def test_financial_metric_with_ticker_skips_llm(self):
+        classifier, mock_agent = self._classifier()
+
+        result = asyncio.run(classifier.classify_question_type("What was Apple's revenue last quarter?", "AAPL"))
+
+        assert result == ("company-specific-finance", None)
+        mock_agent.agenerate_content.assert_not_called()
+
+    def test_company_fact_with_ticker_skips_llm(self):
+        classifier, mock_agent = self._classifier()
+
+        result = asyncio.run(classifier.classify_question_type("Who is the CEO of Apple?", "AAPL"))
+
+        assert result == ("company-general", None)
+        mock_agent.agenerate_content.assert_not_called()
+
+    def test_no_ticker_or_follow_up_falls_through_to_llm(self):
+        classifier, mock_agent = self._classifier()
+
+        asyncio.run(classifier.classify_question_type("How is revenue recognized?", ""))
+        asyncio.run(
+            classifier.classify_question_type(
+                "And the revenue?",
+                "AAPL",
+                conversation_messages=[{"role": "user", "content": "Tell me about Apple"}],
+            )
+        )
+
+        assert mock_agent.agenerate_content.call_count == 2
+
+    def test_one_scan_feeds_both_classifiers(self):
+        classifier, mock_agent = self._classifier()
+
+        result = asyncio.run(classifier.classify_all("What did the CEO say about revenue in the 10-K?", "AAPL"))
+
+        assert result.question_type == "company-specific-finance"
+        assert result.data_requirement == FinancialDataRequirement.ANNUAL_SUMMARY
+        mock_agent.agenerate_content.assert_not_called()
+
+    def test_overlapping_keywords_are_all_detected(self):
+        assert _fast_path_categories("Summarize the annual earnings report") == {"quarterly_report", "annual_report"}
+        assert "finance_metric" in _fast_path_categories("quarterly earnings per share trend")
+
+    def test_basic_hint_only_for_fundamentals_metrics(self):
+        assert _is_likely_basic_question("What is Apple's market cap?")
+        assert _is_likely_basic_question("Is the P/E ratio too high?")
+        assert not _is_likely_basic_question("How has revenue grown over the last five years?")
+        assert not _is_likely_basic_question("What's the P/E in the latest 10-K?")
+
+    def test_earnings_report_keeps_quarterly_priority_over_annual(self):
+        classifier, _ = self._classifier()
+
+        result = asyncio.run(classifier.classify_all("Summarize the annual earnings report", "AAPL"))
+
+        assert result.data_requirement == FinancialDataRequirement.QUARTERLY_SUMMARY
+
+    def test_earnings_per_share_after_quarterly_earnings_is_company_specific(self):
+        classifier, mock_agent = self._classifier()
+
+        result = asyncio.run(classifier.classify_all("quarterly earnings per share trend", "AAPL"))
+
+        assert result.question_type == "company-specific-finance"
+        assert result.data_requirement == FinancialDataRequirement.QUARTERLY_SUMMARY
+        mock_agent.agenerate_content.assert_not_called()
+
+    def test_company_fact_skips_data_and_period_classification(self):
+        classifier, mock_agent = self._classifier()
+
+        result = asyncio.run(classifier.classify_all("Who is the CEO of Apple?", "AAPL"))
+
+        assert result.question_type == "company-general"
+        assert result.data_requirement == FinancialDataRequirement.NONE
+        mock_agent.agenerate_content.assert_not_called()
+
+    def test_cached_non_finance_type_skips_data_and_period_classification(self):
+        classifier, mock_agent = self._classifier()
+        question = "What is Apple's brand strategy?"
+        classifier._cache_set(classifier._cache_key("question_type", "AAPL", question), ("company-general", None))
+
+        result = asyncio.run(classifier.classify_all(question, "AAPL"))
+
+        assert result.data_requirement == FinancialDataRequirement.NONE
+        mock_agent.agenerate_content.assert_not_called()
@@ -0,0 +1,200 @@
+"""Tests for related question generation in BaseQuestionHandler (Redis cache and prefetch)."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ai_models.model_name import ModelName
+from services.question_analyzer.handlers import (
+    CompanyGeneralHandler,
+    GeneralFinanceHandler,
+    _related_questions_cache_key,
+)
+
+QUESTIONS = [
+    "How does Apple's gross margin compare to peers?",
+    "What drove Apple's services growth last year?",
+    "Is Apple's buyback program sustainable long term?",
+]
+
+
+def _collect(handler, question):
+    async def run():
+        return [event async for event in handler._generate_related_questions(question)]
+
+    return asyncio.run(run())
+
+
+def _handler():
+    return CompanyGeneralHandler(agent=MagicMock(), company_connector=MagicMock())
+
+
+class TestRelatedQuestionsCache:
+    def test_cache_key_normalizes_case_and_whitespace(self):
+        assert _related_questions_cache_key("How is  Apple doing?", ModelName.Auto) == _related_questions_cache_key(
+            "how is apple doing? ", ModelName.Auto
+        )
+
+    def test_cache_key_depends_on_model(self):
+        assert _related_questions_cache_key("How is Apple doing?", ModelName.Auto) != _related_questions_cache_key(
+            "How is Apple doing?", ModelName.Fastest
+        )
+
+    @patch("services.question_analyzer.handlers.get_multi_agent")
+    @patch("services.question_analyzer.handlers.cache")
+    def test_cache_hit_skips_llm(self, mock_cache, mock_agent_class):
+        mock_cache.get_json.return_value = {"questions": QUESTIONS}
+
+        events = _collect(_handler(), "How is Apple doing?")
+
+        assert [e["body"] for e in events] == QUESTIONS
+        mock_agent_class.assert_not_called()
+
+    @patch("services.question_analyzer.handlers.get_multi_agent")
+    @patch("services.question_analyzer.handlers.cache")
+    def test_cache_miss_generates_and_stores_questions(self, mock_cache, mock_agent_class):
+        mock_cache.get_json.return_value = None
+        mock_agent_class.return_value.agenerate_content_by_lines = AsyncMock(return_value=QUESTIONS)
+
+        events = _collect(_handler(), "How is Apple doing?")
+
+        assert [e["body"] for e in events] == QUESTIONS
+        key, value, _ = mock_cache.set_json.call_args.args
+        assert key == _related_questions_cache_key("How is Apple doing?", ModelName.Auto)
+        assert value == {"questions": QUESTIONS}
+
+    @patch("services.question_analyzer.handlers.get_multi_agent")
+    @patch("services.question_analyzer.handlers.cache")
+    def test_incomplete_generation_is_not_cached(self, mock_cache, mock_agent_class):
+        mock_cache.get_json.return_value = None
+        mock_agent_class.return_value.agenerate_content_by_lines = AsyncMock(return_value=QUESTIONS[:1])
+
+        _collect(_handler(), "How is Apple doing?")
+
+        mock_cache.set_json.assert_not_called()
+
+
+class TestPrefetchRelatedQuestions:
+    @patch("services.question_analyzer.handlers.get_multi_agent")
+    @patch("services.question_analyzer.handlers.cache")
+    def test_prefetch_resolves_to_question_events(self, mock_cache, mock_agent_class):
+        mock_cache.get_json.return_value = None
+        mock_agent_class.return_value.agenerate_content_by_lines = AsyncMock(return_value=QUESTIONS)
+        handler = _handler()
+
+        async def run():
+            return await handler._prefetch_related_questions("How is Apple doing?")
+
+        events = asyncio.run(run())
+
+        assert events == [{"type": "related_question", "body": q} for q in QUESTIONS]
+
+    @patch("services.question_analyzer.handlers.get_multi_agent")
+    @patch("services.question_analyzer.handlers.cache")
+    def test_cancelling_prefetch_aborts_generation(self, mock_cache, mock_agent_class):
+        mock_cache.get_json.return_value = None
+        generating = asyncio.Event()
+        aborted = []
+
+        async def slow_generation(**kwargs):
+            generating.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                aborted.append(True)
+                raise
+
+        mock_agent_class.return_value.agenerate_content_by_lines = slow_generation
+        handler = _handler()
+
+        async def run():
+            task = handler._prefetch_related_questions("How is Apple doing?")
+            await generating.wait()
+            task.cancel()
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+
+        assert aborted == [True]
+        mock_cache.set_json.assert_not_called()
+
+    @patch("services.question_analyzer.handlers.MultiAgent")
+    def test_company_general_handler_starts_related_questions_before_answer(self, mock_agent_class):
+        calls = []
+        handler = _handler()
+
+        def prefetch(question, preferred_model):
+            calls.append("related")
+            future = asyncio.get_running_loop().create_future()
+            future.set_result([{"type": "related_question", "body": QUESTIONS[0]}])
+            return future
+
+        def answer(**kwargs):
+            calls.append("answer")
+            yield "Apple designs consumer electronics."
+
+        handler._prefetch_related_questions = prefetch
+        mock_agent_class.return_value.model_name = "test-model"
+        mock_agent_class.return_value.generate_content.side_effect = answer
+
+        async def run():
+            return [event async for event in handler.handle("AAPL", "What does Apple do?", False, False)]
+
+        events = asyncio.run(run())
+
+        assert calls == ["related", "answer"]
+        assert events[-1] == {"type": "related_question", "body": QUESTIONS[0]}
+
+    @pytest.mark.parametrize(
+        "handler_class, args",
+        [
+            (GeneralFinanceHandler, ("What is a P/E ratio?", False, False)),
+            (CompanyGeneralHandler, ("AAPL", "What does Apple do?", False, False)),
+        ],
+    )
+    @patch("services.question_analyzer.handlers.get_multi_agent")
+    @patch("services.question_analyzer.handlers.MultiAgent")
+    @patch("services.question_analyzer.handlers.cache")
+    def test_closing_answer_stream_aborts_related_questions(
+        self, mock_cache, mock_agent_class, mock_related_agent, handler_class, args
+    ):
+        mock_cache.get_json.return_value = None
+        aborted = []
+        answer_closed = threading.Event()
+        generating = asyncio.Event()
+
+        async def slow_generation(**kwargs):
+            generating.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                aborted.append(True)
+                raise
+
+        def answer(**kwargs):
+            try:
+                for i in range(100):
+                    yield f"Paragraph {i}. "
+            finally:
+                answer_closed.set()
+
+        mock_related_agent.return_value.agenerate_content_by_lines = slow_generation
+        mock_agent_class.return_value.model_name = "test-model"
+        mock_agent_class.return_value.generate_content.side_effect = answer
+        handler = handler_class(agent=MagicMock(), company_connector=MagicMock())
+
+        async def run():
+            events = handler.handle(*args)
+            async for event in events:
+                if event["type"] == "answer":
+                    break
+            await generating.wait()
+            await events.aclose()
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+
+        assert aborted == [True]
+        assert answer_closed.wait(timeout=2)
@@ -1,4 +1,8 @@
 import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
 
 from ai_models.model_name import ModelName
 from services.search_decision_engine import SearchDecisionEngine
@@ -13,6 +17,20 @@ class TestSearchDecisionEngine:
         assert parsed["reason_code"] == "time_sensitive"
         assert parsed["confidence"] == 0.91
 
+    def test_parse_decision_bare_json_clamps_confidence(self):
+        raw = '{"use_google_search": false, "reason_code": " stable_concept ", "confidence": 2}'
+        parsed = SearchDecisionEngine._parse_decision(raw)
+
+        assert parsed == {"use_google_search": False, "reason_code": "stable_concept", "confidence": 1.0}
+
+    def test_parse_decision_rejects_non_bool_search_flag(self):
+        with pytest.raises(ValueError):
+            SearchDecisionEngine._parse_decision('{"use_google_search": "yes", "reason_code": "other"}')
+
+    def test_parse_decision_rejects_blank_reason_code(self):
+        with pytest.raises(ValueError):
+            SearchDecisionEngine._parse_decision('{"use_google_search": true, "reason_code": "  "}')
+
     def test_decide_fails_safe_on_when_classifier_throws(self):
         def broken_classifier(question: str, ticker: str, is_etf: bool) -> str:
             raise RuntimeError("classifier offline")
@@ -44,3 +62,27 @@ class TestSearchDecisionEngine:
         assert decision.confidence == 1.0
         assert decision.decision_model == ModelName.Gemini31FlashLite.value
         assert decision.decision_fallback == "none"
+
+    @patch("services.search_decision_engine.MultiAgent")
+    def test_classify_stops_reading_after_json_object(self, mock_agent_class):
+        def chunks():
+            yield '{"use_google_search": true, '
+            yield '"reason_code": "latest_info", "confidence": 0.9}'
+            raise AssertionError("stream consumed past the JSON object")
+
+        mock_agent_class.return_value.generate_content.return_value = chunks()
+
+        raw = SearchDecisionEngine()._classify_sync("latest NVDA news", "NVDA", False)
+
+        assert SearchDecisionEngine._parse_decision(raw)["reason_code"] == "latest_info"
+
+    def test_decide_fails_safe_on_when_classifier_times_out(self):
+        def slow_classifier(question: str, ticker: str, is_etf: bool) -> str:
+            time.sleep(0.2)
+            return '{"use_google_search": false, "reason_code": "stable_concept", "confidence": 0.99}'
+
+        engine = SearchDecisionEngine(timeout_seconds=0.01, classifier=slow_classifier)
+        decision = asyncio.run(engine.decide(question="latest NVDA news", ticker="NVDA", is_etf=False))
+
+        assert decision.use_google_search is True
+        assert decision.decision_fallback == "classifier_fail_safe_on"
@@ -78,3 +78,33 @@ def test_store_accepts_explicit_ttl_seconds_for_v2_cache_entries():
     assert entry.ticker == "V2:AAPL"
     assert entry.ttl_tier == TTLTier.RECENT
     assert entry.expires_at == fixed_now + timedelta(minutes=30)
+
+
+class TestEmbed:
+    def setup_method(self):
+        semantic_cache_module._embedding_memo.clear()
+
+    def teardown_method(self):
+        semantic_cache_module._embedding_memo.clear()
+
+    def test_same_text_is_embedded_once(self):
+        cache = SemanticCache.__new__(SemanticCache)
+        cache.openai_model = MagicMock()
+        cache.openai_model.generate_embedding.return_value = [0.1, 0.2]
+
+        assert cache.embed("What is margin?") == [0.1, 0.2]
+        assert cache.embed("What is margin?") == [0.1, 0.2]
+        cache.openai_model.generate_embedding.assert_called_once_with("What is margin?")
+
+    def test_memo_evicts_least_recently_used(self):
+        cache = SemanticCache.__new__(SemanticCache)
+        cache.openai_model = MagicMock()
+        cache.openai_model.generate_embedding.side_effect = lambda text: [float(len(text))]
+
+        with patch.object(semantic_cache_module, "EMBEDDING_MEMO_MAX_SIZE", 2):
+            cache.embed("a")
+            cache.embed("bb")
+            cache.embed("a")
+            cache.embed("ccc")
+
+        assert list(semantic_cache_module._embedding_memo) == ["a", "ccc"]
@@ -1,8 +1,12 @@
 """Tests for _process_source_tags and _collect_paragraph_sources stream processors."""
 
+import asyncio
 import json
+import threading
 
-from services.question_analyzer.handlers import _collect_paragraph_sources, _process_source_tags
+import pytest
+
+from services.question_analyzer.handlers import _buffer_events, _collect_paragraph_sources, _process_source_tags
 
 
 def _collect(chunks, **kwargs):
@@ -251,3 +255,79 @@ class TestCollectParagraphSourcesBasic:
         src = grouped[0]["body"]["sources"][0]
         assert src["name"] == "SEC Filing 2024"
         assert src["url"] is None
+
+
+def _drain(events, **kwargs):
+    async def run():
+        return [event async for event in _buffer_events(events, **kwargs)]
+
+    return asyncio.run(run())
+
+
+class TestBufferEvents:
+    def test_passes_events_through_in_order(self):
+        events = _collect_with_paragraphs(
+            [{"type": "answer", "body": "Para one.\n\n"}, {"type": "answer", "body": "Two."}]
+        )
+        assert _drain(iter(events)) == events
+
+    def test_producer_stops_reading_once_buffer_is_full(self):
+        produced = []
+
+        def stream():
+            for i in range(100):
+                produced.append(i)
+                yield {"type": "answer", "body": str(i)}
+
+        async def run():
+            events = _buffer_events(stream(), maxsize=4)
+            first = await anext(events)
+            await asyncio.sleep(0.2)
+            await events.aclose()
+            return first
+
+        assert asyncio.run(run()) == {"type": "answer", "body": "0"}
+        assert len(produced) <= 6
+
+    def test_stream_error_is_raised_after_buffered_events(self):
+        def stream():
+            yield {"type": "answer", "body": "partial"}
+            raise TimeoutError("stalled")
+
+        received = []
+
+        async def run():
+            async for event in _buffer_events(stream()):
+                received.append(event)
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(run())
+        assert received == [{"type": "answer", "body": "partial"}]
+
+    def test_runs_on_dedicated_stream_pool(self):
+        threads = []
+
+        def stream():
+            threads.append(threading.current_thread().name)
+            yield {"type": "answer", "body": "x"}
+
+        _drain(stream())
+        assert threads[0].startswith("answer-stream")
+
+    def test_closes_stream_when_consumer_stops_early(self):
+        closed = threading.Event()
+
+        def stream():
+            try:
+                for i in range(100):
+                    yield {"type": "answer", "body": str(i)}
+            finally:
+                closed.set()
+
+        async def run():
+            events = _buffer_events(stream(), maxsize=2)
+            await anext(events)
+            await events.aclose()
+
+        asyncio.run(run())
+        assert closed.wait(timeout=2)
@@ -3,15 +3,17 @@
 import logging
 import os
 import uuid
-from typing import Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from dotenv import load_dotenv
-from langfuse import Langfuse
+from langfuse import Langfuse, observe
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+F = TypeVar("F", bound=Callable[..., Any])
+
 
 class LangfuseConfig:
     """Singleton configuration for Langfuse client."""
@@ -66,6 +68,35 @@ class LangfuseConfig:
         return cls._enabled
 
 
+def observe_if_enabled(**observe_kwargs: Any) -> Callable[[F], F]:
+    """
+    Langfuse @observe that leaves the function undecorated when tracing isn't configured.
+
+    Uses the same key check as LangfuseConfig, evaluated once when the decorator is applied, so local
+    dev and tests skip per-call span bookkeeping entirely.
+
+    Args:
+        **observe_kwargs: Passed through to langfuse.observe (name, as_type, capture_input, ...)
+    """
+    if not (os.getenv("LANGFUSE_PUBLIC_KEY") and os.getenv("LANGFUSE_SECRET_KEY")):
+        return lambda fn: fn
+    return observe(**observe_kwargs)
+
+
+async def aclose_observed_stream(stream: Any) -> None:
+    """
+    Close an async generator that may be wrapped by Langfuse @observe.
+
+    The observe wrapper for async generators doesn't expose aclose(), so close the generator it wraps.
+
+    Args:
+        stream: Async generator, or the wrapper @observe returns around one
+    """
+    aclose = getattr(stream, "aclose", None) or getattr(getattr(stream, "generator", None), "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
 def extract_or_generate_session_id(headers: dict) -> str:
     """
     Extract session ID from request headers or generate a new one.
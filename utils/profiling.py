@@ -0,0 +1,43 @@
+"""Timing helpers for async service methods."""
+
+import functools
+import logging
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+from langfuse import get_client
+
+T = TypeVar("T")
+
+
+def profiled(name: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Log the wall time of an async function as "Profiling <name>: <seconds>s".
+
+    Timing is skipped entirely when the function's module logger has INFO disabled. The duration is
+    also attached to the current Langfuse span as ``duration_s.<name>`` (a no-op when tracing is
+    disabled). Stack it under @observe_if_enabled so the function gets a span of its own; without
+    one the duration lands on the caller's span, and the per-name key keeps sibling timings apart.
+    """
+
+    def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        logger = logging.getLogger(fn.__module__)
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            if not logger.isEnabledFor(logging.INFO):
+                return await fn(*args, **kwargs)
+            t_start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - t_start
+                logger.info("Profiling %s: %.4fs", name, duration)
+                try:
+                    get_client().update_current_span(metadata={f"duration_s.{name}": round(duration, 4)})
+                except Exception as e:
+                    logger.debug("Could not attach duration to Langfuse span: %s", e)
+
+        return wrapper
+
+    return decorator
@@ -8,6 +8,9 @@ import requests
 
 logger = logging.getLogger(__name__)
 
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def extract_first_url(text: str) -> Optional[str]:
     """
@@ -19,9 +22,8 @@ def extract_first_url(text: str) -> Optional[str]:
     Returns:
         First URL found, or None if no URLs present
     """
-    url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-    matches = re.findall(url_pattern, text)
-    return matches[0] if matches else None
+    match = _URL_RE.search(text)
+    return match.group(0) if match else None
 
 
 def is_sec_filing_url(url: str) -> bool:
@@ -129,7 +131,7 @@ def strip_url_from_text(text: str, url: str) -> str:
     cleaned = text.replace(url, "")
 
     # Clean up multiple spaces
-    cleaned = re.sub(r"\s+", " ", cleaned)
+    cleaned = _WHITESPACE_RE.sub(" ", cleaned)
 
     # Trim leading/trailing whitespace
     return cleaned.strip()